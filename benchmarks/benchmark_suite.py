@@ -0,0 +1,209 @@
+import argparse
+import datetime
+import json
+import os.path
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC_DIR)
+
+from BudgetBook.account_statement_parser import AccountStatementCsvParser
+from BudgetBook.config_parser import Config
+from BudgetBook.transaction_visualizer import TransactionVisualizer
+
+from synthetic_statements import (
+    generate_regular_transactions,
+    generate_statement,
+    write_statement,
+)
+
+DEFAULT_CONFIG = os.path.join(os.path.dirname(__file__), "..", "configuration.yaml")
+START_DATE = datetime.date(2020, 1, 1)
+
+
+class StageRecorder:
+    """Duration and, if tracemalloc is running, peak of the allocated memory per stage."""
+
+    def __init__(self) -> None:
+        self._stages = {}
+
+    def run(self, name: str, function, *args, num_rows=None):
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            memory_before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        result = function(*args)
+        duration = time.perf_counter() - start
+
+        stage = self._stages.setdefault(name, {})
+        if tracing:
+            stage["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1] - memory_before
+        else:
+            if callable(num_rows):
+                num_rows = num_rows(result)
+            stage["seconds"] = duration
+            stage["rows"] = num_rows
+            stage["rows_per_sec"] = num_rows / duration if num_rows and duration > 0 else None
+        return result
+
+    def get_stages(self) -> dict:
+        return self._stages
+
+
+def run_pipeline(
+    config: Config,
+    statement_path: str,
+    num_transactions: int,
+    num_months: int,
+    seed: int,
+    max_predictor_rows: int,
+    recorder: StageRecorder,
+):
+    parser = recorder.run(
+        "parse",
+        AccountStatementCsvParser,
+        statement_path,
+        config,
+        num_rows=lambda p: len(p.get_csv_dataframe()),
+    )
+    recorder.run("categorize", parser.get_categories, num_rows=len)
+    store = recorder.run("transaction_store", parser.to_transaction_store, num_rows=len)
+
+    regular_transactions = generate_regular_transactions(num_transactions, seed, START_DATE, num_months)
+    end_date = (pd.Timestamp(START_DATE) + pd.DateOffset(months=num_months)).date()
+
+    def expand_regular_events():
+        return [t.get_frequency().get_occurences(START_DATE, end_date) for t in regular_transactions]
+
+    recorder.run(
+        "regular_event_expansion",
+        expand_regular_events,
+        num_rows=lambda occurences: sum(o.size for o in occurences),
+    )
+
+    visualizer = TransactionVisualizer(config)
+    visualizer.add_transactions(store)
+    visualizer.add_transactions(regular_transactions)
+    visualizer.set_analysis_interval_to_max_range()
+    recorder.run(
+        "to_dataframe",
+        visualizer._to_dataframe,
+        num_rows=lambda _: len(visualizer.get_dataframe()),
+    )
+
+    for name in sorted(n for n in dir(visualizer) if n.startswith("plot_")):
+        recorder.run(name, getattr(visualizer, name), num_rows=len(visualizer.get_dataframe()))
+
+    if num_transactions <= max_predictor_rows:
+        from BudgetBook.regular_transaction_predictor import RegularTransactionPredictor
+
+        predictor = RegularTransactionPredictor(config)
+        recorder.run("predictor", predictor.to_regular_transactions, store, num_rows=len(store))
+
+
+def benchmark_size(config: Config, num_transactions: int, args) -> dict:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        statement_path = os.path.join(tmp_dir, "statement.csv")
+        start = time.perf_counter()
+        write_statement(
+            generate_statement(config, num_transactions, args.seed, START_DATE, args.months),
+            statement_path,
+        )
+        generation_seconds = time.perf_counter() - start
+        statement_size_bytes = os.path.getsize(statement_path)
+
+        recorder = StageRecorder()
+        pipeline_args = (
+            config,
+            statement_path,
+            num_transactions,
+            args.months,
+            args.seed,
+            args.max_predictor_rows,
+            recorder,
+        )
+        run_pipeline(*pipeline_args)
+        if not args.no_memory:
+            # Separate run, tracemalloc slows down python heavy stages considerably
+            tracemalloc.start()
+            try:
+                run_pipeline(*pipeline_args)
+            finally:
+                tracemalloc.stop()
+
+    return {
+        "num_transactions": num_transactions,
+        "statement_size_bytes": statement_size_bytes,
+        "generation_seconds": generation_seconds,
+        "stages": recorder.get_stages(),
+    }
+
+
+def print_results(results: list, baseline: dict = None):
+    baseline_stages = {}
+    if baseline is not None:
+        for result in baseline["results"]:
+            baseline_stages[result["num_transactions"]] = result["stages"]
+
+    for result in results:
+        print(f"\n{result['num_transactions']} transactions")
+        print(f"{'stage':<40} {'seconds':>9} {'rows/sec':>12} {'peak MiB':>9} {'speedup':>8}")
+        for name, stage in result["stages"].items():
+            rows_per_sec = f"{stage['rows_per_sec']:.0f}" if stage.get("rows_per_sec") else ""
+            peak = stage.get("peak_memory_bytes")
+            peak = f"{peak / 2**20:.1f}" if peak is not None else ""
+            speedup = ""
+            baseline_stage = baseline_stages.get(result["num_transactions"], {}).get(name)
+            if baseline_stage is not None and stage["seconds"] > 0:
+                speedup = f"{baseline_stage['seconds'] / stage['seconds']:.2f}x"
+            print(f"{name:<40} {stage['seconds']:>9.3f} {rows_per_sec:>12} {peak:>9} {speedup:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Times and memory-profiles every stage on synthetic statements.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000], help="Number of transactions per run, e.g. 10000 100000 1000000 10000000.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic statements.")
+    parser.add_argument("--months", type=int, default=36, help="Number of months covered by the statements.")
+    parser.add_argument("--max-predictor-rows", type=int, default=20_000, help="The predictor is skipped for larger statements.")
+    parser.add_argument("--no-memory", action="store_true", default=False, help="Skip the memory profiling run.")
+    parser.add_argument("--baseline", type=str, default=None, help="Results of an earlier run, to print the speedup per stage.")
+    parser.add_argument("--output", type=str, default="benchmark_results.json", help="Path of the json results.")
+    parser.add_argument("--config", type=str, default=DEFAULT_CONFIG, help="Configuration yaml file.")
+    args = parser.parse_args()
+
+    config = Config(args.config)
+    results = [benchmark_size(config, n, args) for n in args.sizes]
+
+    report = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "arguments": vars(args),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+    print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import os.path
+import random
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC_DIR)
+
+from BudgetBook.config_parser import DataColumns
+from BudgetBook.transaction_store import CATEGORICAL_COLUMNS, to_categorical_columns
+
+
+def build_statement(rng, num_rows=1_000_000):
+    parties = [f"Payment Party {i}" for i in range(2000)]
+    types = ["Lastschrift", "Gutschrift", "Dauerauftrag", "Kartenzahlung", "Überweisung"]
+    categories = [f"Category {i}" for i in range(30)]
+
+    return pd.DataFrame(
+        {
+            DataColumns.PAYMENT_PARTY: [rng.choice(parties) for _ in range(num_rows)],
+            DataColumns.TYPE_OF_TRANSFER: [rng.choice(types) for _ in range(num_rows)],
+            DataColumns.CATEGORY: [rng.choice(categories) for _ in range(num_rows)],
+            DataColumns.AMOUNT: np.array(
+                [rng.uniform(-500, 500) for _ in range(num_rows)], dtype=np.float32
+            ),
+            "month": np.array([rng.randrange(120) for _ in range(num_rows)]),
+        }
+    )
+
+
+def main():
+    rng = random.Random(42)
+    object_statement = build_statement(rng)
+    categorical_statement = to_categorical_columns(object_statement.copy())
+
+    # Both representations have to agree before their timings are comparable
+    def sum_per_month_and_category(df):
+        return (
+            df.groupby(["month", DataColumns.CATEGORY], observed=True)[DataColumns.AMOUNT]
+            .sum()
+            .sort_index()
+        )
+
+    expected = sum_per_month_and_category(object_statement)
+    result = sum_per_month_and_category(categorical_statement)
+    assert np.array_equal(expected.index.to_numpy(), result.index.to_numpy())
+    assert np.allclose(expected.to_numpy(), result.to_numpy())
+
+    object_memory = object_statement.memory_usage(deep=True)
+    categorical_memory = categorical_statement.memory_usage(deep=True)
+
+    print(f"{len(object_statement)} rows")
+    print(f"{'column':>20} {'object [MiB]':>14} {'categorical [MiB]':>18} {'saving':>8}")
+    for column in CATEGORICAL_COLUMNS + ["total"]:
+        if column == "total":
+            before, after = object_memory.sum(), categorical_memory.sum()
+        else:
+            before, after = object_memory[column], categorical_memory[column]
+        print(
+            f"{column:>20} {before / 2**20:>14.1f} {after / 2**20:>18.1f} "
+            f"{before / after:>7.1f}x"
+        )
+
+    def time_min(func):
+        return min(timeit.repeat(func, number=1, repeat=3))
+
+    rows = [
+        (
+            "group by category",
+            time_min(lambda: sum_per_month_and_category(object_statement)),
+            time_min(lambda: sum_per_month_and_category(categorical_statement)),
+        ),
+        (
+            "category mask",
+            time_min(lambda: object_statement[DataColumns.CATEGORY].isin(["Category 1", "Category 2"])),
+            time_min(lambda: categorical_statement[DataColumns.CATEGORY].isin(["Category 1", "Category 2"])),
+        ),
+    ]
+    print(f"{'':>20} {'object [ms]':>14} {'categorical [ms]':>18} {'speedup':>8}")
+    for name, object_time, categorical_time in rows:
+        print(
+            f"{name:>20} {object_time * 1000:>14.1f} {categorical_time * 1000:>18.1f} "
+            f"{object_time / categorical_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import base64
+import datetime
+import io
+import os.path
+import random
+import sys
+import tempfile
+import timeit
+
+import pandas as pd
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC_DIR)
+
+from BudgetBook.account_statement_parser import AccountStatementCsvParser
+from BudgetBook.config_parser import Config, ConfigKeywords
+from BudgetBook.statement_loader import decode_uploaded_csv
+
+CONFIG_YAML = """
+statement_parser:
+    csv_columns:
+        payment_party: "Name"
+        amount: "Betrag"
+        type_of_transfer: "Buchungstext"
+        description: "Verwendungszweck"
+        date: "Buchungstag"
+    date_format: "%d.%m.%Y"
+    internal_transfer_categories: []
+    csv_engine: "{csv_engine}"
+
+category_mapping:
+    Groceries:
+        payment_party: ["lidl"]
+"""
+
+
+def build_upload(rng, num_rows=500_000):
+    parties = [f"Payment Party {i}" for i in range(2000)]
+    types = ["Lastschrift", "Gutschrift", "Dauerauftrag", "Kartenzahlung"]
+    start = datetime.date(2015, 1, 1)
+
+    lines = ["Buchungstag;Name;Buchungstext;Verwendungszweck;Betrag;Saldo"]
+    for _ in range(num_rows):
+        day = start + datetime.timedelta(days=rng.randrange(3000))
+        amount = f"{rng.uniform(-500, 500):.2f}".replace(".", ",")
+        lines.append(
+            f"{day:%d.%m.%Y};{rng.choice(parties)};{rng.choice(types)};"
+            f"Reference {rng.randrange(10**9)} Ümlaut;{amount};0,00"
+        )
+    content = "\n".join(lines).encode("utf-8")
+    return "data:text/csv;base64," + base64.b64encode(content).decode("ascii")
+
+
+def decode_uploaded_csv_as_text(contents):
+    # Upload path before the bytes based reader was introduced
+    _, content_string = contents.split(",")
+    return io.StringIO(base64.b64decode(content_string).decode("utf-8"))
+
+
+def main():
+    rng = random.Random(42)
+    upload = build_upload(rng)
+
+    def create_reader(csv_engine, tmp_dir):
+        config_path = os.path.join(tmp_dir, f"{csv_engine}.yaml")
+        with open(config_path, "w") as f:
+            f.write(CONFIG_YAML.format(csv_engine=csv_engine))
+        config = Config(config_path)
+        # An empty frame skips the parsing in the constructor, only the reader is timed
+        return AccountStatementCsvParser(pd.DataFrame(), config)._read_csv
+
+    def time_min(func):
+        return min(timeit.repeat(func, number=1, repeat=3))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # The config is shared, so every engine is timed before the next one is configured
+        c_reader = create_reader(ConfigKeywords.CSV_ENGINE_C, tmp_dir)
+        expected = c_reader(decode_uploaded_csv_as_text(upload))
+        # All readers have to agree before their timings are comparable
+        pd.testing.assert_frame_equal(expected, c_reader(decode_uploaded_csv(upload)))
+        text_time = time_min(lambda: c_reader(decode_uploaded_csv_as_text(upload)))
+        bytes_time = time_min(lambda: c_reader(decode_uploaded_csv(upload)))
+
+        pyarrow_reader = create_reader(ConfigKeywords.CSV_ENGINE_PYARROW, tmp_dir)
+        pd.testing.assert_frame_equal(
+            expected, pyarrow_reader(decode_uploaded_csv(upload)), check_like=True
+        )
+        pyarrow_time = time_min(lambda: pyarrow_reader(decode_uploaded_csv(upload)))
+
+    print(f"{len(expected)} rows, {len(upload) / 2**20:.1f} MiB upload, {os.cpu_count()} cpus")
+    print(f"{'':>24} {'time [ms]':>10} {'speedup':>8}")
+    for name, duration in [
+        ("str + c engine", text_time),
+        ("bytes + c engine", bytes_time),
+        ("bytes + pyarrow engine", pyarrow_time),
+    ]:
+        print(f"{name:>24} {duration * 1000:>10.1f} {text_time / duration:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
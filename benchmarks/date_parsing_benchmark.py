@@ -0,0 +1,67 @@
+import datetime
+import os.path
+import random
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC_DIR)
+
+from BudgetBook.date_parsing import DateParser, to_date_objects
+
+DATE_FORMAT = "%d.%m.%Y"
+
+
+def build_date_strings(rng, num_rows=1_000_000, num_days=3650):
+    start = datetime.date(2012, 1, 1)
+    days = [
+        (start + datetime.timedelta(days=d)).strftime(DATE_FORMAT)
+        for d in range(num_days)
+    ]
+    return pd.Series([days[rng.randrange(num_days)] for _ in range(num_rows)])
+
+
+def main():
+    rng = random.Random(42)
+    date_strings = build_date_strings(rng)
+
+    # Both conversions have to agree before their timings are comparable
+    expected = pd.to_datetime(date_strings, format=DATE_FORMAT)
+    assert expected.equals(DateParser(DATE_FORMAT).parse(date_strings))
+    assert np.array_equal(expected.dt.date.to_numpy(), to_date_objects(expected))
+
+    def time_min(func):
+        return min(timeit.repeat(func, number=1, repeat=3))
+
+    rows = [
+        (
+            "parse dates",
+            time_min(lambda: pd.to_datetime(date_strings, format=DATE_FORMAT)),
+            time_min(lambda: DateParser(DATE_FORMAT).parse(date_strings)),
+        ),
+        (
+            "parse dates, warm cache",
+            time_min(lambda: pd.to_datetime(date_strings, format=DATE_FORMAT)),
+            time_min(lambda parser=DateParser(DATE_FORMAT): parser.parse(date_strings)),
+        ),
+        (
+            "to date objects",
+            time_min(lambda: expected.dt.date),
+            time_min(lambda: to_date_objects(expected)),
+        ),
+    ]
+
+    print(f"{len(date_strings)} rows, {date_strings.nunique()} distinct dates")
+    print(f"{'':>24} {'per row [ms]':>14} {'unique [ms]':>14} {'speedup':>8}")
+    for name, per_row_time, unique_time in rows:
+        print(
+            f"{name:>24} {per_row_time * 1000:>14.1f} {unique_time * 1000:>14.1f} "
+            f"{per_row_time / unique_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import os.path
+import random
+import string
+import sys
+import timeit
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC_DIR)
+
+from BudgetBook.keyword_matcher import KeywordMatcher
+
+
+def field_contains_any(field, candiates):
+    # Matcher used by CategoryParser before the keyword automaton was introduced
+    return any(v.lower() in field.lower() for v in candiates)
+
+
+def random_word(rng, min_length=4, max_length=12):
+    return "".join(
+        rng.choice(string.ascii_lowercase)
+        for _ in range(rng.randint(min_length, max_length))
+    )
+
+
+def build_fields(rng, keywords, num_fields=2000):
+    fields = []
+    for _ in range(num_fields):
+        words = [random_word(rng) for _ in range(rng.randint(3, 12))]
+        if rng.random() < 0.3:
+            words.insert(rng.randrange(len(words)), rng.choice(keywords).upper())
+        fields.append(" ".join(words))
+    return fields
+
+
+def main():
+    rng = random.Random(42)
+
+    print(f"{'keywords':>10} {'substring scan [ms]':>20} {'automaton [ms]':>16} {'speedup':>8}")
+    for num_keywords in [10, 100, 1000]:
+        keywords = [random_word(rng) for _ in range(num_keywords)]
+        fields = build_fields(rng, keywords)
+        matcher = KeywordMatcher(keywords)
+
+        # Both matchers have to agree before their timings are comparable
+        for field in fields:
+            assert field_contains_any(field, keywords) == bool(matcher.find_all(field))
+
+        substring_time = min(
+            timeit.repeat(
+                lambda: [field_contains_any(f, keywords) for f in fields],
+                number=1,
+                repeat=3,
+            )
+        )
+        automaton_time = min(
+            timeit.repeat(
+                lambda: [matcher.find_all(f) for f in fields], number=1, repeat=3
+            )
+        )
+
+        print(
+            f"{num_keywords:>10} {substring_time * 1000:>20.1f} {automaton_time * 1000:>16.1f} "
+            f"{substring_time / automaton_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import argparse
+import datetime
+import os.path
+import random
+import sys
+import timeit
+
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC_DIR)
+
+from BudgetBook.config_parser import Config, DataColumns
+from BudgetBook.dated_transaction import DatedTransaction
+from BudgetBook.regular_event import RegularEvent
+from BudgetBook.regular_transaction import RegularTransaction
+from BudgetBook.transaction_interval import TransactionInterval
+from BudgetBook.transaction_store import TransactionStore
+from BudgetBook.transaction_visualizer import TransactionVisualizer
+
+DEFAULT_CONFIG = os.path.join(os.path.dirname(__file__), "..", "configuration.yaml")
+START_DATE = datetime.date(1995, 1, 1)
+NUM_YEARS = 30
+
+INTERVALS = [
+    TransactionInterval(days=7),
+    TransactionInterval(days=14),
+    TransactionInterval.monthly(),
+    TransactionInterval.quaterly(),
+    TransactionInterval.yearly(),
+]
+
+
+def build_scheduled_transactions(rng, num_regular: int, num_dated: int):
+    num_days = 365 * NUM_YEARS
+    scheduled_transactions = [
+        RegularTransaction(
+            f"Party {rng.randrange(num_regular // 4 + 1)}",
+            RegularEvent(
+                # Days at the end of the month exercise the month-end clamping
+                START_DATE + datetime.timedelta(days=rng.randrange(num_days // 2)),
+                rng.choice(INTERVALS),
+                None if rng.random() < 0.5 else START_DATE + datetime.timedelta(days=rng.randrange(num_days)),
+            ),
+            round(rng.uniform(-500, 500), 2),
+            f"Contract {idx}",
+            rng.choice(["Insurance", "Rent", "Salary", "Multimedia/Internet"]),
+        )
+        for idx in range(num_regular)
+    ]
+    scheduled_transactions += [
+        DatedTransaction(
+            f"Party {rng.randrange(num_dated // 4 + 1)}",
+            START_DATE + datetime.timedelta(days=rng.randrange(num_days)),
+            round(rng.uniform(-500, 500), 2),
+            f"Purchase {idx}",
+            "Groceries",
+        )
+        for idx in range(num_dated)
+    ]
+    rng.shuffle(scheduled_transactions)
+    return scheduled_transactions
+
+
+def expand_per_occurence(scheduled_transactions, from_date, to_date) -> pd.DataFrame:
+    """One DatedTransaction and dict per occurence, as TransactionVisualizer did before."""
+    records = []
+    for scheduled_transaction in scheduled_transactions:
+        if isinstance(scheduled_transaction, RegularTransaction):
+            records.extend(
+                t.to_dict() for t in scheduled_transaction.iterate(from_date=from_date, up_to=to_date)
+            )
+        elif from_date <= scheduled_transaction.date < to_date:
+            records.append(scheduled_transaction.to_dict())
+    return pd.DataFrame.from_records(records, columns=TransactionStore.COLUMNS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Expands regular and dated transactions over a 30 year analysis interval.")
+    parser.add_argument("--regular", type=int, default=5000, help="Number of regular transactions.")
+    parser.add_argument("--dated", type=int, default=20000, help="Number of dated transactions.")
+    parser.add_argument("--config", type=str, default=DEFAULT_CONFIG, help="Configuration yaml file.")
+    args = parser.parse_args()
+
+    scheduled_transactions = build_scheduled_transactions(random.Random(42), args.regular, args.dated)
+    from_date = START_DATE
+    to_date = START_DATE.replace(year=START_DATE.year + NUM_YEARS)
+
+    visualizer = TransactionVisualizer(Config(args.config))
+    visualizer.add_transactions(scheduled_transactions)
+    visualizer._from_date = from_date
+    visualizer._to_date = to_date
+
+    # Both expansions have to agree before their timings are comparable
+    expected = expand_per_occurence(scheduled_transactions, from_date, to_date)
+    expanded = visualizer._expand_scheduled_transactions()
+    pd.testing.assert_series_equal(
+        pd.to_datetime(expected[DataColumns.DATE]), expanded[DataColumns.DATE]
+    )
+    for column in [DataColumns.PAYMENT_PARTY, DataColumns.AMOUNT, DataColumns.DESCRIPTION, DataColumns.CATEGORY]:
+        assert expected[column].tolist() == expanded[column].tolist(), column
+
+    def time_min(func):
+        return min(timeit.repeat(func, number=1, repeat=3))
+
+    def expand_from_scratch():
+        fresh_visualizer = TransactionVisualizer(visualizer._config)
+        fresh_visualizer.add_transactions(scheduled_transactions)
+        fresh_visualizer._from_date = from_date
+        fresh_visualizer._to_date = to_date
+        return fresh_visualizer._expand_scheduled_transactions()
+
+    per_occurence_time = time_min(lambda: expand_per_occurence(scheduled_transactions, from_date, to_date))
+    bulk_time = time_min(expand_from_scratch)
+    cached_time = time_min(visualizer._expand_scheduled_transactions)
+
+    print(f"{args.regular} regular and {args.dated} dated transactions over {NUM_YEARS} years, {len(expanded)} rows")
+    print(f"{'per occurence [ms]':>20} {'bulk [ms]':>12} {'speedup':>8} {'bulk, cached [ms]':>20}")
+    print(
+        f"{per_occurence_time * 1000:>20.1f} {bulk_time * 1000:>12.1f} "
+        f"{per_occurence_time / bulk_time:>7.1f}x {cached_time * 1000:>20.1f}"
+    )
+
+    # Nudging the end of the analysis interval by a month, like in the date picker
+    windows = [(from_date, to_date - relativedelta(months=12 - m)) for m in range(13)]
+
+    def move_window(use_cache: bool, stage):
+        moving_visualizer = TransactionVisualizer(visualizer._config)
+        moving_visualizer.add_transactions(scheduled_transactions)
+        seconds = 0
+        for window in windows:
+            if not use_cache:
+                moving_visualizer._occurence_cache.clear()
+                moving_visualizer._scheduled_transaction_columns = None
+            moving_visualizer._from_date, moving_visualizer._to_date = window
+            start = timeit.default_timer()
+            if stage == "expansion":
+                moving_visualizer._expand_scheduled_transactions()
+            else:
+                moving_visualizer.set_analysis_interval(*window)
+            seconds += timeit.default_timer() - start
+        return seconds / len(windows)
+
+    print(f"\nMoving the end of the analysis interval {len(windows)} times by a month, per move")
+    print(f"{'':>24} {'from scratch [ms]':>18} {'cached [ms]':>12} {'speedup':>8}")
+    for stage in ["expansion", "set_analysis_interval"]:
+        from_scratch_time = min(move_window(False, stage) for _ in range(3))
+        cached_time = min(move_window(True, stage) for _ in range(3))
+        print(
+            f"{stage:>24} {from_scratch_time * 1000:>18.1f} {cached_time * 1000:>12.1f} "
+            f"{from_scratch_time / cached_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import argparse
+import json
+import os.path
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Only imported when the features that need them are used
+LAZY_MODULES = ["sklearn", "scipy", "Levenshtein", "BudgetBook.regular_transaction_predictor"]
+
+IMPORT_SCRIPT = """
+import sys
+sys.argv = ["{module}.py"]
+import {module}
+print(",".join(m for m in {lazy_modules!r} if m in sys.modules))
+"""
+
+
+def parse_importtime(stderr: str, module: str):
+    """Cumulative import time of module and of each of its direct imports in seconds.
+
+    Based on the report of python -X importtime, nested imports are indented by two spaces per level.
+    """
+    total_seconds = None
+    imports = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 0 and name.strip() == module:
+            total_seconds = int(cumulative) / 1e6
+        elif depth == 1:
+            imports[name.strip()] = int(cumulative) / 1e6
+    return total_seconds, imports
+
+
+def measure_startup(module: str) -> dict:
+    script = IMPORT_SCRIPT.format(module=module, lazy_modules=LAZY_MODULES)
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    seconds = time.perf_counter() - start
+    import_seconds, imports = parse_importtime(result.stderr, module)
+    return {
+        "seconds": seconds,
+        "import_seconds": import_seconds,
+        "imports": imports,
+        "loaded_lazy_modules": [m for m in result.stdout.strip().split(",") if m],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures how long it takes to start the server, based on python -X importtime.")
+    parser.add_argument("--module", type=str, default="budget_book", help="Module that is imported, e.g. budget_book or budget_book_batch.")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of measurements, the fastest one is reported.")
+    parser.add_argument("--top", type=int, default=15, help="Number of listed direct imports.")
+    parser.add_argument("--max-seconds", type=float, default=None, help="Fail if the startup takes longer.")
+    parser.add_argument("--output", type=str, default=None, help="Path of the json results.")
+    args = parser.parse_args()
+
+    runs = [measure_startup(args.module) for _ in range(args.repeat)]
+    fastest = min(runs, key=lambda r: r["seconds"])
+
+    print(
+        f"Startup of {args.module}: {fastest['seconds']:.3f} s, "
+        f"{fastest['import_seconds']:.3f} s of it importing (fastest of {args.repeat} runs)"
+    )
+    print(f"{'direct import':<50} {'cumulative [ms]':>16}")
+    for name, seconds in sorted(fastest["imports"].items(), key=lambda i: -i[1])[: args.top]:
+        print(f"{name:<50} {seconds * 1000:>16.1f}")
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump({"module": args.module, "runs": runs, "fastest": fastest}, f, indent=2)
+
+    failed = False
+    if fastest["loaded_lazy_modules"]:
+        print(f"Modules that should only be imported on first use: {', '.join(fastest['loaded_lazy_modules'])}")
+        failed = True
+    if args.max_seconds is not None and fastest["seconds"] > args.max_seconds:
+        print(f"Startup takes longer than {args.max_seconds} s")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
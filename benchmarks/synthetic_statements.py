@@ -0,0 +1,201 @@
+import argparse
+import datetime
+import os.path
+import sys
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC_DIR)
+
+from BudgetBook.config_parser import Config, DataColumns
+from BudgetBook.regular_event import RegularEvent
+from BudgetBook.regular_transaction import RegularTransaction
+from BudgetBook.transaction_interval import TransactionInterval
+
+# Payment party, type of transfer, description, mean amount and relative frequency of one-off payments.
+# "{}" is replaced by a random reference number, merchants without a rule in the config are noise.
+MERCHANTS = [
+    ("Lidl Filiale {}", "Kartenzahlung", "Einkauf {}", -35.0, 10),
+    ("EDEKA Markt", "Kartenzahlung", "Einkauf {}", -45.0, 8),
+    ("REWE Markt GmbH", "Kartenzahlung", "REWE SAGT DANKE {}", -40.0, 8),
+    ("Kaufland", "Kartenzahlung", "Einkauf {}", -55.0, 4),
+    ("Shell Tankstelle {}", "Kartenzahlung", "Tanken Shell {}", -60.0, 4),
+    ("ARAL Station", "Kartenzahlung", "Tanken {}", -65.0, 3),
+    ("Parkhaus Innenstadt", "Kartenzahlung", "Parkhaus Ticket {}", -4.0, 2),
+    ("PayPal Europe", "Lastschrift", "PP.{} paypal *amazon", -40.0, 6),
+    ("Amazon EU S.a.r.L.", "Lastschrift", "Bestellung {}", -30.0, 5),
+    ("Ristorante Da Mario", "Kartenzahlung", "ristorante {}", -28.0, 3),
+    ("McDonalds {}", "Kartenzahlung", "mcdonalds {}", -9.0, 3),
+    ("Shop {}", "Kartenzahlung", "Einkauf {}", -30.0, 6),
+    ("Baumarkt {}", "Kartenzahlung", "Einkauf {}", -70.0, 2),
+    ("Max Mustermann {}", "Gutschrift", "Ueberweisung {}", 50.0, 2),
+    ("Bargeld Automat {}", "Auszahlung", "GA {}", -100.0, 3),
+]
+
+# Payment party, type of transfer, description, amount, relative amount noise, interval in months,
+# day of month and category. Used for the statement rows and as scheduled regular transactions.
+RECURRING_PAYMENTS = [
+    ("Arbeitgeber GmbH", "Gutschrift", "Lohn Gehalt {}", 3200.0, 0.02, 1, 28, "Salary"),
+    ("Hausverwaltung Meier", "Dauerauftrag", "Miete Wohnung {}", -950.0, 0.0, 1, 1, "Rent"),
+    ("Allianz Versicherung", "Lastschrift", "Beitrag {}", -85.0, 0.0, 1, 15, "Insurance"),
+    ("HUK Versicherung", "Lastschrift", "KFZ Beitrag {}", -240.0, 0.0, 3, 1, "Insurance"),
+    ("Vodafone GmbH", "Lastschrift", "Kundennummer {}", -40.0, 0.1, 1, 5, "Multimedia/Internet"),
+    ("Spotify AB", "Lastschrift", "spotify {}", -9.99, 0.0, 1, 12, "Multimedia/Internet"),
+    ("SWU Stadtwerke", "Lastschrift", "Abschlag Strom {}", -70.0, 0.05, 1, 20, "Household"),
+    ("Rundfunk ARD, ZDF, DRadio", "Lastschrift", "Rundfunk {}", -55.08, 0.0, 3, 15, "Multimedia/Internet"),
+    ("Andreas Rottach", "Dauerauftrag", "Sparrate {}", -500.0, 0.0, 1, 2, "Savings"),
+    ("Fitnessstudio", "Lastschrift", "Mitgliedsbeitrag {}", -30.0, 0.0, 1, 31, "Unknown Payment"),
+]
+
+# Share of the rows that belong to recurring payments, the number of contracts grows with the size
+RECURRING_SHARE = 0.1
+
+
+def _fill_template(templates: List[str], indices: np.ndarray, rng, high: int) -> np.ndarray:
+    """templates[indices] with "{}" replaced by random numbers below high."""
+    prefixes, _, suffixes = (
+        np.array(p, dtype=object) for p in zip(*(t.partition("{}") for t in templates))
+    )
+    has_placeholder = np.array(["{}" in t for t in templates])[indices]
+    numbers = rng.integers(0, high, size=len(indices)).astype(str).astype(object)
+    return prefixes[indices] + np.where(has_placeholder, numbers, "") + suffixes[indices]
+
+
+def _get_num_contracts(num_transactions: int, num_months: int) -> int:
+    payments_per_month = sum(1 / p[5] for p in RECURRING_PAYMENTS)
+    return max(1, int(round(num_transactions * RECURRING_SHARE / (num_months * payments_per_month))))
+
+
+def _get_recurring_payments(num_transactions: int, num_months: int, seed: int):
+    """Payment party, type, description, amount, noise, interval, day and category per contract."""
+    rng = np.random.default_rng(seed + 1)
+    contracts = []
+    for contract in range(_get_num_contracts(num_transactions, num_months)):
+        for party, transfer_type, desc, amount, noise, interval, day, category in RECURRING_PAYMENTS:
+            if contract > 0:
+                party = f"{party} {contract}"
+                amount = round(amount * rng.uniform(0.5, 1.5), 2)
+            desc = desc.format(rng.integers(10**6, 10**7))
+            contracts.append((party, transfer_type, desc, amount, noise, interval, day, category))
+    return contracts
+
+
+def generate_regular_transactions(
+    num_transactions: int,
+    seed: int = 0,
+    start_date: datetime.date = datetime.date(2020, 1, 1),
+    num_months: int = 36,
+):
+    """The recurring payments of a generated statement as scheduled RegularTransactions."""
+    regular_transactions = []
+    for party, _, desc, amount, _, interval, day, category in _get_recurring_payments(
+        num_transactions, num_months, seed
+    ):
+        first_occurence = start_date.replace(day=min(day, 28))
+        last_occurence = (pd.Timestamp(start_date) + pd.DateOffset(months=num_months)).date()
+        regular_transactions.append(
+            RegularTransaction(
+                party,
+                RegularEvent(first_occurence, TransactionInterval(months=interval), last_occurence),
+                amount,
+                desc,
+                category,
+            )
+        )
+    return regular_transactions
+
+
+def generate_statement(
+    config: Config,
+    num_transactions: int,
+    seed: int = 0,
+    start_date: datetime.date = datetime.date(2020, 1, 1),
+    num_months: int = 36,
+) -> pd.DataFrame:
+    """Statement rows in the csv layout of the config, sorted by date.
+
+    The same seed and arguments always generate the same statement.
+    """
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp(start_date)
+    end = start + pd.DateOffset(months=num_months)
+
+    columns = {
+        c: []
+        for c in [
+            DataColumns.DATE,
+            DataColumns.PAYMENT_PARTY,
+            DataColumns.TYPE_OF_TRANSFER,
+            DataColumns.DESCRIPTION,
+            DataColumns.AMOUNT,
+        ]
+    }
+
+    schedules = {}
+    for party, transfer_type, desc, amount, noise, interval, day, _ in _get_recurring_payments(
+        num_transactions, num_months, seed
+    ):
+        dates = schedules.get((interval, day))
+        if dates is None:
+            # Days beyond the end of a month are clamped, like a standing order on the 31st
+            months = pd.date_range(start, end, freq=f"{interval}MS", inclusive="left")
+            last_days = (months + pd.offsets.MonthEnd(0)).day.to_numpy()
+            dates = months + pd.to_timedelta(np.minimum(day, last_days) - 1, unit="D")
+            schedules[(interval, day)] = dates
+        columns[DataColumns.DATE].append(dates.to_numpy())
+        columns[DataColumns.PAYMENT_PARTY].append(np.full(len(dates), party, dtype=object))
+        columns[DataColumns.TYPE_OF_TRANSFER].append(np.full(len(dates), transfer_type, dtype=object))
+        columns[DataColumns.DESCRIPTION].append(np.full(len(dates), desc, dtype=object))
+        columns[DataColumns.AMOUNT].append(amount * (1 + rng.normal(0, noise, len(dates))))
+
+    num_one_off = max(0, num_transactions - sum(len(d) for d in columns[DataColumns.DATE]))
+    weights = np.array([m[4] for m in MERCHANTS], dtype=float)
+    merchant = rng.choice(len(MERCHANTS), size=num_one_off, p=weights / weights.sum())
+    days = rng.integers(0, (end - start).days, size=num_one_off)
+
+    columns[DataColumns.DATE].append((start + pd.to_timedelta(days, unit="D")).to_numpy())
+    # Few distinct merchants per template, e.g. store numbers, but many distinct references
+    columns[DataColumns.PAYMENT_PARTY].append(_fill_template([m[0] for m in MERCHANTS], merchant, rng, 200))
+    columns[DataColumns.TYPE_OF_TRANSFER].append(np.array([m[1] for m in MERCHANTS], dtype=object)[merchant])
+    columns[DataColumns.DESCRIPTION].append(_fill_template([m[2] for m in MERCHANTS], merchant, rng, 10**10))
+    mean_amounts = np.array([m[3] for m in MERCHANTS])[merchant]
+    columns[DataColumns.AMOUNT].append(mean_amounts * rng.lognormal(0, 0.5, size=num_one_off))
+
+    statement = pd.DataFrame({c: np.concatenate(v) for c, v in columns.items()})
+    statement[DataColumns.AMOUNT] = statement[DataColumns.AMOUNT].round(2)
+    statement = statement.sort_values(DataColumns.DATE, kind="stable", ignore_index=True)
+    # Recurring payments can exceed the requested size for tiny statements
+    statement = statement.iloc[:num_transactions]
+
+    csv_columns = config.get_csv_columns_mapping()
+    statement["Saldo"] = statement[DataColumns.AMOUNT].cumsum().round(2)
+    # Only the few distinct dates are formatted
+    codes, dates = pd.factorize(statement[DataColumns.DATE])
+    statement[DataColumns.DATE] = dates.strftime(config.get_csv_date_format()).to_numpy(dtype=object)[codes]
+    return statement.rename(columns={c: csv_columns[c] for c in columns})
+
+
+def write_statement(statement: pd.DataFrame, path: str):
+    statement.to_csv(path, sep=";", decimal=",", index=False, float_format="%.2f")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generates a synthetic statement csv file.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random generator.")
+    parser.add_argument("--months", type=int, default=36, help="Number of months covered by the statement.")
+    parser.add_argument("config", type=str, help="Configuration yaml file, defines the csv layout.")
+    parser.add_argument("num_transactions", type=int, help="Number of rows.")
+    parser.add_argument("output", type=str, help="Path of the generated csv file.")
+    args = parser.parse_args()
+
+    statement = generate_statement(
+        Config(args.config), args.num_transactions, args.seed, num_months=args.months
+    )
+    write_statement(statement, args.output)
+
+
+if __name__ == "__main__":
+    main()
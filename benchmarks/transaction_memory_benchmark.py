@@ -0,0 +1,66 @@
+import datetime
+import os.path
+import sys
+import tracemalloc
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC_DIR)
+
+from BudgetBook.dated_transaction import DatedTransaction
+from BudgetBook.regular_event import RegularEvent
+from BudgetBook.regular_transaction import RegularTransaction
+from BudgetBook.transaction_interval import TransactionInterval
+
+NUM_OBJECTS = 100_000
+START_DATE = datetime.date(2020, 1, 1)
+
+# Field values are created up front and shared, so only the objects themselves are measured
+DATES = [START_DATE + datetime.timedelta(days=d) for d in range(NUM_OBJECTS)]
+INTERVAL = TransactionInterval.monthly()
+EVENT = RegularEvent(START_DATE, INTERVAL, DATES[-1])
+
+
+def build_dated_transactions():
+    return [DatedTransaction("Party", d, -10.0, "Desc", "Groceries") for d in DATES]
+
+
+def build_regular_events():
+    return [RegularEvent(d, INTERVAL, DATES[-1]) for d in DATES]
+
+
+def build_regular_transactions():
+    return [RegularTransaction("Party", EVENT, -10.0, "Desc", "Groceries") for _ in DATES]
+
+
+def build_transaction_intervals():
+    return [TransactionInterval(days=7) for _ in DATES]
+
+
+def measure_bytes_per_object(build) -> float:
+    tracemalloc.start()
+    try:
+        memory_before = tracemalloc.get_traced_memory()[0]
+        objects = build()
+        memory_after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert len(objects) == NUM_OBJECTS
+    # Without the list holding the objects
+    return (memory_after - memory_before) / NUM_OBJECTS - 8
+
+
+def main():
+    print(f"{'type':<24} {'bytes per object':>18} {'has __dict__':>14}")
+    for name, build in [
+        ("DatedTransaction", build_dated_transactions),
+        ("RegularEvent", build_regular_events),
+        ("RegularTransaction", build_regular_transactions),
+        ("TransactionInterval", build_transaction_intervals),
+    ]:
+        bytes_per_object = measure_bytes_per_object(build)
+        has_dict = hasattr(build()[0], "__dict__")
+        print(f"{name:<24} {bytes_per_object:>18.0f} {str(has_dict):>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,5 @@
-import base64
-import io
 import os.path
 import sys
-import plotly
-from plotly.subplots import make_subplots
 
 from datetime import date, datetime
 import pandas as pd
@@ -20,14 +16,19 @@ from dash.dependencies import Input, Output, State
 SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "src"))
 sys.path.append(SRC_DIR)
 
-from BudgetBook.account_statement_parser import AccountStatementCsvParser
+from BudgetBook.analysis_session import AnalysisSession
+from BudgetBook.category_cube import CategoryLevel
+from BudgetBook.config_watcher import ConfigWatcher
+from BudgetBook.metrics import get_metrics, measure
+from BudgetBook.session_store import SessionStore
+from BudgetBook.statement_cache import StatementCache
+from BudgetBook.statement_loader import StatementLoader, StatementLoadException
 from BudgetBook.transaction_visualizer import TransactionVisualizer
 from BudgetBook.config_parser import (
     DATA_COLUMN_TO_DISPLAY_NAME,
     Config,
     DataColumns,
 )
-from BudgetBook.regular_transaction_predictor import RegularTransactionPredictor
 
 
 def year(year: int) -> date:
@@ -37,6 +38,10 @@ default_start_date = date.today()
 default_end_date = date.today()
 
 enable_predictions = False
+statement_loader_workers = 1
+statement_cache = None
+session_store = SessionStore()
+demo_transactions = None
 
 def generate_tabs(manager: TransactionVisualizer, with_predictions_tab):
     if manager is not None:
@@ -152,6 +157,7 @@ def generate_dataset_table_tab(manager: TransactionVisualizer):
 
 
 def generate_detailed_transactions_tab(manager: TransactionVisualizer):
+    from plotly.subplots import make_subplots
 
     fig = make_subplots(
         rows=3,
@@ -246,8 +252,11 @@ def generate_overview_tab(manager: TransactionVisualizer):
 
 
 def generate_prediction_tab(manager: TransactionVisualizer):
+    # Imported on first use, scikit-learn alone takes longer to import than the rest of the server
+    from BudgetBook.regular_transaction_predictor import RegularTransactionPredictor
+
     predictor = RegularTransactionPredictor(Config())
-    regular_transactions = predictor.to_regular_transactions(manager.get_transactions())
+    regular_transactions = predictor.to_regular_transactions(manager.get_transaction_store())
     df = pd.DataFrame.from_records([t.to_dict() for t in regular_transactions])
 
     df.rename(columns=DATA_COLUMN_TO_DISPLAY_NAME, inplace=True)
@@ -380,6 +389,27 @@ def generate_input_form(default_start_date, default_end_date):
                 ],
                 class_name="mb-3",
             ),
+            dbc.Row(
+                [
+                    dbc.Label(
+                        "Group the transactions by",
+                        html_for="category-level",
+                        style={"font-weight": "bold"},
+                    ),
+                    dbc.Col(
+                        dbc.RadioItems(
+                            id="category-level",
+                            options=[
+                                {"label": "Category", "value": CategoryLevel.CATEGORY},
+                                {"label": "Parent Category", "value": CategoryLevel.PARENT},
+                            ],
+                            value=CategoryLevel.CATEGORY,
+                            inline=True,
+                        ),
+                    ),
+                ],
+                class_name="mb-3",
+            ),
             dbc.Row(
                 html.Div("", id="status", className="fade alert alert-danger hide"),
                 class_name="mb-3",
@@ -408,22 +438,38 @@ def generate_input_form(default_start_date, default_end_date):
     )
 
 
-from flask import Flask
+from flask import Flask, Response, g, request
 
 server = Flask(__name__)
 budget_book = Dash(__name__, server=server, external_stylesheets=[dbc.themes.COSMO])
 
-def uploaded_csv_to_iostream(contents, filename):
-    if ".csv" not in filename:
-        return
 
-    content_type, content_string = contents.split(",")
+@server.route("/metrics")
+def metrics():
+    if not get_metrics().is_enabled():
+        return Response(
+            "Metrics are disabled, start the server with --metrics.\n",
+            status=404,
+            mimetype="text/plain",
+        )
+    return Response(get_metrics().to_prometheus_text(), mimetype="text/plain; version=0.0.4")
+
 
-    decoded = base64.b64decode(content_string)
-    iostream = io.StringIO(decoded.decode("utf-8"))
-    return iostream
+@server.before_request
+def start_request_measurement():
+    # Includes the serialization of the callback outputs, which happens after the callback returned
+    if request.path == "/_dash-update-component":
+        g.request_measurement = measure("dash_update_request")
+        g.request_measurement.__enter__()
 
 
+@server.teardown_request
+def stop_request_measurement(exception):
+    # Unlike after_request, teardown also runs if the request raised
+    request_measurement = g.pop("request_measurement", None)
+    if request_measurement is not None:
+        request_measurement.__exit__(None, None, None)
+
 @budget_book.callback(
     Output("modal", "is_open"),
     Input("open-settings-button", "n_clicks"),
@@ -435,117 +481,185 @@ def toggle_modal(n1, is_open):
     return is_open
 
 
+def set_status_error(status_cls, msg):
+    cls = status_cls.replace("hide", "show")
+    cls = cls.replace("alert-success", "alert-danger")
+    return msg, cls
+
+
+def set_status_success(status_cls, msg):
+    cls = status_cls.replace("hide", "show")
+    cls = cls.replace("alert-danger", "alert-success")
+    return msg, cls
+
+
 @budget_book.callback(
     [
-        Output("tabs", "children"),
+        Output("upload-session", "data"),
         Output("date-picker-range", "start_date"),
         Output("date-picker-range", "end_date"),
-        Output("status", "children"),
-        Output("status", "className"),
+        Output("status", "children", allow_duplicate=True),
+        Output("status", "className", allow_duplicate=True),
     ],
-    State("date-picker-range", "start_date"),
-    State("date-picker-range", "end_date"),
-    Input("update-button", "n_clicks"),
     Input("upload-data", "contents"),
     State("upload-data", "filename"),
+    State("upload-session", "data"),
     State("status", "className"),
+    prevent_initial_call=True,
 )
-def update_output(start_date, end_date, n_clicks, contents, filenames, status_cls):
-    ctx = dash.callback_context
-
-    if not ctx.triggered:
+def upload_statements(contents, filenames, session_id, status_cls):
+    # Files are parsed once, later callbacks only receive the id of the session with the parsed uploads
+    if contents is None:
         return dash.no_update
 
-    output_tabs = dash.no_update
     datepicker_start_date = dash.no_update
     datepicker_end_date = dash.no_update
-    status_text = ""
-    status_class = status_cls.replace("show", "hide")
-
-    def set_error(msg):
-        cls = status_class.replace("hide", "show")
-        cls = cls.replace("alert-success", "alert-danger")
-        return msg, cls
-
-    def set_success(msg):
-        cls = status_class.replace("hide", "show")
-        cls = cls.replace("alert-danger", "alert-success")
-        return msg, cls
 
     if isinstance(filenames, str):
         filenames = [filenames]
     if isinstance(contents, str):
         contents = [contents]
 
-    # File uploaded?
-    if ctx.triggered[0]["prop_id"] == "upload-data.contents":
-        invalid_filename = False
-        for filename in filenames:
-            if not filename.endswith(".csv"):
-                status_text, status_class = set_error(
-                    "Invalid file type selected. Only CSV is supported!"
-                )
-                invalid_filename = True
-                break
-
-        if not invalid_filename:
-            df = parse_csv_files_to_dataframe(contents, filenames)
-            datepicker_start_date = df[DataColumns.DATE].min().strftime("%Y-%m-%d")
-            datepicker_end_date = df[DataColumns.DATE].max().strftime("%Y-%m-%d")
-
-            status_text, status_class = set_success(
-                f"{len(filenames)} file(s) selected for analysis. Pick a time range and click on update!"
-            )
-
-    elif ctx.triggered[0]["prop_id"] == "update-button.n_clicks":
-        if start_date is None or end_date is None or start_date >= end_date:
-            status_text, status_class = set_error("Date Range not valid!")
-        elif filenames is None:
-            status_text, status_class = set_error("No files have been selected!")
+    if any(not filename.endswith(".csv") for filename in filenames):
+        session_id = dash.no_update
+        status_text, status_class = set_status_error(
+            status_cls, "Invalid file type selected. Only CSV is supported!"
+        )
+    else:
+        # Further uploads are appended to the statements of the session, if it did not expire
+        session = None if session_id is None else session_store.get(session_id)
+        if session is None:
+            session = AnalysisSession(Config(), demo_transactions)
+        try:
+            with measure("load_uploads") as measurement:
+                num_new_rows = load_statements(session, contents, filenames)
+                measurement.add_rows(num_new_rows)
+        except StatementLoadException as e:
+            session_id = dash.no_update
+            status_text, status_class = set_status_error(status_cls, f"Failed to load file(s): {e}")
         else:
-            df = parse_csv_files_to_dataframe(contents, filenames)
-            csv_parser = AccountStatementCsvParser(
-                df,
-                Config(),
-            )
-            status_text, status_class = set_success(
-                f"{len(filenames)} file(s) uploaded succesfully. Pick a time range and click on update!"
+            if session_id is None or session_store.get(session_id) is not session:
+                session_id = session_store.create(session)
+            dates = session.get_transaction_store().get_dataframe()[DataColumns.DATE]
+            datepicker_start_date = dates.min().strftime("%Y-%m-%d")
+            datepicker_end_date = dates.max().strftime("%Y-%m-%d")
+
+            status_text, status_class = set_status_success(
+                status_cls,
+                f"{len(filenames)} file(s) added, {num_new_rows} new transactions. Pick a time range and click on update!",
             )
 
-            transaction_visualizer = TransactionVisualizer(Config())
-            transaction_visualizer.set_transactions(csv_parser.to_dated_transactions())
+    return (
+        session_id,
+        datepicker_start_date,
+        datepicker_end_date,
+        status_text,
+        status_class,
+    )
+
+
+@budget_book.callback(
+    [
+        Output("tabs", "children"),
+        Output("status", "children", allow_duplicate=True),
+        Output("status", "className", allow_duplicate=True),
+    ],
+    State("date-picker-range", "start_date"),
+    State("date-picker-range", "end_date"),
+    Input("update-button", "n_clicks"),
+    State("upload-session", "data"),
+    State("category-level", "value"),
+    State("status", "className"),
+    prevent_initial_call=True,
+)
+def update_output(start_date, end_date, n_clicks, session_id, category_level, status_cls):
+    output_tabs = dash.no_update
+    session = None if session_id is None else session_store.get(session_id)
+
+    if start_date is None or end_date is None or start_date >= end_date:
+        status_text, status_class = set_status_error(status_cls, "Date Range not valid!")
+    elif session_id is None:
+        status_text, status_class = set_status_error(status_cls, "No files have been selected!")
+    elif session is None:
+        status_text, status_class = set_status_error(
+            status_cls, "Upload expired, please upload the file(s) again!"
+        )
+    else:
+        # Re-evaluates the categories that can be affected if the category mapping was edited
+        with session.use_transaction_visualizer() as transaction_visualizer:
+            transaction_visualizer.set_category_level(category_level)
 
             transaction_visualizer.set_analysis_interval(
                 datetime.strptime(start_date, "%Y-%m-%d").date(),
                 datetime.strptime(end_date, "%Y-%m-%d").date() + relativedelta(days=1),
             )
             if transaction_visualizer.dataset_is_valid():
-                output_tabs = generate_tabs(transaction_visualizer, with_predictions_tab=enable_predictions)
-                status_text, status_class = set_success("Data visualization updated!")
+                with measure("generate_tabs") as measurement:
+                    output_tabs = generate_tabs(transaction_visualizer, with_predictions_tab=enable_predictions)
+                    measurement.add_rows(len(transaction_visualizer.get_dataframe()))
+                status_text, status_class = set_status_success(status_cls, "Data visualization updated!")
             else:
-                status_text, status_class = set_error("Internal error!")
-    else:
-        status_text, status_class = set_error("Invalid trigger!")
+                status_text, status_class = set_status_error(status_cls, "Internal error!")
 
     return (
         output_tabs,
-        datepicker_start_date,
-        datepicker_end_date,
         status_text,
         status_class,
     )
 
-def parse_csv_files_to_dataframe(contents, filenames):
-    dfs = []
-    for filename, content in zip(filenames, contents):
-        parser = AccountStatementCsvParser(
-                    uploaded_csv_to_iostream(content, filename),
-                    Config(),
-                )
-        dfs.append(parser.get_csv_dataframe())
 
-    df = pd.concat(dfs).drop_duplicates()
-    return df
+def generate_layout(tabs, session_id=None, start_date=default_start_date, end_date=default_end_date):
+    return dbc.Container(
+        [
+            html.H1("Budget Book Dashboard", style={"textAlign": "center"}),
+            dbc.Button(
+                "Open Settings",
+                id="open-settings-button",
+                className="mb-3",
+                color="primary",
+                n_clicks=0,
+            ),
+            dbc.Spinner(
+                children=generate_input_form(start_date, end_date),
+                type="border",
+                color="primary",
+                fullscreen=True,
+                delay_hide=200,
+                spinner_style={"width": "10rem", "height": "10rem"},
+            ),
+            dbc.Tabs(tabs, id="tabs"),
+            dcc.Store(id="upload-session", data=session_id),
+        ],
+        style={"width": "80vw", "minWidth": "80vw"},
+    )
+
+
+def generate_demo_layout():
+    # Every page load gets its own session, moving the analysis interval then reuses its occurences
+    session = AnalysisSession(Config(), demo_transactions)
+    session_id = session_store.create(session)
+    with session.use_transaction_visualizer() as manager:
+        manager.set_analysis_interval_to_max_range()
+        return generate_layout(
+            generate_tabs(manager, with_predictions_tab=False),
+            session_id,
+            manager.get_first_transaction_date_in_analysis_interval().date(),
+            manager.get_last_transaction_date_in_analysis_interval().date(),
+        )
+
+
+def recategorize_sessions(config: Config):
+    # Runs in the watcher thread, the next update of every session finds its categories up to date
+    for session in session_store.get_values():
+        with measure("recategorize_sessions"):
+            session.update_categories()
+
+
+def load_statements(session: AnalysisSession, contents, filenames) -> int:
+    loader = StatementLoader(
+        Config(), max_workers=statement_loader_workers, cache=statement_cache
+    )
+    return session.load_statements(loader, contents, filenames)
 
 
 if __name__ == "__main__":
@@ -553,56 +667,41 @@ if __name__ == "__main__":
     parser.add_argument("--from-module", type=str, default=None, help="Start server in demo mode with dummy-data.")
     parser.add_argument("--debug", action="store_true", default=False, help="Start webserver in debug mode.")
     parser.add_argument("--generate-predictions", action="store_true", default=False, help="Enable experimental predictions.")
+    parser.add_argument("--workers", type=int, default=1, help="Number of processes used to parse uploaded files.")
+    parser.add_argument("--cache-dir", type=str, default=".statement_cache", help="Directory of the cache of parsed statements.")
+    parser.add_argument("--cache-size-mb", type=int, default=256, help="Maximum size of the statement cache, 0 disables it.")
+    parser.add_argument("--session-ttl-minutes", type=float, default=60, help="Time after which unused uploads are removed from the server.")
+    parser.add_argument("--metrics", action="store_true", default=False, help="Record the duration of every stage and serve them on /metrics.")
     parser.add_argument("config", type=str, help="Path to configuration yaml file!")
 
     args = parser.parse_args()
 
+    get_metrics().set_enabled(args.metrics)
+
     if args.generate_predictions:
         enable_predictions = True
+    statement_loader_workers = args.workers
+    session_store = SessionStore(ttl_seconds=args.session_ttl_minutes * 60)
+    if args.cache_size_mb > 0:
+        statement_cache = StatementCache(args.cache_dir, args.cache_size_mb * 2**20)
 
     # Instantiate shared config once with path to config file
     Config(args.config)
 
-    if args.from_module: 
-        manager = TransactionVisualizer(config=Config())
+    # Pick up edits of the category mapping without restarting the server
+    config_watcher = ConfigWatcher(Config())
+    config_watcher.add_callback(recategorize_sessions)
+    config_watcher.start()
 
+    if args.from_module:
         import importlib
         try:
             imported_module = importlib.import_module(args.from_module)
-            manager.add_transactions(imported_module.build_dataset())
+            demo_transactions = imported_module.build_dataset()
         except :
             raise ModuleNotFoundError(f"Provided module {args.from_module} can not be imported!")
 
-        manager.set_analysis_interval_to_max_range()
-
-        budget_book.layout = dbc.Container(
-            [
-                html.H1("Budget Book Dashboard", style={"textAlign": "center"}),
-                dbc.Tabs(generate_tabs(manager, with_predictions_tab=False), id="tabs"),
-            ],
-            style={"width": "80vw", "minWidth": "80vw"},
-        )
+        budget_book.layout = generate_demo_layout
     else:
-        budget_book.layout = dbc.Container(
-            [
-                html.H1("Budget Book Dashboard", style={"textAlign": "center"}),
-                dbc.Button(
-                    "Open Settings",
-                    id="open-settings-button",
-                    className="mb-3",
-                    color="primary",
-                    n_clicks=0,
-                ),
-                dbc.Spinner(
-                    children=generate_input_form(default_start_date, default_end_date),
-                    type="border",
-                    color="primary",
-                    fullscreen=True,
-                    delay_hide=200,
-                    spinner_style={"width": "10rem", "height": "10rem"},
-                ),
-                dbc.Tabs(generate_tabs(None, with_predictions_tab=False), id="tabs"),
-            ],
-            style={"width": "80vw", "minWidth": "80vw"},
-        )
+        budget_book.layout = generate_layout(generate_tabs(None, with_predictions_tab=False))
     budget_book.run_server(debug=args.debug)
@@ -0,0 +1,139 @@
+import os.path
+import sys
+import argparse
+
+import pandas as pd
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "src"))
+sys.path.append(SRC_DIR)
+
+from BudgetBook.account_statement_parser import AccountStatementCsvParser
+from BudgetBook.batch_pipeline import (
+    OUTPUT_FORMAT_CSV,
+    OUTPUT_FORMAT_PARQUET,
+    StageTimer,
+    find_statement_files,
+    get_ledger_columns,
+    get_monthly_category_aggregates,
+    write_dataframe,
+)
+from BudgetBook.config_parser import Config, ConfigKeywords
+from BudgetBook.statement_loader import StatementLoader, StatementLoadException
+from BudgetBook.transaction_ledger import TransactionLedger
+
+
+def parse_statements(config: Config, files, chunk_size, measure_chunk_memory=False):
+    parsers = []
+    for file in files:
+        try:
+            parsers.append(AccountStatementCsvParser(file, config, chunk_size, measure_chunk_memory))
+        except Exception as e:
+            raise StatementLoadException({file: f"{type(e).__name__}: {e}"})
+    return parsers
+
+
+def categorize_statements(parsers):
+    ledger = TransactionLedger()
+    for parser in parsers:
+        ledger.append(parser.to_transaction_store().get_dataframe())
+    return ledger.get_dataframe()
+
+
+def print_chunk_memory_usage(files, parsers):
+    for file, parser in zip(files, parsers):
+        for chunk_idx, (num_rows, memory_mib) in enumerate(parser.get_chunk_memory_usage()):
+            print(f"{file}: chunk {chunk_idx} with {num_rows} rows, {memory_mib:.1f} MiB")
+
+
+def detect_regular_transactions(config: Config, dataframe: pd.DataFrame):
+    # The predictor pulls in sklearn, only import it if requested
+    from BudgetBook.regular_transaction_predictor import RegularTransactionPredictor
+    from BudgetBook.transaction_store import TransactionStore
+
+    predictor = RegularTransactionPredictor(config)
+    regular_transactions = predictor.to_regular_transactions(TransactionStore(dataframe))
+    return pd.DataFrame([t.to_dict() for t in regular_transactions])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Parses and categorizes statements without the webserver and exports the results."
+    )
+    parser.add_argument("--output-dir", type=str, default="batch_output", help="Directory of the exported files.")
+    parser.add_argument("--format", type=str, default=OUTPUT_FORMAT_PARQUET, choices=[OUTPUT_FORMAT_PARQUET, OUTPUT_FORMAT_CSV], help="Format of the exported files.")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Read statements in chunks of this many rows.")
+    parser.add_argument("--workers", type=int, default=1, help="Number of processes used to parse the statements.")
+    parser.add_argument("--verbose", action="store_true", default=False, help="Print the rows and memory of every chunk read with --chunk-size.")
+    parser.add_argument("--generate-predictions", action="store_true", default=False, help="Detect regular transactions as well.")
+    parser.add_argument("config", type=str, help="Path to configuration yaml file!")
+    parser.add_argument("statements", type=str, nargs="+", help="Statement csv files or directories containing them.")
+
+    args = parser.parse_args()
+
+    config = Config(args.config)
+    files = find_statement_files(args.statements)
+    if len(files) == 0:
+        parser.error("No statement csv files found")
+    if args.chunk_size is not None and config.get_csv_engine() == ConfigKeywords.CSV_ENGINE_PYARROW:
+        parser.error('--chunk-size can not be combined with csv_engine: "pyarrow"')
+    if args.verbose and args.workers > 1:
+        parser.error("--verbose can not be combined with --workers, the chunks are read in the worker processes")
+
+    timer = StageTimer()
+    try:
+        if args.workers > 1:
+            # Parsing and categorization both happen in the worker processes
+            dataframe = timer.run(
+                "parse+categ.",
+                StatementLoader(config, max_workers=args.workers, chunk_size=args.chunk_size).load,
+                files,
+                num_rows=len,
+            )
+        else:
+            parsers = timer.run(
+                "parse",
+                parse_statements,
+                config,
+                files,
+                args.chunk_size,
+                args.verbose,
+                num_rows=lambda parsers: sum(len(p.get_csv_dataframe()) for p in parsers),
+            )
+            if args.verbose:
+                print_chunk_memory_usage(files, parsers)
+            dataframe = timer.run("categorize", categorize_statements, parsers, num_rows=len)
+    except StatementLoadException as e:
+        print(f"Failed to load statements:\n{e}", file=sys.stderr)
+        return 1
+
+    ledger = get_ledger_columns(dataframe)
+    aggregates = timer.run(
+        "aggregate", get_monthly_category_aggregates, ledger, num_rows=len(ledger)
+    )
+    outputs = {"transactions": ledger, "monthly_categories": aggregates}
+
+    if args.generate_predictions:
+        outputs["regular_transactions"] = timer.run(
+            "predict", detect_regular_transactions, config, dataframe, num_rows=len(ledger)
+        )
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    output_paths = {
+        name: os.path.join(args.output_dir, f"{name}.{args.format}") for name in outputs
+    }
+
+    def export():
+        for name, output in outputs.items():
+            write_dataframe(output, output_paths[name])
+
+    timer.run("export", export, num_rows=sum(len(o) for o in outputs.values()))
+
+    print(f"Processed {len(files)} statements with {len(ledger)} transactions")
+    print(timer.get_summary())
+    for path in output_paths.values():
+        print(f"Wrote {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,65 +1,176 @@
+import io
+import logging
+
 import numpy as np
 import pandas as pd
 
 from BudgetBook.category_parser import CategoryParser
-from BudgetBook.config_parser import DataColumns
-from BudgetBook.dated_transaction import DatedTransaction
+from BudgetBook.config_parser import ConfigKeywords, DataColumns
+from BudgetBook.date_parsing import get_date_parser
+from BudgetBook.metrics import measure
+from BudgetBook.transaction_store import TransactionStore, concat_dataframes, to_categorical_columns
+from BudgetBook.text_normalization import add_normalized_columns
+
+
+logger = logging.getLogger(__name__)
 
 
 class AccountStatementCsvParser:
-    def __init__(self, csv_statement_path_or_iostream_or_dataframe, config):
+    def __init__(
+        self,
+        csv_statement_path_or_iostream_or_dataframe,
+        config,
+        chunk_size: int = None,
+        measure_chunk_memory: bool = False,
+    ) -> None:
+        """If chunk_size is given, the csv file is read and processed in chunks of that many rows.
+
+        Chunks are read with pandas' "c" engine, chunk_size can not be combined with csv_engine: "pyarrow".
+        With measure_chunk_memory, get_chunk_memory_usage returns the rows and memory of every chunk.
+        """
         self._config = config
         self._category_parser = CategoryParser(self._config)
+        self._categories = None
+        self._categories_mapping = None
+        self._measure_chunk_memory = measure_chunk_memory
+        self._chunk_memory_usage = []
 
-        map_internal_to_csv_column = self._config.get_csv_columns_mapping()
-        map_csv_to_internal_column = {
-            v: k for k, v in map_internal_to_csv_column.items()
-        }
+        if chunk_size is not None and config.get_csv_engine() == ConfigKeywords.CSV_ENGINE_PYARROW:
+            raise ValueError('chunk_size can not be combined with csv_engine: "pyarrow"')
 
         if isinstance(csv_statement_path_or_iostream_or_dataframe, pd.DataFrame):
             self._csv_data = csv_statement_path_or_iostream_or_dataframe
         else:
-            self._csv_data = pd.read_csv(
-                csv_statement_path_or_iostream_or_dataframe,
-                sep=";",
-                decimal=",",
-                na_filter=False,
-                dtype={
-                    map_internal_to_csv_column[DataColumns.AMOUNT]: np.float32,
-                    map_internal_to_csv_column[DataColumns.DESCRIPTION]: str,
-                    map_internal_to_csv_column[DataColumns.PAYMENT_PARTY]: str,
-                    map_internal_to_csv_column[DataColumns.TYPE_OF_TRANSFER]: str,
-                    map_internal_to_csv_column[DataColumns.DATE]: str,
-                },
-            )
+            with measure("parse_csv") as measurement:
+                if chunk_size is None:
+                    self._csv_data = self._prepare_chunk(
+                        self._read_csv(csv_statement_path_or_iostream_or_dataframe)
+                    )
+                else:
+                    self._read_csv_in_chunks(csv_statement_path_or_iostream_or_dataframe, chunk_size)
+                measurement.add_rows(len(self._csv_data))
 
-            # Rename columns to internal names
-            self._csv_data = self._csv_data[map_internal_to_csv_column.values()]
-            self._csv_data.rename(
-                columns=map_csv_to_internal_column,
-                inplace=True,
-            )
+        # Normalize text once, categorization and prediction read these columns
+        with measure("normalize_text") as measurement:
+            add_normalized_columns(self._csv_data)
+            measurement.add_rows(len(self._csv_data))
+
+    def _read_csv(self, csv_statement_path_or_iostream) -> pd.DataFrame:
+        if self._config.get_csv_engine() == ConfigKeywords.CSV_ENGINE_PYARROW:
+            return self._read_csv_with_pyarrow(csv_statement_path_or_iostream)
+        return pd.read_csv(csv_statement_path_or_iostream, **self._get_read_csv_arguments())
 
-            # Parse date
-            self._csv_data[DataColumns.DATE] = pd.to_datetime(
-                self._csv_data[DataColumns.DATE],
-                format=self._config.get_csv_date_format(),
+    def _read_csv_with_pyarrow(self, csv_statement_path_or_iostream) -> pd.DataFrame:
+        # pandas' pyarrow engine does not support decimal=",", so pyarrow is used directly
+        import pyarrow as pa
+        import pyarrow.csv
+
+        if isinstance(csv_statement_path_or_iostream, io.TextIOBase):
+            csv_statement_path_or_iostream = io.BytesIO(
+                csv_statement_path_or_iostream.read().encode("utf-8")
             )
 
+        map_internal_to_csv_column = self._config.get_csv_columns_mapping()
+        column_types = {c: pa.string() for c in map_internal_to_csv_column.values()}
+        column_types[map_internal_to_csv_column[DataColumns.AMOUNT]] = pa.float32()
+
+        table = pyarrow.csv.read_csv(
+            csv_statement_path_or_iostream,
+            parse_options=pyarrow.csv.ParseOptions(delimiter=";"),
+            convert_options=pyarrow.csv.ConvertOptions(
+                include_columns=list(map_internal_to_csv_column.values()),
+                column_types=column_types,
+                decimal_point=",",
+            ),
+        )
+        return table.to_pandas()
+
+    def _get_read_csv_arguments(self):
+        map_internal_to_csv_column = self._config.get_csv_columns_mapping()
+        return dict(
+            sep=";",
+            decimal=",",
+            na_filter=False,
+            usecols=list(map_internal_to_csv_column.values()),
+            dtype={
+                map_internal_to_csv_column[DataColumns.AMOUNT]: np.float32,
+                map_internal_to_csv_column[DataColumns.DESCRIPTION]: str,
+                map_internal_to_csv_column[DataColumns.PAYMENT_PARTY]: str,
+                map_internal_to_csv_column[DataColumns.TYPE_OF_TRANSFER]: str,
+                map_internal_to_csv_column[DataColumns.DATE]: str,
+            },
+        )
+
+    def _prepare_chunk(self, csv_data: pd.DataFrame) -> pd.DataFrame:
+        map_internal_to_csv_column = self._config.get_csv_columns_mapping()
+        map_csv_to_internal_column = {
+            v: k for k, v in map_internal_to_csv_column.items()
+        }
+
+        # Rename columns to internal names
+        csv_data = csv_data[list(map_internal_to_csv_column.values())]
+        csv_data = csv_data.rename(columns=map_csv_to_internal_column, copy=False)
+
+        # Parse date
+        csv_data[DataColumns.DATE] = get_date_parser(
+            self._config.get_csv_date_format()
+        ).parse(csv_data[DataColumns.DATE])
+        return to_categorical_columns(csv_data)
+
+    def _read_csv_in_chunks(self, csv_statement_path_or_iostream, chunk_size: int):
+        # Categorize while reading, so only one chunk of raw csv data is alive at a time
+        category_mapping = self._category_parser.get_category_mapping()
+
+        chunks = []
+        categories = []
+        with pd.read_csv(
+            csv_statement_path_or_iostream,
+            chunksize=chunk_size,
+            **self._get_read_csv_arguments(),
+        ) as reader:
+            for chunk_idx, chunk in enumerate(reader):
+                chunk = add_normalized_columns(self._prepare_chunk(chunk))
+                categories.append(self._category_parser.categorize_frame(chunk))
+                chunks.append(chunk)
+                # Measuring object columns is expensive, only do it if it is requested or logged
+                if self._measure_chunk_memory or logger.isEnabledFor(logging.DEBUG):
+                    memory_mib = chunk.memory_usage(deep=True).sum() / 2**20
+                    self._chunk_memory_usage.append((len(chunk), memory_mib))
+                    logger.debug("Read chunk %d with %d rows, %.1f MiB", chunk_idx, len(chunk), memory_mib)
+
+        self._csv_data = concat_dataframes(chunks, copy=False)
+        self._categories = pd.concat(categories, copy=False)
+        self._categories_mapping = category_mapping
+        logger.info("Read %d rows in %d chunks", len(self._csv_data), len(chunks))
+
+    def get_chunk_memory_usage(self) -> list:
+        """Number of rows and MiB per chunk, empty unless the file was read in chunks with measure_chunk_memory."""
+        return self._chunk_memory_usage
+
     def get_csv_dataframe(self):
         return self._csv_data
 
-    def to_dated_transactions(self):
-        transactions = []
-        for _, row in self._csv_data.iterrows():
-            transactions.append(
-                DatedTransaction(
-                    row[DataColumns.PAYMENT_PARTY],
-                    row[DataColumns.DATE].date(),
-                    row[DataColumns.AMOUNT],
-                    row[DataColumns.DESCRIPTION],
-                    self._category_parser.get_category_for_record(row),
+    def get_categories(self) -> pd.Series:
+        """Category per row, only changed rows are re-evaluated after the category mapping was reloaded."""
+        category_mapping = self._category_parser.get_category_mapping()
+        if self._categories is None:
+            with measure("categorize") as measurement:
+                self._categories = self._category_parser.categorize_frame(self._csv_data)
+                measurement.add_rows(len(self._csv_data))
+        elif category_mapping is not self._categories_mapping:
+            with measure("recategorize") as measurement:
+                self._categories = self._category_parser.recategorize_frame(
+                    self._csv_data, self._categories, self._categories_mapping
                 )
-            )
+                measurement.add_rows(len(self._csv_data))
+        self._categories_mapping = category_mapping
+
+        return self._categories
 
-        return transactions
+    def to_transaction_store(self) -> TransactionStore:
+        dataframe = self._csv_data.copy(deep=False)
+        dataframe[DataColumns.CATEGORY] = self.get_categories().to_numpy()
+        return TransactionStore(dataframe)
+
+    def to_dated_transactions(self):
+        return list(self.to_transaction_store())
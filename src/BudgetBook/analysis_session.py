@@ -0,0 +1,95 @@
+import contextlib
+import threading
+from typing import List
+
+from BudgetBook.category_parser import CategoryParser
+from BudgetBook.config_parser import Config, DataColumns
+from BudgetBook.metrics import measure
+from BudgetBook.regular_transaction import RegularTransaction
+from BudgetBook.statement_loader import StatementLoader
+from BudgetBook.transaction_ledger import TransactionLedger
+from BudgetBook.transaction_store import TransactionStore
+from BudgetBook.transaction_visualizer import TransactionVisualizer
+
+
+class AnalysisSession:
+    """Uploads of one browser session, kept on the server between callbacks.
+
+    Statements are appended to a ledger, so uploading another month only parses and hashes the new file.
+    The categories are stored together with the category mapping they were computed with.
+    After the mapping was reloaded, only the rows that can be affected by the edit are re-evaluated.
+    The visualizer is kept as well, moving the analysis interval reuses the occurences it expanded before.
+    """
+
+    def __init__(self, config: Config, scheduled_transactions: List[RegularTransaction] = None) -> None:
+        self._lock = threading.Lock()
+        self._category_parser = CategoryParser(config)
+        self._ledger = TransactionLedger()
+        self._category_mapping = self._category_parser.get_category_mapping()
+        self._transaction_store = None
+
+        self._visualizer_lock = threading.Lock()
+        self._transaction_visualizer = TransactionVisualizer(config)
+        self._transaction_visualizer.add_transactions(scheduled_transactions or [])
+        self._visualized_transaction_store = None
+
+    def load_statements(self, loader: StatementLoader, sources: List, filenames: List[str] = None) -> int:
+        """Appends the rows of the statements that are not part of the session yet, returns their number.
+
+        Raises a StatementLoadException if any statement can not be loaded, the session is unchanged then.
+        """
+        with self._lock:
+            # Earlier uploads are brought to the mapping the new statements are categorized with
+            self._update_categories_locked()
+            num_rows = len(self._ledger)
+            loader.load(sources, filenames, ledger=self._ledger)
+            self._transaction_store = None
+            return len(self._ledger) - num_rows
+
+    def get_transaction_store(self) -> TransactionStore:
+        """Transactions categorized with the current category mapping."""
+        with self._lock:
+            self._update_categories_locked()
+            if self._transaction_store is None:
+                self._transaction_store = self._ledger.to_transaction_store()
+            return self._transaction_store
+
+    @contextlib.contextmanager
+    def use_transaction_visualizer(self):
+        """Visualizer of the scheduled transactions and the current statements, used by one caller at a time."""
+        with self._visualizer_lock:
+            transaction_store = self.get_transaction_store()
+            if transaction_store is not self._visualized_transaction_store:
+                self._transaction_visualizer.set_transaction_stores(
+                    [transaction_store] if len(self._ledger) > 0 else []
+                )
+                self._visualized_transaction_store = transaction_store
+            yield self._transaction_visualizer
+
+    def get_category_mapping(self) -> dict:
+        """Mapping the categories of the transactions were computed with."""
+        return self._category_mapping
+
+    def update_categories(self) -> bool:
+        """Brings the categories to the current category mapping, returns True if it changed."""
+        with self._lock:
+            return self._update_categories_locked()
+
+    def _update_categories_locked(self) -> bool:
+        category_mapping = self._category_parser.get_category_mapping()
+        if category_mapping is self._category_mapping:
+            return False
+
+        dataframe = self._ledger.get_dataframe()
+        with measure("recategorize") as measurement:
+            categories = self._category_parser.recategorize_frame(
+                dataframe.drop(columns=DataColumns.CATEGORY),
+                dataframe[DataColumns.CATEGORY],
+                self._category_mapping,
+            )
+            measurement.add_rows(len(dataframe))
+
+        self._ledger.set_categories(categories)
+        self._transaction_store = None
+        self._category_mapping = category_mapping
+        return True
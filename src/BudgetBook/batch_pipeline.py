@@ -0,0 +1,99 @@
+import os
+import time
+from typing import Iterable, List
+
+import pandas as pd
+
+from BudgetBook.config_parser import DataColumns, NormalizedDataColumns
+
+OUTPUT_FORMAT_PARQUET = "parquet"
+OUTPUT_FORMAT_CSV = "csv"
+
+MONTH_COLUMN = "month"
+NUM_TRANSACTIONS_COLUMN = "num_transactions"
+
+
+def find_statement_files(paths: Iterable[str]) -> List[str]:
+    """Statement files, directories are replaced by the csv files they contain."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(
+                os.path.join(path, name)
+                for name in sorted(os.listdir(path))
+                if name.lower().endswith(".csv")
+                and os.path.isfile(os.path.join(path, name))
+            )
+        elif os.path.isfile(path):
+            files.append(path)
+        else:
+            raise FileNotFoundError(f"Statement file or directory {path} does not exist")
+    return files
+
+
+def get_ledger_columns(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """Data frame without the normalized helper columns."""
+    normalized_columns = [
+        NormalizedDataColumns.PAYMENT_PARTY,
+        NormalizedDataColumns.TYPE_OF_TRANSFER,
+        NormalizedDataColumns.DESCRIPTION,
+        NormalizedDataColumns.DESCRIPTION_SIGNATURE,
+    ]
+    return dataframe.drop(
+        columns=[c for c in normalized_columns if c in dataframe]
+    ).sort_values(DataColumns.DATE, kind="stable", ignore_index=True)
+
+
+def get_monthly_category_aggregates(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """Sum and number of transactions per month and category."""
+    months = dataframe[DataColumns.DATE].dt.to_period("M").dt.to_timestamp()
+    grouped = dataframe.groupby(
+        [months.rename(MONTH_COLUMN), DataColumns.CATEGORY], observed=True
+    )[DataColumns.AMOUNT]
+    aggregates = grouped.agg(["sum", "size"]).rename(
+        columns={"sum": DataColumns.AMOUNT, "size": NUM_TRANSACTIONS_COLUMN}
+    )
+    return aggregates.sort_index().reset_index()
+
+
+def write_dataframe(dataframe: pd.DataFrame, path: str):
+    if path.endswith("." + OUTPUT_FORMAT_PARQUET):
+        dataframe.to_parquet(path, index=False)
+    elif path.endswith("." + OUTPUT_FORMAT_CSV):
+        dataframe.to_csv(path, index=False)
+    else:
+        raise ValueError(f"Unsupported output format of {path}")
+
+
+class StageTimer:
+    """Measures the wall clock time and throughput of consecutive pipeline stages."""
+
+    def __init__(self, clock=time.perf_counter) -> None:
+        self._clock = clock
+        self._stages = []
+
+    def run(self, name: str, function, *args, num_rows=None, **kwargs):
+        """Calls function, num_rows is either a fixed number or a function of the result."""
+        start = self._clock()
+        result = function(*args, **kwargs)
+        duration = self._clock() - start
+        if callable(num_rows):
+            num_rows = num_rows(result)
+        self._stages.append((name, duration, num_rows))
+        return result
+
+    def get_stages(self) -> List[tuple]:
+        """Name, duration in seconds and number of processed rows (or None) per stage."""
+        return list(self._stages)
+
+    def get_summary(self) -> str:
+        lines = [f"{'stage':<12} {'seconds':>9} {'rows':>10} {'rows/sec':>12}"]
+        for name, duration, num_rows in self._stages + [
+            ("total", sum(d for _, d, _ in self._stages), None)
+        ]:
+            rows = "" if num_rows is None else f"{num_rows:d}"
+            rows_per_sec = (
+                f"{num_rows / duration:.0f}" if num_rows is not None and duration > 0 else ""
+            )
+            lines.append(f"{name:<12} {duration:>9.3f} {rows:>10} {rows_per_sec:>12}")
+        return "\n".join(lines)
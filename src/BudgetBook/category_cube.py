@@ -0,0 +1,113 @@
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from BudgetBook.config_parser import DataColumns
+from BudgetBook.transaction_store import isin_categories
+
+
+class CategoryLevel:
+    CATEGORY = "category"
+    PARENT = "parent"
+
+
+class TransactionFlow:
+    INCOME = "income"
+    PAYMENT = "payment"
+    INTERNAL_INCOME = "internal income"
+    INTERNAL_PAYMENT = "internal payment"
+
+    ALL = [INCOME, PAYMENT, INTERNAL_INCOME, INTERNAL_PAYMENT]
+
+
+class CategoryCube:
+    """Sum and number of transactions per month, category and flow, with the parent categories rolled up.
+
+    Built once from the transactions, every further aggregation only reads the (small) cube.
+    Categories without a parent are their own parent.
+    """
+
+    MONTH = "date_without_day"
+    FLOW = "flow"
+    COUNT = "count"
+
+    def __init__(
+        self,
+        dataframe: pd.DataFrame,
+        internal_categories: List[str],
+        parent_per_category: Dict[str, str],
+    ) -> None:
+        is_internal = isin_categories(dataframe[DataColumns.CATEGORY], internal_categories)
+        is_payment = (dataframe[DataColumns.AMOUNT] < 0).to_numpy()
+        flows = pd.Categorical.from_codes(
+            2 * is_internal.astype(np.int8) + is_payment,
+            categories=TransactionFlow.ALL,
+        )
+
+        leaves = (
+            dataframe.groupby(
+                [dataframe[CategoryCube.MONTH], dataframe[DataColumns.CATEGORY], flows],
+                observed=True,
+            )[DataColumns.AMOUNT]
+            .agg(["sum", "size"])
+            .rename(columns={"sum": DataColumns.AMOUNT, "size": CategoryCube.COUNT})
+        )
+        leaves.index.names = [CategoryCube.MONTH, DataColumns.CATEGORY, CategoryCube.FLOW]
+        leaves = leaves.reset_index()
+
+        categories = leaves[DataColumns.CATEGORY].astype(object)
+        leaves[CategoryLevel.PARENT] = categories.map(
+            lambda c: parent_per_category.get(c) or c
+        )
+
+        # Parent totals are sums of the child aggregates
+        self._cubes = {
+            CategoryLevel.CATEGORY: leaves.drop(columns=CategoryLevel.PARENT),
+            CategoryLevel.PARENT: leaves.groupby(
+                [CategoryCube.MONTH, CategoryLevel.PARENT, CategoryCube.FLOW],
+                observed=True,
+            )[[DataColumns.AMOUNT, CategoryCube.COUNT]]
+            .sum()
+            .reset_index()
+            .rename(columns={CategoryLevel.PARENT: DataColumns.CATEGORY}),
+        }
+        self._children = (
+            leaves.groupby(CategoryLevel.PARENT)[DataColumns.CATEGORY]
+            .agg(lambda c: sorted(set(c.astype(str))))
+            .to_dict()
+        )
+
+    def get_categories(self, level: str) -> List[str]:
+        return sorted(self._get_cube(level)[DataColumns.CATEGORY].astype(str).unique())
+
+    def get_children(self, parent: str) -> List[str]:
+        return self._children.get(parent, [])
+
+    def get_per_month(self, level: str, flows: List[str] = TransactionFlow.ALL) -> pd.DataFrame:
+        """Sum and count per month and category of the level, in columns date_without_day, category, amount and count."""
+        cube = self._get_cube(level)
+        cube = cube[cube[CategoryCube.FLOW].isin(flows)]
+        return (
+            cube.groupby([CategoryCube.MONTH, DataColumns.CATEGORY], observed=True)[
+                [DataColumns.AMOUNT, CategoryCube.COUNT]
+            ]
+            .sum()
+            .sort_index()
+            .reset_index()
+        )
+
+    def get_total_per_month(self, level: str, flows: List[str] = TransactionFlow.ALL) -> pd.Series:
+        per_month = self.get_per_month(level, flows)
+        return per_month.groupby(CategoryCube.MONTH)[DataColumns.AMOUNT].sum()
+
+    def get_total_per_category(self, level: str, flows: List[str] = TransactionFlow.ALL) -> pd.Series:
+        cube = self._get_cube(level)
+        cube = cube[cube[CategoryCube.FLOW].isin(flows)]
+        return cube.groupby(DataColumns.CATEGORY, observed=True)[DataColumns.AMOUNT].sum().sort_index()
+
+    def _get_cube(self, level: str) -> pd.DataFrame:
+        try:
+            return self._cubes[level]
+        except KeyError:
+            raise AttributeError(f"Unknown category level '{level}'")
@@ -1,30 +1,61 @@
-from BudgetBook.config_parser import DATA_COLUMN_TO_DISPLAY_NAME, DataColumns, ConfigKeywords, Config
+from collections import OrderedDict, namedtuple
+import logging
 
+import numpy as np
+import pandas as pd
+
+from BudgetBook.config_parser import DATA_COLUMN_TO_NORMALIZED_COLUMN, DataColumns, ConfigKeywords, Config
+from BudgetBook.rule_program import CategoryRuleProgram, InvalidCateogryMappingException
+from BudgetBook.text_normalization import normalize_text_value
+
+
+logger = logging.getLogger(__name__)
+
+CategoryCacheInfo = namedtuple("CategoryCacheInfo", ["hits", "misses", "maxsize", "currsize"])
 
-class InvalidCateogryMappingException(Exception):
-    def __init__(self, *args: object) -> None:
-        super().__init__(*args)
 
 class CategoryParser:
-    def __init__(self, config: Config) -> None:
+    def __init__(self, config: Config, cache_size: int = 4096) -> None:
         self._config = config
-        self._category_mapping = config.get_category_mapping()
         self._csv_columns_mapping = config.get_csv_columns_mapping()
 
-        self._validate_category_mapping()
+        # LRU cache from the normalized text fields and amount sign to the category
+        self._cache_size = cache_size
+        self._category_cache = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+        self._category_mapping_revision = None
+        self._update_category_mapping()
+
+    def _update_category_mapping(self):
+        revision = self._config.get_category_mapping_revision()
+        if revision == self._category_mapping_revision:
+            return
 
+        self._category_mapping = self._config.get_category_mapping()
+        self._rule_program = CategoryRuleProgram.for_mapping(
+            self._category_mapping, self._config.get_yaml_file_path()
+        )
 
-    def _validate_category_mapping(self):
-        for category, rules in self._category_mapping.items():
-            for rule_name, rule_value in rules.items():
-                valid_rule_names = [ConfigKeywords.CATEGORY_RULE_AND, ConfigKeywords.CATEGORY_RULE_OR, *DATA_COLUMN_TO_DISPLAY_NAME.keys()]
-                if rule_name not in valid_rule_names:
-                    raise InvalidCateogryMappingException(f"Provided rule name '{rule_name}' not allowed. Use one of: '{valid_rule_names}'.")
+        self._category_cache.clear()
+        self._category_mapping_revision = revision
+
+    def get_cache_info(self) -> CategoryCacheInfo:
+        return CategoryCacheInfo(
+            self._cache_hits,
+            self._cache_misses,
+            self._cache_size,
+            len(self._category_cache),
+        )
+
+    def clear_cache(self):
+        self._category_cache.clear()
+        self._cache_hits = 0
+        self._cache_misses = 0
 
-                if type(rule_value) not in [list, dict]:
-                    raise InvalidCateogryMappingException(f"Provided rule value '{rule_value}' for rule '{rule_name}' not allowed. Use one of: 'list, dict'.")            
-        
     def get_parent_category_for_child(self, child_category_name: str):
+        self._update_category_mapping()
         try:
             return self._category_mapping[child_category_name][ConfigKeywords.CATEGORY_PARENT]
         except KeyError:
@@ -34,54 +65,207 @@ class CategoryParser:
         if DataColumns.CATEGORY in record:
             return record[DataColumns.CATEGORY]
 
-        for category, rules in self._category_mapping.items():
-            if self._check_category_match(record, rules):
-                return category
+        self._update_category_mapping()
+
+        normalized_fields = {
+            column: CategoryParser._get_normalized_field(record, column)
+            for column in self._rule_program.get_data_columns()
+        }
+        is_income = bool(record[DataColumns.AMOUNT] > 0)
+        cache_key = (*normalized_fields.values(), is_income)
+
+        category = self._category_cache.get(cache_key)
+        if category is not None:
+            self._category_cache.move_to_end(cache_key)
+            self._cache_hits += 1
+            return category
+
+        self._cache_misses += 1
+        category = self._rule_program.get_first_match(normalized_fields)
+        if category is None:
+            category = ConfigKeywords.CATEGORY_DEFAULT_UNKNOWN_INCOME if is_income else ConfigKeywords.CATEGORY_DEFAULT_UNKNOWN_PAYMENT
+
+        self._category_cache[cache_key] = category
+        if len(self._category_cache) > self._cache_size:
+            self._category_cache.popitem(last=False)
 
-        return ConfigKeywords.CATEGORY_DEFAULT_UNKNOWN_INCOME if record[DataColumns.AMOUNT] > 0 else ConfigKeywords.CATEGORY_DEFAULT_UNKNOWN_PAYMENT
+        return category
 
     @staticmethod
-    def _check_category_match(record, mapping_rules):
-        has_and = ConfigKeywords.CATEGORY_RULE_AND in mapping_rules
-        has_or = ConfigKeywords.CATEGORY_RULE_OR in mapping_rules
-
-        if has_and:
-            return CategoryParser._check_and(record, mapping_rules)
-        elif has_or:
-            return CategoryParser._check_or(record, mapping_rules)
+    def _get_normalized_field(record, column):
+        normalized_column = DATA_COLUMN_TO_NORMALIZED_COLUMN.get(column)
+        if normalized_column is not None and normalized_column in record:
+            return record[normalized_column]
+        return normalize_text_value(record[column])
+
+    def categorize_frame(self, dataframe: pd.DataFrame) -> pd.Series:
+        """Vectorized equivalent of calling get_category_for_record on every row."""
+        if DataColumns.CATEGORY in dataframe:
+            return dataframe[DataColumns.CATEGORY]
+
+        self._update_category_mapping()
+
+        fallback = np.where(
+            dataframe[DataColumns.AMOUNT].to_numpy() > 0,
+            ConfigKeywords.CATEGORY_DEFAULT_UNKNOWN_INCOME,
+            ConfigKeywords.CATEGORY_DEFAULT_UNKNOWN_PAYMENT,
+        ).astype(object)
+
+        if len(self._rule_program.get_categories()) == 0:
+            return pd.Series(fallback, index=dataframe.index, name=DataColumns.CATEGORY)
+
+        matches = self._rule_program.match_frame(dataframe).get_match_matrix()
+
+        # argmax returns the first matching category, same as the per record loop
+        category_names = np.array(self._rule_program.get_categories(), dtype=object)
+        categories = np.where(
+            matches.any(axis=1), category_names[matches.argmax(axis=1)], fallback
+        )
+        return pd.Series(categories, index=dataframe.index, name=DataColumns.CATEGORY)
+
+    def get_category_mapping(self) -> dict:
+        self._update_category_mapping()
+        return self._category_mapping
+
+    def recategorize_frame(
+        self,
+        dataframe: pd.DataFrame,
+        categories: pd.Series,
+        previous_category_mapping: dict,
+    ) -> pd.Series:
+        """Updates categories computed with a previous mapping, only re-evaluating rows that can change."""
+        self._update_category_mapping()
+        category_mapping = self._category_mapping
+
+        if DataColumns.CATEGORY in dataframe or category_mapping is previous_category_mapping:
+            return categories
+
+        changed_categories = {
+            c
+            for c in [*previous_category_mapping, *category_mapping]
+            if previous_category_mapping.get(c) != category_mapping.get(c)
+        }
+
+        # If unchanged categories were reordered, first matches can move anywhere
+        if [c for c in previous_category_mapping if c not in changed_categories] != [
+            c for c in category_mapping if c not in changed_categories
+        ]:
+            return self.categorize_frame(dataframe)
+
+        affected = categories.isin(changed_categories).to_numpy()
+
+        changed_rules = CategoryRuleProgram(
+            {c: rules for c, rules in category_mapping.items() if c in changed_categories}
+        )
+        if changed_rules.has_rule_without_keywords():
+            # A rule without any required keyword matches every row
+            affected[:] = True
         else:
-            for filter_key, filter_values in mapping_rules.items():
-                if CategoryParser._field_contains_any(
-                    record[filter_key], filter_values
-                ):
-                    return True
+            # Other rows can only change if they contain a keyword of a changed rule
+            affected |= changed_rules.match_frame(dataframe).get_any_keyword_matches()
 
-        return False
+        logger.debug(
+            "Recategorizing %d of %d rows after %d categories changed",
+            affected.sum(),
+            len(dataframe),
+            len(changed_categories),
+        )
 
-    @staticmethod
-    def _field_contains_any(field, candiates):
-        return any(v.lower() in field.lower() for v in candiates)
+        categories = categories.astype(object, copy=True)
+        if affected.any():
+            categories[affected] = self.categorize_frame(dataframe[affected]).to_numpy()
+        return categories
 
-    @staticmethod
-    def _check_and(record, mapping_rules):
-        for filter_key, filter_values in mapping_rules[
-            ConfigKeywords.CATEGORY_RULE_AND
-        ].items():
-            if not CategoryParser._check_category_match(
-                record,
-                {filter_key: filter_values},
-            ):
-                return False
-        return True
+    def get_category_match_matrix(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        """Evaluates every category rule for every row, not only up to the first match."""
+        self._update_category_mapping()
 
-    @staticmethod
-    def _check_or(record, mapping_rules):
-        for filter_key, filter_values in mapping_rules[
-            ConfigKeywords.CATEGORY_RULE_OR
-        ].items():
-            if CategoryParser._check_category_match(
-                record,
-                {filter_key: filter_values},
-            ):
-                return True
-        return False
+        return pd.DataFrame(
+            self._rule_program.match_frame(dataframe).get_match_matrix(),
+            index=dataframe.index,
+            columns=self._rule_program.get_categories(),
+        )
+
+    def get_category_match_report(self, dataframe: pd.DataFrame):
+        self._update_category_mapping()
+
+        frame_matches = self._rule_program.match_frame(dataframe)
+        return CategoryMatchReport(
+            pd.DataFrame(
+                frame_matches.get_match_matrix(),
+                index=dataframe.index,
+                columns=self._rule_program.get_categories(),
+            ),
+            frame_matches.get_hits_per_keyword(),
+        )
+
+
+class CategoryMatchReport:
+    """Summary of a match matrix: conflicting rows, unused categories and hit counts."""
+
+    # Rows per block when counting overlaps, keeps the temporary float matrix small
+    _OVERLAP_BLOCK_SIZE = 1 << 16
+
+    def __init__(self, match_matrix: pd.DataFrame, hits_per_keyword: pd.Series) -> None:
+        self._match_matrix = match_matrix
+        self._hits_per_keyword = hits_per_keyword
+
+        matches = match_matrix.to_numpy()
+        categories = match_matrix.columns
+
+        self._matches_per_row = matches.sum(axis=1)
+        self._hits_per_category = pd.Series(
+            matches.sum(axis=0), index=categories, dtype=np.int64
+        )
+
+        first_match = (
+            matches.argmax(axis=1)
+            if len(categories) > 0
+            else np.zeros(len(matches), dtype=np.int64)
+        )
+        self._assigned_per_category = pd.Series(
+            np.bincount(
+                first_match[self._matches_per_row > 0], minlength=len(categories)
+            ),
+            index=categories,
+            dtype=np.int64,
+        )
+
+        overlap = np.zeros((len(categories), len(categories)), dtype=np.float64)
+        for start in range(0, len(matches), self._OVERLAP_BLOCK_SIZE):
+            block = matches[start : start + self._OVERLAP_BLOCK_SIZE].astype(np.float32)
+            overlap += block.T @ block
+        self._overlap_counts = pd.DataFrame(
+            overlap.astype(np.int64), index=categories, columns=categories
+        )
+
+    def get_match_matrix(self) -> pd.DataFrame:
+        return self._match_matrix
+
+    def get_conflicting_rows(self) -> pd.DataFrame:
+        """Rows matched by more than one category."""
+        return self._match_matrix[self._matches_per_row > 1]
+
+    def get_unmatched_rows(self) -> pd.Index:
+        return self._match_matrix.index[self._matches_per_row == 0]
+
+    def get_hits_per_category(self) -> pd.Series:
+        """Number of rows matched by each category, including rows won by an earlier category."""
+        return self._hits_per_category
+
+    def get_assigned_per_category(self) -> pd.Series:
+        """Number of rows each category wins under the first match rule."""
+        return self._assigned_per_category
+
+    def get_hits_per_keyword(self) -> pd.Series:
+        return self._hits_per_keyword
+
+    def get_unused_categories(self) -> list:
+        return self._hits_per_category.index[self._hits_per_category == 0].tolist()
+
+    def get_unused_keywords(self) -> list:
+        return self._hits_per_keyword.index[self._hits_per_keyword == 0].tolist()
+
+    def get_overlap_counts(self) -> pd.DataFrame:
+        """Number of rows matched by both categories, the diagonal holds the hits per category."""
+        return self._overlap_counts
@@ -9,6 +9,10 @@ class ConfigKeywords:
 
     CATEGORY_RULE_AND = "and"
     CATEGORY_RULE_OR = "or"
+    CATEGORY_RULE_REGEX = "regex"
+    CATEGORY_RULE_WORD = "word"
+    # Groups categories for the visualization, not a matching rule
+    CATEGORY_PARENT = "parent"
 
     CATEGORY_DEFAULT_UNKNOWN_INCOME = "Unknown Income"
     CATEGORY_DEFAULT_UNKNOWN_PAYMENT  = "Unknown Payment"
@@ -17,6 +21,10 @@ class ConfigKeywords:
 
     CSV_DATE_FORMAT = "date_format"
 
+    CSV_ENGINE = "csv_engine"
+    CSV_ENGINE_C = "c"
+    CSV_ENGINE_PYARROW = "pyarrow"
+
     CATEGORIES_TO_IGNORE = "internal_transfer_categories"
 
 
@@ -29,6 +37,14 @@ class DataColumns:
     CATEGORY = "category"
 
 
+class NormalizedDataColumns:
+    PAYMENT_PARTY = "payment_party_normalized"
+    TYPE_OF_TRANSFER = "type_of_transfer_normalized"
+    DESCRIPTION = "description_normalized"
+    # Normalized description without reference numbers, used to group similar transactions
+    DESCRIPTION_SIGNATURE = "description_signature"
+
+
 DATA_COLUMN_TO_DISPLAY_NAME = {
     DataColumns.PAYMENT_PARTY: "Payment Party",
     DataColumns.AMOUNT: f"Amount [{CURRENCY_SYMBOL}]",
@@ -38,28 +54,80 @@ DATA_COLUMN_TO_DISPLAY_NAME = {
     DataColumns.CATEGORY: "Category",
 }
 
+DATA_COLUMN_TO_NORMALIZED_COLUMN = {
+    DataColumns.PAYMENT_PARTY: NormalizedDataColumns.PAYMENT_PARTY,
+    DataColumns.TYPE_OF_TRANSFER: NormalizedDataColumns.TYPE_OF_TRANSFER,
+    DataColumns.DESCRIPTION: NormalizedDataColumns.DESCRIPTION,
+}
+
 
 class Config:
     __shared_state = None
-
-    def __init__(self, yaml_file_path: str=None) -> None:
-        if yaml_file_path is not None:
-            with open(yaml_file_path, "r") as stream:
-                self._config = yaml.safe_load(stream)
-
-            self._category_mapping = self._config[ConfigKeywords.CATGORY_MAPPING_TOPLEVEL]
-            self._statement_parser = self._config[
-                ConfigKeywords.CSV_STATEMENT_PARSER_TOPLEVEL
-            ]
-            self._csv_statement_columns = self._statement_parser[
-                ConfigKeywords.CSV_COLUMNS_TOPLEVEL
-            ]
-            Config.__shared_state = self.__dict__
+    __category_mapping_revision = 0
+
+    def __init__(self, yaml_file_path: str=None, config: dict=None) -> None:
+        """Loads the yaml file or, e.g. in worker processes, the already parsed config dict."""
+        if yaml_file_path is not None or config is not None:
+            # Existing instances share the same dict, so they see the new config as well
+            if Config.__shared_state is None:
+                Config.__shared_state = {}
+            self.__dict__ = Config.__shared_state
+            if config is None:
+                self._load(yaml_file_path)
+            else:
+                self._set_config(config, yaml_file_path)
         elif Config.__shared_state is not None:
             self.__dict__ = Config.__shared_state 
         else:
             raise AttributeError("No config created yet!")
 
+    def _load(self, yaml_file_path: str):
+        with open(yaml_file_path, "r") as stream:
+            config = yaml.safe_load(stream)
+        self._set_config(config, yaml_file_path)
+
+    def _set_config(self, config: dict, yaml_file_path: str):
+        statement_parser = config[ConfigKeywords.CSV_STATEMENT_PARSER_TOPLEVEL]
+        csv_statement_columns = statement_parser[ConfigKeywords.CSV_COLUMNS_TOPLEVEL]
+        category_mapping = config[ConfigKeywords.CATGORY_MAPPING_TOPLEVEL]
+
+        self._yaml_file_path = yaml_file_path
+        self._config = config
+        self._statement_parser = statement_parser
+        self._csv_statement_columns = csv_statement_columns
+        previous_category_mapping = getattr(self, "_category_mapping", None)
+        # Dict equality ignores the order of the categories, but the first matching category wins
+        if previous_category_mapping is None or list(category_mapping.items()) != list(
+            previous_category_mapping.items()
+        ):
+            self.set_category_mapping(category_mapping)
+
+    def reload(self) -> bool:
+        """Reads the yaml file again, returns True if the category mapping changed."""
+        revision = self._category_mapping_revision
+        self._load(self._yaml_file_path)
+        return revision != self._category_mapping_revision
+
+    def get_yaml_file_path(self) -> str:
+        return self._yaml_file_path
+
+    def get_config_dict(self) -> dict:
+        """Statement parser settings and category mapping currently in use, accepted by Config(config=...)."""
+        return {
+            ConfigKeywords.CSV_STATEMENT_PARSER_TOPLEVEL: self._statement_parser,
+            ConfigKeywords.CATGORY_MAPPING_TOPLEVEL: self._category_mapping,
+        }
+
+    def set_category_mapping(self, category_mapping: dict):
+        self._category_mapping = category_mapping
+        Config.__category_mapping_revision += 1
+        self._category_mapping_revision = Config.__category_mapping_revision
+
+    def get_category_mapping_revision(self) -> int:
+        return self._category_mapping_revision
+
+    def get_statement_parser_config(self) -> dict:
+        return self._statement_parser
 
     def get_internal_transaction_categories(self) -> list:
         return self._statement_parser[ConfigKeywords.CATEGORIES_TO_IGNORE]
@@ -67,6 +135,9 @@ class Config:
     def get_csv_date_format(self) -> str:
         return self._statement_parser[ConfigKeywords.CSV_DATE_FORMAT]
 
+    def get_csv_engine(self) -> str:
+        return self._statement_parser.get(ConfigKeywords.CSV_ENGINE, ConfigKeywords.CSV_ENGINE_C)
+
     def get_category_mapping(self) -> dict:
         return self._category_mapping
 
@@ -0,0 +1,75 @@
+import logging
+import os
+import threading
+from typing import Callable, List
+
+from BudgetBook.config_parser import Config
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigWatcher:
+    """Polls the yaml file of the shared config and reloads it when it was modified."""
+
+    def __init__(self, config: Config, poll_interval_seconds: float = 2.0) -> None:
+        self._config = config
+        self._poll_interval_seconds = poll_interval_seconds
+        self._callbacks: List[Callable[[Config], None]] = []
+        self._last_mtime = self._get_mtime()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def add_callback(self, callback: Callable[[Config], None]):
+        """Registers a function that is called after the category mapping changed."""
+        self._callbacks.append(callback)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="ConfigWatcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def check_for_changes(self) -> bool:
+        """Reloads the config if the file changed, returns True if the category mapping changed."""
+        mtime = self._get_mtime()
+        if mtime is None or mtime == self._last_mtime:
+            return False
+        self._last_mtime = mtime
+
+        try:
+            mapping_changed = self._config.reload()
+        except Exception:
+            # Keep the previous config while the file is being edited or invalid
+            logger.exception(
+                "Failed to reload config '%s'", self._config.get_yaml_file_path()
+            )
+            return False
+
+        if mapping_changed:
+            logger.info(
+                "Category mapping in '%s' changed", self._config.get_yaml_file_path()
+            )
+            for callback in self._callbacks:
+                callback(self._config)
+
+        return mapping_changed
+
+    def _run(self):
+        while not self._stop_event.wait(self._poll_interval_seconds):
+            self.check_for_changes()
+
+    def _get_mtime(self):
+        try:
+            return os.stat(self._config.get_yaml_file_path()).st_mtime_ns
+        except OSError:
+            return None
@@ -0,0 +1,67 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Statements contain only a few thousand distinct dates, the cache is cleared if it grows beyond this
+MAX_CACHED_DATES = 1 << 20
+
+
+class DateParser:
+    """Parses date strings with a fixed format, every distinct string is only parsed once.
+
+    Parsed dates are kept, so the files of a multi-file upload share the work.
+    """
+
+    def __init__(self, date_format: str) -> None:
+        self._date_format = date_format
+        self._parsed_dates = {}
+        # Parsers are shared by the callback threads, only the cache updates are serialized
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._parsed_dates)
+
+    def parse(self, series: pd.Series) -> pd.Series:
+        codes, uniques = pd.factorize(series)
+
+        # Dates are looked up once, another thread may clear the cache at any time
+        nanoseconds = [self._parsed_dates.get(u) for u in uniques]
+        unknown = [u for u, n in zip(uniques, nanoseconds) if n is None]
+        if unknown:
+            parsed = pd.to_datetime(pd.Index(unknown), format=self._date_format)
+            parsed_dates = dict(zip(unknown, parsed.asi8.tolist()))
+            nanoseconds = [parsed_dates[u] if n is None else n for u, n in zip(uniques, nanoseconds)]
+            with self._lock:
+                if len(self._parsed_dates) + len(parsed_dates) > MAX_CACHED_DATES:
+                    # All dates of this call are kept, the next file of an upload likely shares them
+                    self._parsed_dates.clear()
+                    parsed_dates = dict(zip(uniques, nanoseconds))
+                self._parsed_dates.update(parsed_dates)
+
+        # The additional NaT maps missing values (code -1)
+        nanoseconds = np.array(
+            nanoseconds + [np.iinfo(np.int64).min],
+            dtype=np.int64,
+        )
+        return pd.Series(
+            nanoseconds[codes].view("datetime64[ns]"), index=series.index, name=series.name
+        )
+
+
+_date_parsers = {}
+
+
+def get_date_parser(date_format: str) -> DateParser:
+    """Shared parser per date format."""
+    date_parser = _date_parsers.get(date_format)
+    if date_parser is None:
+        date_parser = _date_parsers.setdefault(date_format, DateParser(date_format))
+    return date_parser
+
+
+def to_date_objects(dates: pd.Series) -> np.ndarray:
+    """Same as dates.dt.date, but only converts every distinct date once."""
+    codes, uniques = pd.factorize(dates)
+    date_objects = np.array([u.date() for u in uniques] + [pd.NaT], dtype=object)
+    return date_objects[codes]
@@ -6,6 +6,10 @@ from BudgetBook.helper import CURRENCY_SYMBOL
 
 
 class DatedTransaction:
+    """Immutable and hashable, transactions are equal if all their fields are equal."""
+
+    __slots__ = ("_payment_party", "_date", "_amount", "_desc", "_category")
+
     def __init__(
         self,
         payment_party: str,
@@ -14,13 +18,44 @@ class DatedTransaction:
         desc: str = "",
         category: str = "",
     ) -> None:
-        self.category = category
-        self.date = date
-        self.amount = amount
-        self.desc = desc
-        self.payment_party = payment_party
+        self._category = category
+        self._date = date
+        self._amount = amount
+        self._desc = desc
+        self._payment_party = payment_party
+
+    @property
+    def payment_party(self) -> str:
+        return self._payment_party
+
+    @property
+    def date(self) -> datetime.date:
+        return self._date
+
+    @property
+    def amount(self) -> float:
+        return self._amount
+
+    @property
+    def desc(self) -> str:
+        return self._desc
+
+    @property
+    def category(self) -> str:
+        return self._category
+
+    def _key(self) -> Tuple:
+        return (self._payment_party, self._date, self._amount, self._desc, self._category)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, DatedTransaction):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
 
-    def to_dict(self) -> Tuple:
+    def to_dict(self) -> dict:
         return {
             DataColumns.PAYMENT_PARTY: self.payment_party,
             DataColumns.DATE: self.date,
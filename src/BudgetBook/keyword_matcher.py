@@ -0,0 +1,86 @@
+from collections import deque
+from typing import Iterable, List, Set
+
+from BudgetBook.text_normalization import normalize_text_value
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton that finds all keyword occurrences in a normalized text in one scan."""
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        self._keywords: List[str] = []
+        self._keyword_ids = {}
+
+        self._transitions = [{}]
+        self._fail = [0]
+        self._outputs = [set()]
+
+        for keyword in keywords:
+            self._add_keyword(keyword)
+
+        self._build_fail_links()
+
+    def __len__(self) -> int:
+        return len(self._keywords)
+
+    def get_keywords(self) -> List[str]:
+        return self._keywords
+
+    def get_keyword_id(self, keyword: str) -> int:
+        return self._keyword_ids[normalize_text_value(keyword)]
+
+    def find_all(self, text: str) -> Set[int]:
+        return self.find_all_normalized(normalize_text_value(text))
+
+    def find_all_normalized(self, normalized_text: str) -> Set[int]:
+        transitions = self._transitions
+        fail = self._fail
+        outputs = self._outputs
+
+        # The root only has outputs for the empty keyword, which matches everything
+        found = set(outputs[0])
+        state = 0
+        for char in normalized_text:
+            while state and char not in transitions[state]:
+                state = fail[state]
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                found |= outputs[state]
+
+        return found
+
+    def _add_keyword(self, keyword: str):
+        keyword = normalize_text_value(keyword)
+        if keyword in self._keyword_ids:
+            return
+
+        state = 0
+        for char in keyword:
+            next_state = self._transitions[state].get(char)
+            if next_state is None:
+                next_state = len(self._transitions)
+                self._transitions[state][char] = next_state
+                self._transitions.append({})
+                self._fail.append(0)
+                self._outputs.append(set())
+            state = next_state
+
+        keyword_id = len(self._keywords)
+        self._keywords.append(keyword)
+        self._keyword_ids[keyword] = keyword_id
+        self._outputs[state].add(keyword_id)
+
+    def _build_fail_links(self):
+        queue = deque(self._transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._transitions[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and char not in self._transitions[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._transitions[fallback].get(char, 0)
+
+                # Keywords ending in the suffix state also end here
+                self._outputs[next_state] |= self._outputs[self._fail[next_state]]
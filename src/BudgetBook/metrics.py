@@ -0,0 +1,186 @@
+import bisect
+import contextlib
+import functools
+import threading
+import time
+from typing import Dict, List, Sequence
+
+# Upper bounds of the latency histogram buckets in seconds
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRIC_PREFIX = "budgetbook"
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self._buckets = tuple(sorted(buckets))
+        # Last count is the +Inf bucket
+        self._counts = [0] * (len(self._buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+
+    def observe(self, value: float):
+        self._counts[bisect.bisect_left(self._buckets, value)] += 1
+        self._sum += value
+        self._count += 1
+
+    def get_sum(self) -> float:
+        return self._sum
+
+    def get_count(self) -> int:
+        return self._count
+
+    def get_cumulative_counts(self) -> Dict[float, int]:
+        """Number of observations less or equal to each bucket bound, the last bound is inf."""
+        cumulative_counts = {}
+        total = 0
+        for bound, count in zip(self._buckets + (float("inf"),), self._counts):
+            total += count
+            cumulative_counts[bound] = total
+        return cumulative_counts
+
+
+class _Measurement:
+    def __init__(self, metrics, stage: str) -> None:
+        self._metrics = metrics
+        self._stage = stage
+        self._num_rows = 0
+
+    def add_rows(self, num_rows: int):
+        self._num_rows += num_rows
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._metrics.observe(self._stage, time.perf_counter() - self._start, self._num_rows)
+        return False
+
+
+class _NoMeasurement:
+    """Returned while metrics are disabled, so instrumented code only pays for a function call."""
+
+    def add_rows(self, num_rows: int):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NO_MEASUREMENT = _NoMeasurement()
+
+
+class Metrics:
+    """Latency histogram and processed rows per pipeline stage."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self._enabled = False
+        self._buckets = buckets
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Histogram] = {}
+        self._rows: Dict[str, int] = {}
+        self._observation_lists: List[list] = []
+
+    def is_enabled(self) -> bool:
+        return self._enabled
+
+    def set_enabled(self, enabled: bool):
+        self._enabled = enabled
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+            self._rows.clear()
+
+    def measure(self, stage: str):
+        """Context manager that records the duration of the block, rows are added with add_rows."""
+        if not self._enabled:
+            return _NO_MEASUREMENT
+        return _Measurement(self, stage)
+
+    @contextlib.contextmanager
+    def record_observations(self):
+        """Collects (stage, seconds, num_rows) of every observation within the block.
+
+        Used by worker processes, their observations are sent to the parent and observed there.
+        """
+        observations = []
+        with self._lock:
+            self._observation_lists.append(observations)
+        try:
+            yield observations
+        finally:
+            with self._lock:
+                self._observation_lists = [o for o in self._observation_lists if o is not observations]
+
+    def observe(self, stage: str, seconds: float, num_rows: int = 0):
+        with self._lock:
+            for observations in self._observation_lists:
+                observations.append((stage, seconds, num_rows))
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = Histogram(self._buckets)
+                self._rows[stage] = 0
+            histogram.observe(seconds)
+            self._rows[stage] += num_rows
+
+    def get_histogram(self, stage: str) -> Histogram:
+        return self._histograms.get(stage)
+
+    def get_rows(self, stage: str) -> int:
+        return self._rows.get(stage, 0)
+
+    def to_prometheus_text(self) -> str:
+        duration_metric = f"{METRIC_PREFIX}_stage_duration_seconds"
+        rows_metric = f"{METRIC_PREFIX}_stage_rows_total"
+        lines = [
+            f"# HELP {duration_metric} Duration of the pipeline stages.",
+            f"# TYPE {duration_metric} histogram",
+        ]
+        with self._lock:
+            stages = sorted(self._histograms)
+            for stage in stages:
+                histogram = self._histograms[stage]
+                for bound, count in histogram.get_cumulative_counts().items():
+                    le = "+Inf" if bound == float("inf") else repr(float(bound))
+                    lines.append(f'{duration_metric}_bucket{{stage="{stage}",le="{le}"}} {count}')
+                lines.append(f'{duration_metric}_sum{{stage="{stage}"}} {histogram.get_sum()!r}')
+                lines.append(f'{duration_metric}_count{{stage="{stage}"}} {histogram.get_count()}')
+
+            lines.append(f"# HELP {rows_metric} Rows processed by the pipeline stages.")
+            lines.append(f"# TYPE {rows_metric} counter")
+            for stage in stages:
+                lines.append(f'{rows_metric}{{stage="{stage}"}} {self._rows[stage]}')
+        return "\n".join(lines) + "\n"
+
+
+_metrics = Metrics()
+
+
+def get_metrics() -> Metrics:
+    """Metrics shared by all instrumented stages of this process."""
+    return _metrics
+
+
+def measure(stage: str):
+    return _metrics.measure(stage)
+
+
+def timed(stage: str):
+    """Decorator that measures every call of the function as stage."""
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _metrics.is_enabled():
+                return function(*args, **kwargs)
+            with _metrics.measure(stage):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,86 @@
+import datetime
+import functools
+from typing import Dict, Tuple
+
+import numpy as np
+
+from BudgetBook.regular_event import RegularEvent
+
+# Occurences appended one interval at a time when a window reaches beyond the cached one
+MAX_INCREMENTAL_STEPS = 8
+
+
+@functools.lru_cache(maxsize=16)
+def _to_datetime64(*dates: datetime.date) -> np.ndarray:
+    # Shared by all events, converting the dates is slower than slicing the occurences
+    return np.array(dates, dtype="datetime64[D]")
+
+
+class OccurenceCache:
+    """Occurences per RegularEvent within the union of the windows requested so far.
+
+    Events are immutable and hashable, so transactions with equal events share their occurences.
+    When a window reaches beyond the cached one, only the newly covered dates are expanded,
+    a window within the cached one is sliced from the cached occurences.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[RegularEvent, Tuple[datetime.date, datetime.date, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+
+    def get_occurences(
+        self, event: RegularEvent, from_date: datetime.date, up_to: datetime.date
+    ) -> np.ndarray:
+        """Same as event.get_occurences(from_date, up_to), the returned array must not be modified."""
+        entry = self._entries.get(event)
+        if entry is None or up_to < entry[0] or from_date > entry[1]:
+            # Disjoint windows are expanded from scratch instead of filling the gap between them
+            occurences = event.get_occurences(from_date, up_to)
+            self._entries[event] = (from_date, up_to, occurences)
+            return occurences
+
+        cached_from_date, cached_up_to, occurences = entry
+        if from_date < cached_from_date or up_to > cached_up_to:
+            parts = [occurences]
+            if from_date < cached_from_date:
+                parts.insert(0, event.get_occurences(from_date, cached_from_date))
+                cached_from_date = from_date
+            if up_to > cached_up_to:
+                parts.append(OccurenceCache._get_following_occurences(event, occurences, cached_up_to, up_to))
+                cached_up_to = up_to
+            occurences = np.concatenate(parts)
+            self._entries[event] = (cached_from_date, cached_up_to, occurences)
+
+        if from_date == cached_from_date and up_to == cached_up_to:
+            return occurences
+        first, last = np.searchsorted(occurences, _to_datetime64(from_date, up_to))
+        return occurences[first:last]
+
+    @staticmethod
+    def _get_following_occurences(
+        event: RegularEvent, occurences: np.ndarray, from_date: datetime.date, up_to: datetime.date
+    ) -> np.ndarray:
+        """Occurences within [from_date, up_to), following the occurences before from_date."""
+        if occurences.size == 0:
+            return event.get_occurences(from_date, up_to)
+
+        interval_size = event.get_interval_size()
+        last_occurence = event.get_last_occurence()
+        if interval_size is None:
+            return occurences[:0]
+
+        # Adding the interval to the last known occurence is cheaper than the closed form for a few steps,
+        # wider windows are expanded with the closed form
+        following_occurences = []
+        current = occurences[-1].item() + interval_size
+        while current < up_to and (last_occurence is None or current <= last_occurence):
+            if len(following_occurences) == MAX_INCREMENTAL_STEPS:
+                return event.get_occurences(from_date, up_to)
+            following_occurences.append(current)
+            current = current + interval_size
+        return np.array(following_occurences, dtype="datetime64[D]")
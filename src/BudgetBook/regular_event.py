@@ -1,9 +1,15 @@
 import datetime
 
+import numpy as np
+
 from BudgetBook.transaction_interval import TransactionInterval
 
 
 class RegularEvent:
+    """Immutable and hashable, events are equal if their first occurence, interval and last occurence are equal."""
+
+    __slots__ = ("_first_occurence", "_interval_size", "_last_occurence")
+
     def __init__(
         self,
         first_occurence: datetime.date,
@@ -29,6 +35,17 @@ class RegularEvent:
     def __repr__(self) -> str:
         return str(self)
 
+    def _key(self):
+        return (self._first_occurence, self._interval_size, self._last_occurence)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, RegularEvent):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
     def get_first_occurence(self) -> datetime.date:
         return self._first_occurence
 
@@ -38,32 +55,70 @@ class RegularEvent:
     def get_interval_size(self) -> TransactionInterval:
         return self._interval_size
 
-    def set_first_occurence(self, first_ocurrence: datetime.date):
-        self._first_occurence = first_ocurrence
-
-    def set_interval_size(self, interval_size: TransactionInterval):
-        self._interval_size = interval_size
-
-    def set_last_occurence(self, last_ocurrence: datetime.date):
-        self._last_occurence = last_ocurrence
-
     def iterate(self, from_date: datetime.date, up_to: datetime.date) -> datetime.date:
+        for occurence in self.get_occurences(from_date, up_to).tolist():
+            yield occurence
 
+    def get_occurences(self, from_date: datetime.date, up_to: datetime.date) -> np.ndarray:
+        """Occurences from from_date up to, but excluding, up_to as datetime64[D] array.
+
+        The last occurence is included. Dates are the same as repeatedly adding the interval to the
+        first occurence, e.g. a monthly event starting on Jan 31 happens on Feb 28 and then on Mar 28.
+        """
         if up_to is None:
             raise AttributeError("No end date specified for Regular event!")
         if from_date is None:
             raise AttributeError("No start date specified for Regular event!")
 
-        current = self._first_occurence  # max(from_date, self._first_occurence)
+        first = np.datetime64(self._first_occurence, "D")
+        start = np.datetime64(from_date, "D")
+        end = np.datetime64(up_to, "D")
+        if self._last_occurence is not None:
+            end = min(end, np.datetime64(self._last_occurence, "D") + 1)
 
         if self._interval_size is None:
-            if current >= from_date and current < up_to:
-                yield current
+            occurences = np.array([first])
         else:
-            while current < up_to:
-                if current >= from_date:
-                    yield current
-
-                current = current + self._interval_size
-
-        return None
+            num_months = 12 * self._interval_size.years + self._interval_size.months
+            num_days = self._interval_size.days
+            if num_months == 0 and num_days > 0:
+                occurences = RegularEvent._get_day_steps(first, num_days, start, end)
+            elif num_months > 0 and num_days == 0:
+                occurences = RegularEvent._get_month_steps(first, num_months, start, end)
+            else:
+                occurences = self._get_steps(end)
+
+        return occurences[(occurences >= start) & (occurences < end)]
+
+    @staticmethod
+    def _get_day_steps(first: np.datetime64, num_days: int, start: np.datetime64, end: np.datetime64):
+        first_step = max(0, -(-(start - first).astype(int) // num_days))
+        last_step = -(-(end - first).astype(int) // num_days)
+        return first + np.arange(first_step, max(first_step, last_step)) * num_days
+
+    @staticmethod
+    def _get_month_steps(first: np.datetime64, num_months: int, start: np.datetime64, end: np.datetime64):
+        first_month = first.astype("datetime64[M]")
+        day = (first - first_month.astype("datetime64[D]")).astype(int) + 1
+
+        # Once clamped to the end of a shorter month, the day stays clamped (Jan 31, Feb 28, Mar 28),
+        # so steps can only be skipped if the day fits into every month
+        first_step = 0
+        if day <= 28:
+            first_step = max(0, (start.astype("datetime64[M]") - first_month).astype(int) // num_months)
+        last_step = (end.astype("datetime64[M]") - first_month).astype(int) // num_months + 1
+
+        months = first_month + np.arange(first_step, max(first_step, last_step)) * num_months
+        days_in_month = ((months + 1).astype("datetime64[D]") - months.astype("datetime64[D]")).astype(int)
+        days = np.minimum.accumulate(np.minimum(day, days_in_month))
+        return months.astype("datetime64[D]") + (days - 1)
+
+    def _get_steps(self, end: np.datetime64):
+        # Intervals of months and days do not add up in closed form, the day is clamped before adding days
+        end = end.item()
+        occurences = []
+        current = self._first_occurence
+        while current < end:
+            occurences.append(current)
+            current = current + self._interval_size
+        return np.array(occurences, dtype="datetime64[D]")
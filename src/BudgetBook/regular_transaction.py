@@ -7,6 +7,10 @@ from BudgetBook.regular_event import RegularEvent
 
 
 class RegularTransaction:
+    """Immutable and hashable, transactions are equal if all their fields are equal."""
+
+    __slots__ = ("_frequency", "_amount", "_category", "_desc", "_payment_party")
+
     def __init__(
         self,
         payment_party: str,
@@ -29,6 +33,17 @@ class RegularTransaction:
     def __repr__(self) -> str:
         return str(self)
 
+    def _key(self):
+        return (self._payment_party, self._frequency, self._amount, self._desc, self._category)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, RegularTransaction):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
     def get_frequency(self) -> RegularEvent:
         return self._frequency
 
@@ -1,4 +1,3 @@
-import copy
 import datetime
 from typing import List
 from BudgetBook.transaction_interval import TransactionInterval
@@ -8,7 +7,10 @@ from BudgetBook.dated_transaction import DatedTransaction
 
 class RegularTransactionBuilder:
     def __init__(self) -> None:
-        self._current_recurrence = RegularEvent(None, None, None)
+        # Events are immutable, every built transaction gets its own event from the current settings
+        self._first_occurence = None
+        self._interval_size = None
+        self._last_occurence = None
         self._scheduled_transactions = []
         self._current_category = None
 
@@ -16,28 +18,22 @@ class RegularTransactionBuilder:
         return self._scheduled_transactions
 
     def set_first_ocurrence(self, year: int, month:int = 1, day:int = 1) -> None:
-        self._current_recurrence.set_first_occurence(
-            datetime.date(year=year, month=month, day=day)
-        )
+        self._first_occurence = datetime.date(year=year, month=month, day=day)
 
     def set_last_ocurrence(self, year: int) -> None:
-        self._current_recurrence.set_last_occurence(
-            datetime.date(year=year, month=1, day=1)
-        )
+        self._last_occurence = datetime.date(year=year, month=1, day=1)
 
     def set_interval(self, years: int = 0, months: int = 0, days: int = 0) -> None:
-        self._current_recurrence.set_interval_size(
-            TransactionInterval(years=years, months=months, days=days)
-        )
+        self._interval_size = TransactionInterval(years=years, months=months, days=days)
 
     def set_interval_monthly(self) -> None:
-        self._current_recurrence.set_interval_size(TransactionInterval.monthly())
+        self._interval_size = TransactionInterval.monthly()
 
     def set_interval_quaterly(self) -> None:
-        self._current_recurrence.set_interval_size(TransactionInterval.quaterly())
+        self._interval_size = TransactionInterval.quaterly()
 
     def set_interval_yearly(self) -> None:
-        self._current_recurrence.set_interval_size(TransactionInterval.yearly())
+        self._interval_size = TransactionInterval.yearly()
 
     def set_category(self, category: str) -> None:
         self._current_category = category
@@ -51,7 +47,7 @@ class RegularTransactionBuilder:
         self._scheduled_transactions.append(
             RegularTransaction(
                 payment_party,
-                copy.copy(self._current_recurrence),
+                RegularEvent(self._first_occurence, self._interval_size, self._last_occurence),
                 amount,
                 desc,
                 self._current_category,
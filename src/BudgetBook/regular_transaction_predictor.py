@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Union
 import numpy as np
 import pandas as pd
 import Levenshtein
@@ -6,11 +6,14 @@ from sklearn.cluster import dbscan
 from sklearn.neighbors import LocalOutlierFactor
 from BudgetBook.category_parser import CategoryParser
 
-from BudgetBook.config_parser import Config, DataColumns
+from BudgetBook.config_parser import Config, DataColumns, NormalizedDataColumns
 from BudgetBook.dated_transaction import DatedTransaction
+from BudgetBook.metrics import timed
 from BudgetBook.regular_event import RegularEvent
 from BudgetBook.regular_transaction import RegularTransaction
+from BudgetBook.text_normalization import add_normalized_columns
 from BudgetBook.transaction_interval import TransactionInterval
+from BudgetBook.transaction_store import TransactionStore
 
 
 class RegularTransactionPredictor:
@@ -18,13 +21,19 @@ class RegularTransactionPredictor:
         self._config = config
         self._category_parser = CategoryParser(self._config)
 
-    def to_regular_transactions(self, dated_transactions_list: List[DatedTransaction]):
+    @timed("predict_regular_transactions")
+    def to_regular_transactions(self, dated_transactions: Union[TransactionStore, List[DatedTransaction]]):
 
-        dataset = pd.DataFrame.from_records(
-            [d.to_dict() for d in dated_transactions_list]
+        if not isinstance(dated_transactions, TransactionStore):
+            dated_transactions = TransactionStore.from_transactions(dated_transactions)
+
+        # Shallow copy, normalized columns already computed at ingest are reused
+        dataset = add_normalized_columns(
+            dated_transactions.get_dataframe().copy(deep=False)
         )
+        signature_length = dataset[NormalizedDataColumns.DESCRIPTION_SIGNATURE].str.len()
 
-        payment_partys = dataset[DataColumns.PAYMENT_PARTY].unique()
+        payment_partys = dataset[NormalizedDataColumns.PAYMENT_PARTY].unique()
         same_party_label = RegularTransactionPredictor.group_by_similarity(
             payment_partys, eps=3
         )
@@ -42,15 +51,16 @@ class RegularTransactionPredictor:
         irregular_transactions = []
 
         for curr_payment_partys in grouped_payment_parties:
-            df_same_group = dataset[
-                dataset[DataColumns.PAYMENT_PARTY].isin(curr_payment_partys)
-            ]
+            same_group_mask = dataset[NormalizedDataColumns.PAYMENT_PARTY].isin(
+                curr_payment_partys
+            )
+            df_same_group = dataset[same_group_mask]
 
-            desc = df_same_group[DataColumns.DESCRIPTION]
-            avg_desc_length = max(desc.apply(len).mean(), 10)
+            avg_desc_length = max(signature_length[same_group_mask].mean(), 10)
 
             labels = RegularTransactionPredictor.group_by_similarity(
-                [d[:150] for d in desc], eps=0.1 * avg_desc_length
+                df_same_group[NormalizedDataColumns.DESCRIPTION_SIGNATURE].to_numpy(),
+                eps=0.1 * avg_desc_length,
             )
 
             for l in pd.Series(labels).unique():
@@ -102,7 +112,7 @@ class RegularTransactionPredictor:
                     )
 
                 freqency = RegularEvent(
-                    transaction_group[DataColumns.DATE].min(), interval
+                    transaction_group[DataColumns.DATE].min().date(), interval
                 )
                 desc = ""
                 desc += (
@@ -0,0 +1,405 @@
+from collections import OrderedDict
+from functools import reduce
+import hashlib
+import json
+import logging
+import operator
+import os
+import pickle
+import re
+from typing import Iterable, List, Set
+
+import numpy as np
+import pandas as pd
+
+from BudgetBook.config_parser import (
+    DATA_COLUMN_TO_DISPLAY_NAME,
+    DATA_COLUMN_TO_NORMALIZED_COLUMN,
+    ConfigKeywords,
+)
+from BudgetBook.keyword_matcher import KeywordMatcher
+from BudgetBook.text_normalization import normalize_text_value
+
+logger = logging.getLogger(__name__)
+
+RULE_TYPE_CONTAINS = "contains"
+RULE_PROGRAM_CACHE_FILE_SUFFIX = ".rules.cache"
+
+# Bump whenever the pickled layout of CategoryRuleProgram changes
+_RULE_PROGRAM_FORMAT_VERSION = 2
+_MAX_PROGRAMS_IN_MEMORY = 8
+_programs_in_memory = OrderedDict()
+
+
+class InvalidCateogryMappingException(Exception):
+    def __init__(self, *args: object) -> None:
+        super().__init__(*args)
+
+
+class RegexMatcher:
+    """Same interface as KeywordMatcher, but every keyword is a regular expression."""
+
+    def __init__(self, patterns: Iterable[str], whole_word: bool = False) -> None:
+        self._keywords: List[str] = []
+        self._keyword_ids = {}
+        self._patterns = []
+        self._whole_word = whole_word
+
+        for pattern in patterns:
+            keyword = self._normalize_keyword(pattern)
+            if keyword in self._keyword_ids:
+                continue
+
+            if whole_word:
+                regex = rf"(?<!\w){re.escape(keyword)}(?!\w)"
+            else:
+                regex = keyword
+            try:
+                compiled_pattern = re.compile(regex, re.IGNORECASE)
+            except re.error as e:
+                raise InvalidCateogryMappingException(
+                    f"Provided regex '{pattern}' is invalid: {e}"
+                )
+
+            self._keyword_ids[keyword] = len(self._keywords)
+            self._keywords.append(keyword)
+            self._patterns.append(compiled_pattern)
+
+    def __len__(self) -> int:
+        return len(self._keywords)
+
+    def get_keywords(self) -> List[str]:
+        return self._keywords
+
+    def get_keyword_id(self, keyword: str) -> int:
+        return self._keyword_ids[self._normalize_keyword(keyword)]
+
+    def find_all_normalized(self, normalized_text: str) -> Set[int]:
+        return {
+            keyword_id
+            for keyword_id, pattern in enumerate(self._patterns)
+            if pattern.search(normalized_text)
+        }
+
+    def _normalize_keyword(self, keyword: str) -> str:
+        # Regular expressions are matched case insensitive but otherwise kept verbatim
+        return normalize_text_value(keyword) if self._whole_word else keyword
+
+
+class CategoryRuleProgram:
+    """Immutable, compiled form of the category mapping.
+
+    Rules are nested (operator, operands) tuples. Leaves are (matcher key, keyword ids) pairs,
+    the matcher key being a (data column, rule type) tuple.
+    """
+
+    def __init__(self, category_mapping: dict) -> None:
+        self._category_mapping = category_mapping
+        self._categories = list(category_mapping.keys())
+
+        keywords_per_matcher = {}
+        rules = [
+            self._compile_rule(
+                CategoryRuleProgram._without_parent(rules),
+                RULE_TYPE_CONTAINS,
+                keywords_per_matcher,
+            )
+            for rules in category_mapping.values()
+        ]
+
+        # One automaton per data column and rule type, so every field is scanned only once
+        self._matchers = {
+            matcher_key: CategoryRuleProgram._create_matcher(matcher_key[1], keywords)
+            for matcher_key, keywords in keywords_per_matcher.items()
+        }
+        self._compiled_rules = [self._resolve_keyword_ids(rule) for rule in rules]
+        self._data_columns = list(
+            OrderedDict.fromkeys(column for column, _ in self._matchers)
+        )
+
+    @staticmethod
+    def for_mapping(category_mapping: dict, yaml_file_path: str = None):
+        """Returns a shared program for the mapping, compiled at most once per process and yaml file."""
+        digest = CategoryRuleProgram._get_mapping_digest(category_mapping)
+
+        program = _programs_in_memory.get(digest)
+        if program is not None:
+            _programs_in_memory.move_to_end(digest)
+            return program
+
+        program = None
+        if yaml_file_path is not None:
+            program = CategoryRuleProgram._load(yaml_file_path, digest)
+        if program is None:
+            program = CategoryRuleProgram(category_mapping)
+            if yaml_file_path is not None:
+                CategoryRuleProgram._store(yaml_file_path, digest, program)
+
+        _programs_in_memory[digest] = program
+        if len(_programs_in_memory) > _MAX_PROGRAMS_IN_MEMORY:
+            _programs_in_memory.popitem(last=False)
+
+        return program
+
+    def get_categories(self) -> list:
+        return self._categories
+
+    def get_data_columns(self) -> list:
+        return self._data_columns
+
+    def get_matchers(self) -> dict:
+        return self._matchers
+
+    def get_first_match(self, normalized_fields: dict):
+        """Returns the first matching category for a record or None."""
+        matched_keywords = {
+            matcher_key: matcher.find_all_normalized(normalized_fields[matcher_key[0]])
+            for matcher_key, matcher in self._matchers.items()
+        }
+
+        def keywords_match(matcher_key, keyword_ids):
+            return not matched_keywords[matcher_key].isdisjoint(keyword_ids)
+
+        for category, rule in zip(self._categories, self._compiled_rules):
+            if CategoryRuleProgram._evaluate_rule(rule, keywords_match):
+                return category
+
+        return None
+
+    def match_frame(self, dataframe: pd.DataFrame):
+        return FrameRuleMatches(self, dataframe)
+
+    def has_rule_without_keywords(self) -> bool:
+        """True if any rule matches even if none of its keywords is present, e.g. an empty 'and'."""
+        return any(
+            CategoryRuleProgram._evaluate_rule(rule, lambda matcher_key, keyword_ids: False)
+            for rule in self._compiled_rules
+        )
+
+    def get_compiled_rules(self) -> list:
+        return self._compiled_rules
+
+    @staticmethod
+    def _create_matcher(rule_type, keywords):
+        if rule_type == ConfigKeywords.CATEGORY_RULE_REGEX:
+            return RegexMatcher(keywords)
+        elif rule_type == ConfigKeywords.CATEGORY_RULE_WORD:
+            return RegexMatcher(keywords, whole_word=True)
+        return KeywordMatcher(keywords)
+
+    @staticmethod
+    def _without_parent(mapping_rules):
+        if ConfigKeywords.CATEGORY_PARENT not in mapping_rules:
+            return mapping_rules
+
+        parent = mapping_rules[ConfigKeywords.CATEGORY_PARENT]
+        if type(parent) is not str:
+            raise InvalidCateogryMappingException(f"Provided parent category '{parent}' not allowed. Use a category name.")
+        return {k: v for k, v in mapping_rules.items() if k != ConfigKeywords.CATEGORY_PARENT}
+
+    @staticmethod
+    def _compile_rule(mapping_rules, rule_type, keywords_per_matcher):
+        has_and = ConfigKeywords.CATEGORY_RULE_AND in mapping_rules
+        has_or = ConfigKeywords.CATEGORY_RULE_OR in mapping_rules
+
+        valid_rule_names = [
+            ConfigKeywords.CATEGORY_RULE_AND,
+            ConfigKeywords.CATEGORY_RULE_OR,
+            ConfigKeywords.CATEGORY_RULE_REGEX,
+            ConfigKeywords.CATEGORY_RULE_WORD,
+            *DATA_COLUMN_TO_DISPLAY_NAME.keys(),
+        ]
+        for rule_name, rule_value in mapping_rules.items():
+            if rule_name not in valid_rule_names:
+                raise InvalidCateogryMappingException(f"Provided rule name '{rule_name}' not allowed. Use one of: '{valid_rule_names}'.")
+
+            if type(rule_value) not in [list, dict]:
+                raise InvalidCateogryMappingException(f"Provided rule value '{rule_value}' for rule '{rule_name}' not allowed. Use one of: 'list, dict'.")
+
+        if has_and or has_or:
+            rule_operator = ConfigKeywords.CATEGORY_RULE_AND if has_and else ConfigKeywords.CATEGORY_RULE_OR
+            return (
+                rule_operator,
+                [
+                    CategoryRuleProgram._compile_rule(
+                        {filter_key: filter_values}, rule_type, keywords_per_matcher
+                    )
+                    for filter_key, filter_values in mapping_rules[rule_operator].items()
+                ],
+            )
+
+        operands = []
+        for filter_key, filter_values in mapping_rules.items():
+            if filter_key in [ConfigKeywords.CATEGORY_RULE_REGEX, ConfigKeywords.CATEGORY_RULE_WORD]:
+                if type(filter_values) is not dict:
+                    raise InvalidCateogryMappingException(f"Provided rule value '{filter_values}' for rule '{filter_key}' not allowed. Use one of: 'dict'.")
+                operands.append(
+                    CategoryRuleProgram._compile_rule(
+                        filter_values, filter_key, keywords_per_matcher
+                    )
+                )
+            else:
+                for keyword in filter_values:
+                    if normalize_text_value(keyword) == "":
+                        raise InvalidCateogryMappingException(f"Provided keyword '{keyword}' for rule '{filter_key}' not allowed. Use a non-empty text.")
+                matcher_key = (filter_key, rule_type)
+                keywords_per_matcher.setdefault(matcher_key, []).extend(filter_values)
+                operands.append((matcher_key, list(filter_values)))
+
+        return (ConfigKeywords.CATEGORY_RULE_OR, operands)
+
+    def _resolve_keyword_ids(self, rule):
+        rule_operator, operands = rule
+        if rule_operator in [ConfigKeywords.CATEGORY_RULE_AND, ConfigKeywords.CATEGORY_RULE_OR]:
+            return (rule_operator, [self._resolve_keyword_ids(o) for o in operands])
+
+        matcher = self._matchers[rule_operator]
+        return (
+            rule_operator,
+            tuple(sorted({matcher.get_keyword_id(k) for k in operands})),
+        )
+
+    @staticmethod
+    def _evaluate_rule(rule, keywords_match):
+        """Evaluates a compiled rule, either for a single record (bool) or a whole frame (bool array)."""
+        rule_operator, operands = rule
+
+        if rule_operator == ConfigKeywords.CATEGORY_RULE_AND:
+            return reduce(
+                operator.and_,
+                (CategoryRuleProgram._evaluate_rule(o, keywords_match) for o in operands),
+                True,
+            )
+        elif rule_operator == ConfigKeywords.CATEGORY_RULE_OR:
+            return reduce(
+                operator.or_,
+                (CategoryRuleProgram._evaluate_rule(o, keywords_match) for o in operands),
+                False,
+            )
+        else:
+            return keywords_match(rule_operator, operands)
+
+    @staticmethod
+    def _get_mapping_digest(category_mapping: dict) -> str:
+        # Key order matters, the first matching category wins
+        serialized = json.dumps(category_mapping, default=str, ensure_ascii=False)
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _get_cache_file_path(yaml_file_path: str) -> str:
+        return os.path.splitext(yaml_file_path)[0] + RULE_PROGRAM_CACHE_FILE_SUFFIX
+
+    @staticmethod
+    def _load(yaml_file_path: str, digest: str):
+        cache_file_path = CategoryRuleProgram._get_cache_file_path(yaml_file_path)
+        try:
+            with open(cache_file_path, "rb") as stream:
+                version, cached_digest, program = pickle.load(stream)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logger.warning("Ignoring unreadable rule cache '%s'", cache_file_path)
+            return None
+
+        if version != _RULE_PROGRAM_FORMAT_VERSION or cached_digest != digest:
+            return None
+        return program
+
+    @staticmethod
+    def _store(yaml_file_path: str, digest: str, program):
+        cache_file_path = CategoryRuleProgram._get_cache_file_path(yaml_file_path)
+        temp_file_path = f"{cache_file_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_file_path, "wb") as stream:
+                pickle.dump(
+                    (_RULE_PROGRAM_FORMAT_VERSION, digest, program),
+                    stream,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            os.replace(temp_file_path, cache_file_path)
+        except OSError:
+            logger.warning("Could not write rule cache '%s'", cache_file_path)
+
+
+class FrameRuleMatches:
+    """Scans the unique values of each data column once and keeps a (unique values x keywords) match matrix per matcher."""
+
+    def __init__(self, program: CategoryRuleProgram, dataframe: pd.DataFrame) -> None:
+        self._program = program
+        self._dataframe = dataframe
+        self._normalized_columns = {}
+        self._matrices = {}
+
+    def get_match_matrix(self) -> np.ndarray:
+        """Boolean (rows x categories) matrix of all matching rules."""
+        compiled_rules = self._program.get_compiled_rules()
+        matches = np.zeros((len(self._dataframe), len(compiled_rules)), dtype=bool)
+        for idx, rule in enumerate(compiled_rules):
+            # Rules evaluate to a plain bool if they do not reference any column
+            matches[:, idx] = CategoryRuleProgram._evaluate_rule(
+                rule, self.keywords_match
+            )
+        return matches
+
+    def get_any_keyword_matches(self) -> np.ndarray:
+        """Rows that contain at least one keyword of the program."""
+        mask = np.zeros(len(self._dataframe), dtype=bool)
+        for matcher_key, matcher in self._program.get_matchers().items():
+            mask |= self.keywords_match(matcher_key, range(len(matcher)))
+        return mask
+
+    def get_hits_per_keyword(self) -> pd.Series:
+        """Number of rows in which each keyword occurs, indexed by column, rule type and keyword."""
+        matchers = self._program.get_matchers()
+        keyword_index = pd.MultiIndex.from_tuples(
+            [
+                (column, rule_type, keyword)
+                for (column, rule_type), matcher in matchers.items()
+                for keyword in matcher.get_keywords()
+            ],
+            names=["column", "rule_type", "keyword"],
+        )
+
+        hits = []
+        for matcher_key in matchers:
+            codes, matrix = self._get_matrix(matcher_key)
+            rows_per_unique_value = np.bincount(codes[codes >= 0], minlength=len(matrix))
+            hits.append(rows_per_unique_value @ matrix.astype(np.int64))
+
+        return pd.Series(
+            np.concatenate(hits + [np.zeros(0, dtype=np.int64)]),
+            index=keyword_index,
+            dtype=np.int64,
+        )
+
+    def keywords_match(self, matcher_key, keyword_ids) -> np.ndarray:
+        codes, matrix = self._get_matrix(matcher_key)
+        return matrix[:, list(keyword_ids)].any(axis=1)[codes]
+
+    def _get_matrix(self, matcher_key):
+        if matcher_key not in self._matrices:
+            self._matrices[matcher_key] = self._build_matrix(matcher_key)
+        return self._matrices[matcher_key]
+
+    def _get_normalized_column(self, column):
+        if column not in self._normalized_columns:
+            normalized_column = DATA_COLUMN_TO_NORMALIZED_COLUMN.get(column)
+            if normalized_column is not None and normalized_column in self._dataframe:
+                codes, uniques = pd.factorize(self._dataframe[normalized_column])
+            else:
+                codes, uniques = pd.factorize(self._dataframe[column])
+                uniques = [normalize_text_value(u) for u in uniques]
+            self._normalized_columns[column] = (codes, uniques)
+        return self._normalized_columns[column]
+
+    def _build_matrix(self, matcher_key):
+        matcher = self._program.get_matchers()[matcher_key]
+        codes, uniques = self._get_normalized_column(matcher_key[0])
+
+        # One extra row so that missing values (code -1) never match
+        matrix = np.zeros((len(uniques) + 1, len(matcher)), dtype=bool)
+        for row, text in enumerate(uniques):
+            for keyword_id in matcher.find_all_normalized(text):
+                matrix[row, keyword_id] = True
+
+        return codes, matrix
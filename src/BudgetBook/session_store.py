@@ -0,0 +1,63 @@
+from collections import OrderedDict
+import threading
+import time
+import uuid
+
+
+class SessionStore:
+    """Thread safe server-side storage of per session data, e.g. parsed uploads.
+
+    Entries expire ttl_seconds after their last access, the least recently used entries
+    are removed if more than max_sessions are stored.
+    """
+
+    def __init__(self, ttl_seconds: float = 3600.0, max_sessions: int = 32, clock=time.monotonic) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_sessions = max_sessions
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Session id to (last access time, value), ordered from least to most recently used
+        self._sessions = OrderedDict()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._remove_expired_sessions()
+            return len(self._sessions)
+
+    def create(self, value) -> str:
+        session_id = uuid.uuid4().hex
+        with self._lock:
+            self._remove_expired_sessions()
+            self._sessions[session_id] = (self._clock(), value)
+            while len(self._sessions) > self._max_sessions:
+                self._sessions.popitem(last=False)
+        return session_id
+
+    def get(self, session_id: str):
+        """Value of the session or None if it does not exist or expired."""
+        with self._lock:
+            self._remove_expired_sessions()
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            self._sessions[session_id] = (self._clock(), entry[1])
+            self._sessions.move_to_end(session_id)
+            return entry[1]
+
+    def get_values(self) -> list:
+        """Values of all sessions that did not expire, without counting as an access."""
+        with self._lock:
+            self._remove_expired_sessions()
+            return [value for _, value in self._sessions.values()]
+
+    def remove(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def _remove_expired_sessions(self):
+        expired_before = self._clock() - self._ttl_seconds
+        while self._sessions:
+            session_id, (last_access, _) = next(iter(self._sessions.items()))
+            if last_access > expired_before:
+                break
+            del self._sessions[session_id]
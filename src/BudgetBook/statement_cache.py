@@ -0,0 +1,121 @@
+import hashlib
+import json
+import logging
+import os
+import uuid
+
+import pandas as pd
+
+from BudgetBook.config_parser import Config
+
+
+logger = logging.getLogger(__name__)
+
+STATEMENT_CACHE_FILE_SUFFIX = ".parquet"
+# Bump whenever parsing or categorization changes the cached frames
+_STATEMENT_CACHE_FORMAT_VERSION = 2
+
+
+class StatementCache:
+    """On-disk cache of parsed and categorized statements, stored as parquet files.
+
+    Entries are addressed by the file content and the parts of the config that affect parsing,
+    the least recently used entries are removed once the cache exceeds its size limit.
+    """
+
+    def __init__(self, cache_dir: str, max_size_bytes: int = 256 * 2**20) -> None:
+        self._cache_dir = cache_dir
+        self._max_size_bytes = max_size_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def get_config_digest(config: Config) -> str:
+        serialized = json.dumps(
+            [
+                _STATEMENT_CACHE_FORMAT_VERSION,
+                config.get_statement_parser_config(),
+                config.get_category_mapping(),
+            ],
+            default=str,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def get_key(content: bytes, config_digest: str) -> str:
+        return hashlib.sha256(
+            hashlib.sha256(content).digest() + config_digest.encode("ascii")
+        ).hexdigest()
+
+    def get_cache_dir(self) -> str:
+        return self._cache_dir
+
+    def load(self, key: str) -> pd.DataFrame:
+        """Cached statement or None."""
+        file_path = self._get_file_path(key)
+        try:
+            dataframe = pd.read_parquet(file_path)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logger.exception("Removing unreadable statement cache entry '%s'", file_path)
+            self._remove(file_path)
+            return None
+
+        # The modification time orders entries for eviction
+        os.utime(file_path)
+        return dataframe
+
+    def store(self, key: str, dataframe: pd.DataFrame):
+        file_path = self._get_file_path(key)
+
+        # Write to a temporary file first, concurrent readers never see partial files
+        tmp_file_path = f"{file_path}.{uuid.uuid4().hex}.tmp"
+        try:
+            dataframe.to_parquet(tmp_file_path)
+            os.replace(tmp_file_path, file_path)
+        except Exception:
+            logger.exception("Failed to write statement cache entry '%s'", file_path)
+            self._remove(tmp_file_path)
+            return
+
+        self._evict()
+
+    def get_size_bytes(self) -> int:
+        return sum(size for _, _, size in self._get_entries())
+
+    def clear(self):
+        for file_path, _, _ in self._get_entries():
+            self._remove(file_path)
+
+    def _evict(self):
+        entries = sorted(self._get_entries(), key=lambda entry: entry[1])
+        size = sum(size for _, _, size in entries)
+        for file_path, _, file_size in entries:
+            if size <= self._max_size_bytes:
+                break
+            self._remove(file_path)
+            size -= file_size
+
+    def _get_entries(self):
+        entries = []
+        with os.scandir(self._cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(STATEMENT_CACHE_FILE_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((entry.path, stat.st_mtime_ns, stat.st_size))
+        return entries
+
+    def _get_file_path(self, key: str) -> str:
+        return os.path.join(self._cache_dir, key + STATEMENT_CACHE_FILE_SUFFIX)
+
+    @staticmethod
+    def _remove(file_path: str):
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
@@ -0,0 +1,178 @@
+import base64
+from concurrent.futures import ProcessPoolExecutor
+import io
+import logging
+from typing import Dict, List
+
+import pandas as pd
+
+from BudgetBook.account_statement_parser import AccountStatementCsvParser
+from BudgetBook.config_parser import Config
+from BudgetBook.metrics import get_metrics, measure
+from BudgetBook.statement_cache import StatementCache
+from BudgetBook.transaction_ledger import TransactionLedger
+
+
+logger = logging.getLogger(__name__)
+
+
+class StatementLoadException(Exception):
+    def __init__(self, errors: Dict[str, str]) -> None:
+        super().__init__(
+            "\n".join(f"{filename}: {error}" for filename, error in errors.items())
+        )
+        self._errors = errors
+
+    def get_errors(self) -> Dict[str, str]:
+        """Error message per file that could not be loaded."""
+        return self._errors
+
+
+def decode_uploaded_csv(contents: str):
+    # The reader decodes the bytes itself, no intermediate str copy of the whole file
+    _, content_string = contents.split(",")
+    return io.BytesIO(base64.b64decode(content_string))
+
+
+def _read_statement(source) -> bytes:
+    if isinstance(source, bytes):
+        return source
+    if isinstance(source, str):
+        if source.startswith("data:"):
+            return base64.b64decode(source.split(",")[1])
+        with open(source, "rb") as f:
+            return f.read()
+    content = source.read()
+    return content.encode("utf-8") if isinstance(content, str) else content
+
+
+def _parse_statement(config, source, chunk_size: int = None):
+    """Parsed statement and error, config is a Config or a config dict that is loaded in the try block."""
+    try:
+        if isinstance(config, dict):
+            config = Config(config=config)
+        with measure("decode_upload"):
+            if isinstance(source, str) and source.startswith("data:"):
+                source = decode_uploaded_csv(source)
+            elif isinstance(source, bytes):
+                source = io.BytesIO(source)
+        parser = AccountStatementCsvParser(source, config, chunk_size)
+        return parser.to_transaction_store().get_dataframe(), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def _parse_statement_in_worker(config_dict: dict, source, chunk_size: int, metrics_enabled: bool):
+    # Stages measured in the worker would never reach /metrics, they are returned with the result
+    metrics = get_metrics()
+    metrics.set_enabled(metrics_enabled)
+    with metrics.record_observations() as observations:
+        # The config of the parent, the yaml file might be mid-edit or not reloaded by the parent yet
+        result = _parse_statement(config_dict, source, chunk_size)
+    return result, observations
+
+
+class StatementLoader:
+    """Loads several statement csv files, optionally in parallel worker processes.
+
+    Sources are file paths, streams, raw file contents or base64 encoded uploads (data urls).
+    If a cache is given, statements that were parsed before with the same config are not parsed again.
+    If chunk_size is given, every statement is read in chunks of that many rows.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        max_workers: int = 1,
+        cache: StatementCache = None,
+        chunk_size: int = None,
+    ) -> None:
+        self._config = config
+        self._max_workers = max_workers
+        self._cache = cache
+        self._chunk_size = chunk_size
+
+    def load(
+        self,
+        sources: List,
+        filenames: List[str] = None,
+        ledger: TransactionLedger = None,
+    ) -> pd.DataFrame:
+        """Merged statements, raises a StatementLoadException listing every file that failed.
+
+        If a ledger is given, only rows it does not contain yet are appended to it.
+        """
+        if ledger is None:
+            ledger = TransactionLedger()
+        if filenames is None:
+            filenames = [
+                source if isinstance(source, str) and not source.startswith("data:") else f"statement {idx}"
+                for idx, source in enumerate(sources)
+            ]
+        if len(sources) == 0:
+            return ledger.get_dataframe()
+
+        sources = list(sources)
+        results = [None] * len(sources)
+        cache_keys = [None] * len(sources)
+
+        if self._cache is not None:
+            config_digest = StatementCache.get_config_digest(self._config)
+            for idx, source in enumerate(sources):
+                try:
+                    sources[idx] = _read_statement(source)
+                except Exception as e:
+                    results[idx] = (None, f"{type(e).__name__}: {e}")
+                    continue
+                cache_keys[idx] = StatementCache.get_key(sources[idx], config_digest)
+                dataframe = self._cache.load(cache_keys[idx])
+                if dataframe is not None:
+                    results[idx] = (dataframe, None)
+
+        pending = [idx for idx, result in enumerate(results) if result is None]
+        for idx, result in zip(pending, self._parse([sources[idx] for idx in pending])):
+            results[idx] = result
+            if cache_keys[idx] is not None and result[1] is None:
+                self._cache.store(cache_keys[idx], result[0])
+
+        errors = {
+            filename: error
+            for filename, (_, error) in zip(filenames, results)
+            if error is not None
+        }
+        if errors:
+            raise StatementLoadException(errors)
+
+        num_new_rows = sum(ledger.append(df) for df, _ in results)
+        logger.debug(
+            "Loaded %d statements, parsed %d of them, %d new rows",
+            len(sources),
+            len(pending),
+            num_new_rows,
+        )
+        return ledger.get_dataframe()
+
+    def _parse(self, sources: List) -> List:
+        max_workers = min(self._max_workers, len(sources))
+        if max_workers <= 1 or any(not isinstance(s, (str, bytes)) for s in sources):
+            # Streams can not be sent to other processes
+            return [_parse_statement(self._config, source, self._chunk_size) for source in sources]
+
+        metrics = get_metrics()
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results_and_observations = list(
+                executor.map(
+                    _parse_statement_in_worker,
+                    [self._config.get_config_dict()] * len(sources),
+                    sources,
+                    [self._chunk_size] * len(sources),
+                    [metrics.is_enabled()] * len(sources),
+                )
+            )
+
+        results = []
+        for result, observations in results_and_observations:
+            for stage, seconds, num_rows in observations:
+                metrics.observe(stage, seconds, num_rows)
+            results.append(result)
+        return results
@@ -0,0 +1,62 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from BudgetBook.config_parser import (
+    DATA_COLUMN_TO_NORMALIZED_COLUMN,
+    NormalizedDataColumns,
+)
+
+MAX_SIGNATURE_LENGTH = 150
+
+_REFERENCE_NUMBER_PATTERN = re.compile(
+    r"\b[a-z]{2}\d{2}(?: ?\d{4}){3,7}(?: ?\d{1,3})?\b"  # IBAN in groups of four
+    r"|\b[a-z]{2}\d{2}[a-z0-9]{11,30}\b"  # IBAN without spaces
+    r"|\d{6,}"  # Customer, invoice and other reference numbers
+)
+
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_text_value(text: str) -> str:
+    # Leading and trailing spaces are kept, keywords are padded with them to match word boundaries
+    return _WHITESPACE_PATTERN.sub(" ", str(text).casefold())
+
+
+def to_signature_value(normalized_text: str) -> str:
+    return " ".join(_REFERENCE_NUMBER_PATTERN.sub(" ", normalized_text).split())[
+        :MAX_SIGNATURE_LENGTH
+    ]
+
+
+def _map_unique_values(series: pd.Series, func) -> pd.Series:
+    codes, uniques = pd.factorize(series)
+    mapped = np.array([func(u) for u in uniques] + [""], dtype=object)
+    return pd.Series(mapped[codes], index=series.index)
+
+
+def normalize_text(series: pd.Series) -> pd.Series:
+    return _map_unique_values(series, normalize_text_value)
+
+
+def to_signature(normalized_series: pd.Series) -> pd.Series:
+    return _map_unique_values(normalized_series, to_signature_value)
+
+
+def add_normalized_columns(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """Adds the casefolded text columns used for matching and grouping, unless already present."""
+    for column, normalized_column in DATA_COLUMN_TO_NORMALIZED_COLUMN.items():
+        if normalized_column not in dataframe and column in dataframe:
+            dataframe[normalized_column] = normalize_text(dataframe[column])
+
+    if (
+        NormalizedDataColumns.DESCRIPTION_SIGNATURE not in dataframe
+        and NormalizedDataColumns.DESCRIPTION in dataframe
+    ):
+        dataframe[NormalizedDataColumns.DESCRIPTION_SIGNATURE] = to_signature(
+            dataframe[NormalizedDataColumns.DESCRIPTION]
+        )
+
+    return dataframe
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+from BudgetBook.config_parser import DataColumns
+from BudgetBook.transaction_store import (
+    TransactionStore,
+    concat_dataframes,
+    to_categorical_columns,
+)
+
+
+class TransactionLedger:
+    """Growing set of transactions, statements can be appended without re-checking the whole history.
+
+    A hash per row over ROW_HASH_COLUMNS is kept, rows whose hash was seen before are not appended again.
+    """
+
+    ROW_HASH_COLUMNS = [
+        DataColumns.DATE,
+        DataColumns.AMOUNT,
+        DataColumns.PAYMENT_PARTY,
+        DataColumns.DESCRIPTION,
+    ]
+
+    def __init__(self) -> None:
+        self._row_hashes = set()
+        self._dataframes = []
+        self._dataframe_cache = None
+
+    @staticmethod
+    def get_row_hashes(dataframe: pd.DataFrame) -> np.ndarray:
+        return pd.util.hash_pandas_object(
+            dataframe[TransactionLedger.ROW_HASH_COLUMNS], index=False
+        ).to_numpy()
+
+    def __len__(self) -> int:
+        return len(self._row_hashes)
+
+    def append(self, dataframe: pd.DataFrame) -> int:
+        """Appends all rows that are not part of the ledger yet, returns the number of appended rows."""
+        row_hashes = TransactionLedger.get_row_hashes(dataframe)
+
+        # Duplicates within the new statement are dropped as well
+        is_new = ~pd.Series(row_hashes).duplicated().to_numpy()
+        is_new &= ~self._contains_hashes(row_hashes)
+
+        num_new_rows = int(is_new.sum())
+        if num_new_rows > 0:
+            self._row_hashes.update(row_hashes[is_new].tolist())
+            self._dataframes.append(dataframe[is_new])
+            self._dataframe_cache = None
+        return num_new_rows
+
+    def contains(self, dataframe: pd.DataFrame) -> np.ndarray:
+        """Mask of the rows that are already part of the ledger."""
+        return self._contains_hashes(TransactionLedger.get_row_hashes(dataframe))
+
+    def _contains_hashes(self, row_hashes: np.ndarray) -> np.ndarray:
+        return np.fromiter(
+            (h in self._row_hashes for h in row_hashes.tolist()),
+            dtype=bool,
+            count=len(row_hashes),
+        )
+
+    def get_dataframe(self) -> pd.DataFrame:
+        # Appended statements are only concatenated when the full history is requested
+        if self._dataframe_cache is None:
+            if len(self._dataframes) == 0:
+                self._dataframe_cache = TransactionStore().get_dataframe()
+            else:
+                self._dataframe_cache = concat_dataframes(
+                    self._dataframes, ignore_index=True
+                )
+                self._dataframes = [self._dataframe_cache]
+        return self._dataframe_cache
+
+    def set_categories(self, categories: pd.Series):
+        """Replaces the category of every row, categories are in the order of get_dataframe."""
+        dataframe = self.get_dataframe()
+        self._dataframe_cache = to_categorical_columns(
+            dataframe.assign(**{DataColumns.CATEGORY: categories.to_numpy()})
+        )
+        self._dataframes = [self._dataframe_cache]
+
+    def to_transaction_store(self) -> TransactionStore:
+        return TransactionStore(self.get_dataframe())
@@ -0,0 +1,161 @@
+import datetime
+from typing import Iterable, Iterator, List
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from BudgetBook.config_parser import DataColumns
+from BudgetBook.date_parsing import to_date_objects
+from BudgetBook.dated_transaction import DatedTransaction
+
+
+# Low cardinality string columns, kept as categoricals to save memory and speed up group-bys
+CATEGORICAL_COLUMNS = [
+    DataColumns.PAYMENT_PARTY,
+    DataColumns.TYPE_OF_TRANSFER,
+    DataColumns.CATEGORY,
+]
+
+
+def to_categorical_columns(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """Converts the CATEGORICAL_COLUMNS of the data frame in place."""
+    for column in CATEGORICAL_COLUMNS:
+        if column in dataframe and not isinstance(
+            dataframe[column].dtype, pd.CategoricalDtype
+        ):
+            dataframe[column] = dataframe[column].astype("category")
+    return dataframe
+
+
+def isin_categories(series: pd.Series, values: Iterable[str]) -> np.ndarray:
+    """Same as series.isin(values).to_numpy(), categoricals compare their codes instead of the strings."""
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return series.isin(values).to_numpy()
+    codes = series.cat.categories.get_indexer(list(values))
+    return np.isin(series.cat.codes.to_numpy(), codes[codes >= 0])
+
+
+def concat_dataframes(dataframes: List[pd.DataFrame], **kwargs) -> pd.DataFrame:
+    """Same as pd.concat, but categorical columns with different categories stay categorical."""
+    dataframes = list(dataframes)
+    result = pd.concat(dataframes, **kwargs)
+    for column in CATEGORICAL_COLUMNS:
+        if column not in result or isinstance(result[column].dtype, pd.CategoricalDtype):
+            continue
+        columns = [df[column] for df in dataframes if column in df]
+        if len(columns) == len(dataframes) and all(
+            isinstance(c.dtype, pd.CategoricalDtype) for c in columns
+        ):
+            # Merges the categories and recodes, the strings are not hashed again
+            result[column] = union_categoricals(columns, sort_categories=True)
+    return to_categorical_columns(result)
+
+
+class TransactionStore:
+    """Columnar storage of dated transactions, backed by a single data frame.
+
+    Rows can still be accessed as DatedTransaction objects, which are created on demand.
+    """
+
+    COLUMNS = [
+        DataColumns.PAYMENT_PARTY,
+        DataColumns.DATE,
+        DataColumns.AMOUNT,
+        DataColumns.DESCRIPTION,
+        DataColumns.CATEGORY,
+    ]
+
+    def __init__(self, dataframe: pd.DataFrame = None) -> None:
+        if dataframe is None:
+            dataframe = pd.DataFrame(
+                {
+                    DataColumns.PAYMENT_PARTY: pd.Series(dtype="category"),
+                    DataColumns.DATE: pd.Series(dtype="datetime64[ns]"),
+                    DataColumns.AMOUNT: pd.Series(dtype=np.float64),
+                    DataColumns.DESCRIPTION: pd.Series(dtype=object),
+                    DataColumns.CATEGORY: pd.Series(dtype="category"),
+                }
+            )
+
+        missing_columns = [c for c in TransactionStore.COLUMNS if c not in dataframe]
+        if missing_columns:
+            raise AttributeError(f"Columns {missing_columns} missing in transaction data!")
+
+        if not pd.api.types.is_datetime64_dtype(dataframe[DataColumns.DATE]):
+            dataframe = dataframe.assign(
+                **{DataColumns.DATE: pd.to_datetime(dataframe[DataColumns.DATE])}
+            )
+
+        self._dataframe = to_categorical_columns(dataframe.reset_index(drop=True))
+
+    @staticmethod
+    def from_transactions(transactions: Iterable[DatedTransaction]):
+        transactions = list(transactions)
+        return TransactionStore(
+            pd.DataFrame(
+                {
+                    DataColumns.PAYMENT_PARTY: [t.payment_party for t in transactions],
+                    DataColumns.DATE: pd.to_datetime([t.date for t in transactions]),
+                    DataColumns.AMOUNT: [t.amount for t in transactions],
+                    DataColumns.DESCRIPTION: [t.desc for t in transactions],
+                    DataColumns.CATEGORY: [t.category for t in transactions],
+                }
+            )
+        )
+
+    @staticmethod
+    def concat(stores: List["TransactionStore"]):
+        if len(stores) == 0:
+            return TransactionStore()
+        if len(stores) == 1:
+            return stores[0]
+        return TransactionStore(
+            concat_dataframes([s.get_dataframe() for s in stores], ignore_index=True)
+        )
+
+    def __len__(self) -> int:
+        return len(self._dataframe)
+
+    def __iter__(self) -> Iterator[DatedTransaction]:
+        df = self._dataframe
+        for payment_party, date, amount, desc, category in zip(
+            df[DataColumns.PAYMENT_PARTY],
+            to_date_objects(df[DataColumns.DATE]),
+            df[DataColumns.AMOUNT],
+            df[DataColumns.DESCRIPTION],
+            df[DataColumns.CATEGORY],
+        ):
+            yield DatedTransaction(payment_party, date, amount, desc, category)
+
+    def __getitem__(self, idx: int) -> DatedTransaction:
+        row = self._dataframe.iloc[idx]
+        return DatedTransaction(
+            row[DataColumns.PAYMENT_PARTY],
+            row[DataColumns.DATE].date(),
+            row[DataColumns.AMOUNT],
+            row[DataColumns.DESCRIPTION],
+            row[DataColumns.CATEGORY],
+        )
+
+    def __repr__(self) -> str:
+        return f"TransactionStore with {len(self)} transactions"
+
+    def get_dataframe(self) -> pd.DataFrame:
+        return self._dataframe
+
+    def get_first_date(self) -> datetime.date:
+        if len(self) == 0:
+            return None
+        return self._dataframe[DataColumns.DATE].min().date()
+
+    def get_last_date(self) -> datetime.date:
+        if len(self) == 0:
+            return None
+        return self._dataframe[DataColumns.DATE].max().date()
+
+    def filter_by_date(self, from_date: datetime.date, to_date: datetime.date):
+        """Transactions within [from_date, to_date)."""
+        dates = self._dataframe[DataColumns.DATE].to_numpy()
+        mask = (dates >= np.datetime64(from_date)) & (dates < np.datetime64(to_date))
+        return TransactionStore(self._dataframe[mask])
@@ -5,10 +5,18 @@ from dateutil.relativedelta import relativedelta
 
 import pandas as pd
 import plotly.graph_objects as go
-from BudgetBook.category_parser import CategoryParser
+from BudgetBook.category_cube import CategoryCube, CategoryLevel, TransactionFlow
 
 from BudgetBook.dated_transaction import DatedTransaction
+from BudgetBook.occurence_cache import OccurenceCache
 from BudgetBook.regular_transaction import RegularTransaction
+from BudgetBook.date_parsing import to_date_objects
+from BudgetBook.transaction_store import (
+    TransactionStore,
+    concat_dataframes,
+    isin_categories,
+    to_categorical_columns,
+)
 from BudgetBook.config_parser import (
     Config,
     ConfigKeywords,
@@ -16,34 +24,72 @@ from BudgetBook.config_parser import (
     DATA_COLUMN_TO_DISPLAY_NAME,
 )
 from BudgetBook.helper import COLORMAP, CURRENCY_SYMBOL
+from BudgetBook.metrics import measure, timed
+
+UNIX_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
 
 
 class TransactionVisualizer:
     def __init__(self, config: Config) -> None:
         self._scheduled_transactions: List[RegularTransaction] = []
+        self._transaction_stores: List[TransactionStore] = []
         self._from_date = None
         self._to_date = None
         self._dataframe_cache = None
+        # Kept when the analysis interval changes, so moving the interval only expands the new dates
+        self._occurence_cache = OccurenceCache()
+        self._scheduled_transaction_columns = None
+        self._category_cube = None
+        self._category_level = CategoryLevel.CATEGORY
         self._config = config
 
     def clear_transactions(self):
         self._scheduled_transactions.clear()
+        self._transaction_stores.clear()
         self._dataframe_cache = None
+        self._occurence_cache.clear()
+        self._scheduled_transaction_columns = None
+        self._category_cube = None
         self._from_date = None
         self._to_date = None
 
     def add_transaction(self, transaction: RegularTransaction):
         self._scheduled_transactions.append(transaction)
+        self._scheduled_transaction_columns = None
 
     def add_transactions(self, transactions: List[RegularTransaction]):
-        self._scheduled_transactions.extend(transactions)
+        if isinstance(transactions, TransactionStore):
+            self._transaction_stores.append(transactions)
+        else:
+            self._scheduled_transactions.extend(transactions)
+            self._scheduled_transaction_columns = None
 
     def set_transactions(self, transactions: List[RegularTransaction]):
         self.clear_transactions()
-        self._scheduled_transactions.extend(transactions)
+        self.add_transactions(transactions)
+
+    def set_transaction_stores(self, transaction_stores: List[TransactionStore]):
+        """Replaces the statements, the occurences of the regular transactions stay cached."""
+        self._transaction_stores = list(transaction_stores)
+        self._dataframe_cache = None
+        self._category_cube = None
 
     def get_transactions(self):
-        return self._scheduled_transactions
+        return self._scheduled_transactions + [
+            transaction
+            for transaction_store in self._transaction_stores
+            for transaction in transaction_store
+        ]
+
+    def get_transaction_store(self) -> TransactionStore:
+        """All dated transactions, without expanding regular transactions."""
+        dated_transactions = [
+            t for t in self._scheduled_transactions if isinstance(t, DatedTransaction)
+        ]
+        transaction_stores = list(self._transaction_stores)
+        if len(dated_transactions) > 0:
+            transaction_stores.append(TransactionStore.from_transactions(dated_transactions))
+        return TransactionStore.concat(transaction_stores)
 
     def set_analysis_interval_to_max_range(self):
         def get_first_occurence(transation):
@@ -64,6 +110,11 @@ class TransactionVisualizer:
                 for t in self._scheduled_transactions
                 if get_first_occurence(t) is not None
             ]
+            + [
+                s.get_first_date()
+                for s in self._transaction_stores
+                if s.get_first_date() is not None
+            ]
         )
         max_date = max(
             [
@@ -71,6 +122,11 @@ class TransactionVisualizer:
                 for t in self._scheduled_transactions
                 if get_last_occurence(t) is not None
             ]
+            + [
+                s.get_last_date()
+                for s in self._transaction_stores
+                if s.get_last_date() is not None
+            ]
         )
 
         self.set_analysis_interval(min_date, max_date + relativedelta(days=1))
@@ -90,12 +146,42 @@ class TransactionVisualizer:
             categories.add(ConfigKeywords.CATEGORY_DEFAULT_UNKNOWN_PAYMENT)
 
             categories = sorted(categories)
+            # Appended, so the colors of the categories are the same on every level
+            categories += sorted(
+                set(self._get_parent_per_category().values()).difference(categories, [""])
+            )
 
             self.category_to_color_map = {
                 c: COLORMAP[idx % len(COLORMAP)]
                 for idx, c in enumerate(categories)
             }
 
+    def set_category_level(self, category_level: str):
+        """CategoryLevel the plots aggregate by, either the categories or their parent categories."""
+        self._category_level = category_level
+
+    def get_category_level(self) -> str:
+        return self._category_level
+
+    def _get_parent_per_category(self):
+        # Read from the mapping itself, drawing the plots must not compile the rules
+        return {
+            c: rules.get(ConfigKeywords.CATEGORY_PARENT, "") if isinstance(rules, dict) else ""
+            for c, rules in self._config.get_category_mapping().items()
+        }
+
+    def get_category_cube(self) -> CategoryCube:
+        """Aggregates of the analysis interval, built on first use."""
+        if self._category_cube is None and self.dataset_is_valid():
+            with measure("category_cube") as measurement:
+                self._category_cube = CategoryCube(
+                    self._dataframe_cache,
+                    self._config.get_internal_transaction_categories(),
+                    self._get_parent_per_category(),
+                )
+                measurement.add_rows(len(self._dataframe_cache))
+        return self._category_cube
+
     def dataset_is_valid(self):
         return self._dataframe_cache is not None
 
@@ -108,41 +194,115 @@ class TransactionVisualizer:
     def get_last_transaction_date_in_analysis_interval(self):
         return self._dataframe_cache.index.max()
 
+    @timed("to_dataframe")
     def _to_dataframe(self):
-        if len(self._scheduled_transactions) == 0:
+        self._category_cube = None
+        if len(self._scheduled_transactions) == 0 and len(self._transaction_stores) == 0:
             self._dataframe_cache = None
             return
 
-        indivdual_transactions = []
+        with measure("expand_scheduled_transactions") as measurement:
+            scheduled_transactions = self._expand_scheduled_transactions()
+            measurement.add_rows(len(scheduled_transactions))
 
-        for scheduled_transaction in self._scheduled_transactions:
+        # Stores are already columnar, only their rows within the interval are copied
+        self._dataframe_cache = concat_dataframes(
+            [
+                scheduled_transactions,
+                *[
+                    s.filter_by_date(self._from_date, self._to_date).get_dataframe()[
+                        TransactionStore.COLUMNS
+                    ]
+                    for s in self._transaction_stores
+                ],
+            ],
+            ignore_index=True,
+        )
+
+        self._dataframe_cache.set_index(DataColumns.DATE, inplace=True)
+        self._dataframe_cache.sort_index(inplace=True)
+
+        self._dataframe_cache["date_without_day"] = self._get_dates_without_day(self._dataframe_cache.index)
+
+    def _get_scheduled_transaction_columns(self):
+        """Everything of the scheduled transactions that does not depend on the analysis interval.
+
+        One row per scheduled transaction, whether it is a regular transaction, the events of the
+        regular transactions and the dates of the dated transactions.
+        """
+        if self._scheduled_transaction_columns is not None:
+            return self._scheduled_transaction_columns
+
+        is_regular = np.empty(len(self._scheduled_transactions), dtype=bool)
+        events = []
+        dates_of_dated_transactions = []
+        for idx, scheduled_transaction in enumerate(self._scheduled_transactions):
             if isinstance(scheduled_transaction, RegularTransaction):
-                transactions = [
-                    transaction.to_dict()
-                    for transaction in scheduled_transaction.iterate(
-                        from_date=self._from_date, up_to=self._to_date
-                    )
-                ]
-                indivdual_transactions.extend(transactions)
+                is_regular[idx] = True
+                events.append(scheduled_transaction.get_frequency())
             elif isinstance(scheduled_transaction, DatedTransaction):
-                if (
-                    scheduled_transaction.date >= self._from_date
-                    and scheduled_transaction.date < self._to_date
-                ):
-                    indivdual_transactions.append(scheduled_transaction.to_dict())
+                is_regular[idx] = False
+                dates_of_dated_transactions.append(scheduled_transaction.date.toordinal())
             else:
                 raise AttributeError("Invalid type")
 
-        self._dataframe_cache = pd.DataFrame.from_records(
-            indivdual_transactions,
+        # Ordinals are converted much faster than date objects
+        dates_of_dated_transactions = (
+            np.array(dates_of_dated_transactions, dtype=np.int64) - UNIX_EPOCH_ORDINAL
+        ).astype("datetime64[D]")
+
+        columns = [c for c in TransactionStore.COLUMNS if c != DataColumns.DATE]
+        schedules = to_categorical_columns(
+            pd.DataFrame.from_records(
+                [t.to_dict() for t in self._scheduled_transactions], columns=columns
+            )
         )
 
-        self._dataframe_cache.set_index(DataColumns.DATE, inplace=True)
-        self._dataframe_cache.index = pd.DatetimeIndex(self._dataframe_cache.index)
-        self._dataframe_cache.sort_index(inplace=True)
+        self._scheduled_transaction_columns = (
+            schedules,
+            is_regular,
+            events,
+            dates_of_dated_transactions,
+        )
+        return self._scheduled_transaction_columns
+
+    def _expand_scheduled_transactions(self) -> pd.DataFrame:
+        """Occurences of the scheduled transactions within the analysis interval, with the columns of TransactionStore.
+
+        Built from one row per scheduled transaction, repeated by its number of occurences.
+        """
+        (
+            schedules,
+            is_regular,
+            events,
+            dates_of_dated_transactions,
+        ) = self._get_scheduled_transaction_columns()
+
+        occurences = [
+            self._occurence_cache.get_occurences(event, self._from_date, self._to_date)
+            for event in events
+        ]
+        is_in_interval = (dates_of_dated_transactions >= np.datetime64(self._from_date, "D")) & (
+            dates_of_dated_transactions < np.datetime64(self._to_date, "D")
+        )
 
-        self._dataframe_cache["date_without_day"] = self._get_dates_without_day(self._dataframe_cache.index)
+        num_occurences = np.empty(len(is_regular), dtype=np.int64)
+        num_occurences[is_regular] = [o.size for o in occurences]
+        num_occurences[~is_regular] = is_in_interval
+
+        # Rows keep the order of the scheduled transactions
+        is_regular_row = np.repeat(is_regular, num_occurences)
+        dates = np.empty(len(is_regular_row), dtype="datetime64[D]")
+        dates[is_regular_row] = np.concatenate(occurences) if occurences else []
+        dates[~is_regular_row] = dates_of_dated_transactions[is_in_interval]
 
+        transactions = schedules.iloc[
+            np.repeat(np.arange(len(schedules)), num_occurences)
+        ].reset_index(drop=True)
+        transactions[DataColumns.DATE] = dates.astype("datetime64[ns]")
+        return transactions[TransactionStore.COLUMNS]
+
+    @timed("plot_statement_dataframe")
     def plot_statement_dataframe(self):
 
         if not self.dataset_is_valid():
@@ -197,10 +357,9 @@ class TransactionVisualizer:
                     name=category,
                     x=curr_df["date_without_day"],
                     y=curr_amount,
-                    text=[
-                        f"{date:%d.%m.%Y}<br>{d[DataColumns.PAYMENT_PARTY][:40]}"
-                        for date, d in curr_df.iterrows()
-                    ],
+                    text=curr_df.index.strftime("%d.%m.%Y")
+                    + "<br>"
+                    + curr_df[DataColumns.PAYMENT_PARTY].str.slice(stop=40),
                     marker_color=self.category_to_color_map[category],
                     hovertemplate=f"%{{y:.2f}} {CURRENCY_SYMBOL}<br>%{{text}}<extra>{category}</extra>",
                     legendgroup=category,
@@ -229,19 +388,84 @@ class TransactionVisualizer:
         )
         return fig
 
+    def _plot_stacked_by_category_per_month_from_cube(
+        self, flows, title, yaxis_title, negate=False, fig=None, row=None, col=None
+    ):
+        """Same as _plot_stacked_by_category_per_month, but one bar per month and category of the level."""
+        if fig is None:
+            fig = go.Figure()
+
+        df = self.get_category_cube().get_per_month(self._category_level, flows)
+        if negate:
+            df[DataColumns.AMOUNT] = -df[DataColumns.AMOUNT]
+        sum_per_month = df.groupby(CategoryCube.MONTH)[DataColumns.AMOUNT].sum()
+
+        fig.add_trace(
+            go.Scatter(
+                x=sum_per_month.index,
+                y=sum_per_month.values,
+                name=f"Total {title}",
+                mode="lines+markers",
+                marker_color="black",
+                line_dash="dash",
+                hovertemplate=f"%{{y:.2f}} {CURRENCY_SYMBOL}<br>%{{x}}<extra></extra>",
+                legendgroup="total",
+                legendgrouptitle_text="Total per Month",
+            ),
+            row=row,
+            col=col,
+        )
+
+        for category in df[DataColumns.CATEGORY].unique():
+            curr_df = df[df[DataColumns.CATEGORY] == category]
+            fig.add_trace(
+                go.Bar(
+                    name=category,
+                    x=curr_df[CategoryCube.MONTH],
+                    y=curr_df[DataColumns.AMOUNT],
+                    text=curr_df[CategoryCube.COUNT],
+                    marker_color=self.category_to_color_map[category],
+                    hovertemplate=f"%{{y:.2f}} {CURRENCY_SYMBOL}<br>%{{text}} transactions<extra>{category}</extra>",
+                    legendgroup=category,
+                    showlegend=False
+                    if len([t for t in fig.select_traces({"name": category})]) > 0
+                    else True,
+                ),
+                row=row,
+                col=col,
+            )
+
+        fig.update_layout(
+            barmode="relative",
+            margin=dict(l=20, r=20),
+        )
+        fig.update_xaxes(title_text="[Date]", row=row, col=col)
+        fig.update_yaxes(title_text=yaxis_title, row=row, col=col)
+        return fig
+
     def _get_dates_without_day(self, dates):
-        return [
-            datetime.date(year=d.year, month=d.month, day=1)
-            for d in dates
-        ]
+        months = pd.DatetimeIndex(dates).to_numpy().astype("datetime64[M]")
+        return to_date_objects(pd.Series(months.astype("datetime64[ns]")))
 
     def _get_sum_per_month(self, amount):
         return amount.groupby(by=pd.Grouper(freq="M")).sum()
 
+    @timed("plot_payments_per_month")
     def plot_payments_per_month(self, fig=None, row=None, col=None):
         if not self.dataset_is_valid():
             return go.Figure()
 
+        if self._category_level != CategoryLevel.CATEGORY:
+            return self._plot_stacked_by_category_per_month_from_cube(
+                [TransactionFlow.PAYMENT],
+                title="Payments Per Month",
+                yaxis_title=f"Payments Per Month [{CURRENCY_SYMBOL}]",
+                negate=True,
+                fig=fig,
+                row=row,
+                col=col,
+            )
+
         df = self._get_data_without_internal_transactions()
 
         df = df[df[DataColumns.AMOUNT] < 0]
@@ -257,11 +481,22 @@ class TransactionVisualizer:
             col=col,
         )
 
+    @timed("plot_internal_transactions_per_month")
     def plot_internal_transactions_per_month(self, fig=None, row=None, col=None):
 
         if not self.dataset_is_valid():
             return go.Figure()
 
+        if self._category_level != CategoryLevel.CATEGORY:
+            return self._plot_stacked_by_category_per_month_from_cube(
+                [TransactionFlow.INTERNAL_INCOME, TransactionFlow.INTERNAL_PAYMENT],
+                title="Internal Transfers Per Month",
+                yaxis_title=f"Internal Transfers Per Month [{CURRENCY_SYMBOL}]",
+                fig=fig,
+                row=row,
+                col=col,
+            )
+
         df = self._get_internal_transactions()
 
         return self._plot_stacked_by_category_per_month(
@@ -274,10 +509,21 @@ class TransactionVisualizer:
             col=col,
         )
 
+    @timed("plot_income_per_month")
     def plot_income_per_month(self, fig=None, row=None, col=None):
         if not self.dataset_is_valid():
             return go.Figure()
 
+        if self._category_level != CategoryLevel.CATEGORY:
+            return self._plot_stacked_by_category_per_month_from_cube(
+                [TransactionFlow.INCOME],
+                title="Income Per Month",
+                yaxis_title=f"Income Per Month [{CURRENCY_SYMBOL}]",
+                fig=fig,
+                row=row,
+                col=col,
+            )
+
         df = self._get_data_without_internal_transactions()
         df = df[df[DataColumns.AMOUNT] > 0]
 
@@ -291,6 +537,7 @@ class TransactionVisualizer:
             col=col,
         )
 
+    @timed("plot_balance_per_month")
     def plot_balance_per_month(self):
 
         if not self.dataset_is_valid():
@@ -317,16 +564,13 @@ class TransactionVisualizer:
 
         return fig
 
+    @timed("plot_transactions_per_month")
     def plot_transactions_per_month(self):
 
         if not self.dataset_is_valid():
             return go.Figure()
 
-        df = (
-            self._dataframe_cache.groupby(["date_without_day", DataColumns.CATEGORY])
-            .sum()
-            .reset_index()
-        )
+        df = self.get_category_cube().get_per_month(self._category_level)
 
         fig = go.Figure()
 
@@ -351,23 +595,16 @@ class TransactionVisualizer:
         )
         return fig
 
+    @timed("plot_payments_per_month_as_area")
     def plot_payments_per_month_as_area(self):
 
         if not self.dataset_is_valid():
             return go.Figure()
 
-        
-        df = self._get_data_without_internal_transactions()
-
-        df = df[df[DataColumns.AMOUNT] < 0]
-        
-        df = (
-            df.groupby(["date_without_day", DataColumns.CATEGORY])
-            .sum()
-            .reset_index()
+        df = self.get_category_cube().get_per_month(
+            self._category_level, [TransactionFlow.PAYMENT]
         )
 
-
         fig = go.Figure()
 
         for category in df[DataColumns.CATEGORY].unique():
@@ -393,26 +630,21 @@ class TransactionVisualizer:
         )
         return fig
 
-    def _get_data_without_internal_transactions(self):
-        internal_transaction_categories = (
-            self._config.get_internal_transaction_categories()
+    def _get_internal_transactions_mask(self) -> np.ndarray:
+        return isin_categories(
+            self._dataframe_cache[DataColumns.CATEGORY],
+            self._config.get_internal_transaction_categories(),
         )
-        mask = self._dataframe_cache[DataColumns.CATEGORY].isin(
-            internal_transaction_categories
-        )
-        df = self._dataframe_cache[~mask]
+
+    def _get_data_without_internal_transactions(self):
+        df = self._dataframe_cache[~self._get_internal_transactions_mask()]
         return df
 
     def _get_internal_transactions(self):
-        internal_transaction_categories = (
-            self._config.get_internal_transaction_categories()
-        )
-        mask = self._dataframe_cache[DataColumns.CATEGORY].isin(
-            internal_transaction_categories
-        )
-        df = self._dataframe_cache[mask]
+        df = self._dataframe_cache[self._get_internal_transactions_mask()]
         return df
 
+    @timed("plot_pie_chart_per_cateogry")
     def plot_pie_chart_per_cateogry(self):
 
         if not self.dataset_is_valid():
@@ -464,23 +696,20 @@ class TransactionVisualizer:
         return total_months
 
     def _get_abs_payment_amount_per_category(self):
-        grouped_per_category = self._dataframe_cache[
-            self._dataframe_cache[DataColumns.AMOUNT] < 0
-        ].groupby(by=DataColumns.CATEGORY)
-        amount_per_category = grouped_per_category[DataColumns.AMOUNT].sum().abs()
-        return amount_per_category
+        # Internal payments are part of the payments here
+        return self.get_category_cube().get_total_per_category(
+            self._category_level,
+            [TransactionFlow.PAYMENT, TransactionFlow.INTERNAL_PAYMENT],
+        ).abs()
 
+    @timed("plot_cateogory_variance")
     def plot_cateogory_variance(self):
         if not self.dataset_is_valid():
             return go.Figure()
 
         fig = go.Figure()
 
-        df = (
-            self._dataframe_cache.groupby(["date_without_day", DataColumns.CATEGORY])
-            .sum()
-            .reset_index()
-        )
+        df = self.get_category_cube().get_per_month(self._category_level)
 
         for category in df[DataColumns.CATEGORY].unique():
 
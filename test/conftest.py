@@ -0,0 +1,56 @@
+import os
+import sys
+
+import pytest
+import yaml
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC_DIR)
+
+from BudgetBook.config_parser import Config
+
+# Columns of the csv statements used by the tests
+STATEMENT_PARSER = {
+    "csv_columns": {
+        "payment_party": "Name",
+        "amount": "Betrag",
+        "type_of_transfer": "Buchungstext",
+        "description": "Verwendungszweck",
+        "date": "Buchungstag",
+    },
+    "date_format": "%d.%m.%Y",
+    "internal_transfer_categories": [],
+}
+
+
+@pytest.fixture
+def write_config(tmp_path):
+    """Writes tmp_path/config.yaml with the given category mapping and returns its path.
+
+    Keyword arguments replace entries of the statement_parser section, e.g. internal_transfer_categories.
+    """
+
+    def write(category_mapping: dict, **statement_parser):
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(
+            yaml.safe_dump(
+                {
+                    "statement_parser": {**STATEMENT_PARSER, **statement_parser},
+                    "category_mapping": category_mapping,
+                },
+                sort_keys=False,
+            )
+        )
+        return config_path
+
+    return write
+
+
+@pytest.fixture
+def make_config(write_config):
+    """Writes the config like write_config and instantiates the shared Config with it."""
+
+    def make(category_mapping: dict, **statement_parser) -> Config:
+        return Config(str(write_config(category_mapping, **statement_parser)))
+
+    return make
@@ -0,0 +1,83 @@
+import os
+import sys
+
+import pytest
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC_DIR)
+
+from BudgetBook.account_statement_parser import AccountStatementCsvParser
+from BudgetBook.config_parser import DataColumns
+
+CATEGORY_MAPPING = {
+    "Salary": {"description": ["lohn"]},
+    "Groceries": {"payment_party": ["lidl"]},
+}
+
+CSV_STATEMENT = """Buchungstag;Name;Buchungstext;Verwendungszweck;Betrag;Saldo
+01.05.2022;Employer;Gutschrift;Lohn 05/2022;3000,00;3000,00
+02.05.2022;Lidl Filiale;Kartenzahlung;Einkauf;-20,50;2979,50
+03.05.2022;Someone;Lastschrift;Geschenk;-10,00;2969,50
+01.06.2022;Employer;Gutschrift;Lohn 06/2022;3000,00;5969,50
+02.06.2022;Lidl Filiale;Kartenzahlung;Einkauf;-15,00;5954,50
+"""
+
+
+@pytest.fixture
+def config(make_config):
+    return make_config(CATEGORY_MAPPING)
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    csv_path = tmp_path / "statement.csv"
+    csv_path.write_text(CSV_STATEMENT)
+    return str(csv_path)
+
+
+def test_parse_statement(config, csv_path):
+    parser = AccountStatementCsvParser(csv_path, config)
+
+    df = parser.get_csv_dataframe()
+    assert len(df) == 5
+    assert "Saldo" not in df
+    assert df[DataColumns.AMOUNT].iloc[1] == pytest.approx(-20.5)
+    assert parser.get_categories().tolist()[:2] == ["Salary", "Groceries"]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 10])
+def test_chunked_parsing_matches_full_parsing(config, csv_path, chunk_size):
+    parser = AccountStatementCsvParser(csv_path, config)
+    chunked_parser = AccountStatementCsvParser(csv_path, config, chunk_size=chunk_size)
+
+    assert chunked_parser.get_csv_dataframe().equals(parser.get_csv_dataframe())
+    assert (
+        chunked_parser.to_transaction_store()
+        .get_dataframe()
+        .equals(parser.to_transaction_store().get_dataframe())
+    )
+
+
+def test_chunk_memory_usage(config, csv_path):
+    parser = AccountStatementCsvParser(csv_path, config, chunk_size=2, measure_chunk_memory=True)
+
+    chunk_memory_usage = parser.get_chunk_memory_usage()
+    assert [num_rows for num_rows, _ in chunk_memory_usage] == [2, 2, 1]
+    assert all(memory_mib > 0 for _, memory_mib in chunk_memory_usage)
+    assert AccountStatementCsvParser(csv_path, config, chunk_size=2).get_chunk_memory_usage() == []
+
+
+def test_pyarrow_engine_matches_c_engine(make_config, csv_path):
+    pytest.importorskip("pyarrow")
+    expected = AccountStatementCsvParser(csv_path, make_config(CATEGORY_MAPPING)).get_csv_dataframe()
+
+    parser = AccountStatementCsvParser(csv_path, make_config(CATEGORY_MAPPING, csv_engine="pyarrow"))
+
+    assert parser.get_csv_dataframe().equals(expected)
+
+
+def test_pyarrow_engine_can_not_read_chunks(make_config, csv_path):
+    config = make_config(CATEGORY_MAPPING, csv_engine="pyarrow")
+
+    with pytest.raises(ValueError):
+        AccountStatementCsvParser(csv_path, config, chunk_size=2)
@@ -0,0 +1,97 @@
+import datetime
+import os
+import sys
+
+import pandas as pd
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC_DIR)
+
+from BudgetBook.analysis_session import AnalysisSession
+from BudgetBook.config_parser import Config, DataColumns
+from BudgetBook.config_watcher import ConfigWatcher
+from BudgetBook.regular_event import RegularEvent
+from BudgetBook.regular_transaction import RegularTransaction
+from BudgetBook.statement_loader import StatementLoader
+from BudgetBook.transaction_interval import TransactionInterval
+
+def get_category_mapping(rent):
+    return {rent: {"description": ["miete"]}, "Groceries": {"payment_party": ["lidl"]}}
+
+
+CSV_HEADER = "Buchungstag;Name;Buchungstext;Verwendungszweck;Betrag\n"
+MAY_CSV = CSV_HEADER + "01.05.2022;Landlord;Dauerauftrag;Miete Mai;-500,00\n02.05.2022;Lidl;Lastschrift;Einkauf;-20,00\n"
+JUNE_CSV = CSV_HEADER + "02.05.2022;Lidl;Lastschrift;Einkauf;-20,00\n01.06.2022;Landlord;Dauerauftrag;Miete Juni;-500,00\n"
+
+
+def test_categories_follow_the_reloaded_mapping(write_config, make_config):
+    config = make_config(get_category_mapping("Rent"))
+    session = AnalysisSession(config)
+    session.load_statements(StatementLoader(config), [MAY_CSV.encode()])
+
+    assert session.get_transaction_store().get_dataframe()[DataColumns.CATEGORY].tolist() == ["Rent", "Groceries"]
+
+    write_config(get_category_mapping("Wohnen"))
+    assert Config().reload()
+
+    categories = session.get_transaction_store().get_dataframe()[DataColumns.CATEGORY]
+    assert categories.tolist() == ["Wohnen", "Groceries"]
+    assert isinstance(categories.dtype, pd.CategoricalDtype)
+    assert session.get_category_mapping() is Config().get_category_mapping()
+
+
+def test_uploads_are_appended_to_the_session(make_config):
+    config = make_config(get_category_mapping("Rent"))
+    session = AnalysisSession(config)
+
+    assert session.load_statements(StatementLoader(config), [MAY_CSV.encode()]) == 2
+    assert session.load_statements(StatementLoader(config), [JUNE_CSV.encode()]) == 1
+
+    dataframe = session.get_transaction_store().get_dataframe()
+    assert dataframe[DataColumns.DESCRIPTION].tolist() == ["Miete Mai", "Einkauf", "Miete Juni"]
+    assert dataframe[DataColumns.CATEGORY].tolist() == ["Rent", "Groceries", "Rent"]
+
+
+def test_watcher_recategorizes_the_session(write_config):
+    config_path = write_config(get_category_mapping("Rent"))
+    os.utime(config_path, (1000, 1000))
+    config = Config(str(config_path))
+    session = AnalysisSession(config)
+    session.load_statements(StatementLoader(config), [MAY_CSV.encode()])
+    store = session.get_transaction_store()
+
+    watcher = ConfigWatcher(config)
+    watcher.add_callback(lambda _: session.update_categories())
+    write_config(get_category_mapping("Wohnen"))
+    os.utime(config_path, (2000, 2000))
+    assert watcher.check_for_changes()
+
+    # Already up to date before the next callback asks for the transactions
+    assert session.get_category_mapping() is Config().get_category_mapping()
+    assert not session.update_categories()
+    assert session.get_transaction_store() is not store
+    assert session.get_transaction_store().get_dataframe()[DataColumns.CATEGORY].tolist() == ["Wohnen", "Groceries"]
+
+
+def test_visualizer_keeps_its_occurences_between_uploads(make_config):
+    config = make_config(get_category_mapping("Rent"))
+    salary = RegularTransaction(
+        "Corporation",
+        RegularEvent(datetime.date(2022, 1, 1), TransactionInterval.monthly()),
+        3000.0,
+        "Salary",
+        "Salary",
+    )
+    session = AnalysisSession(config, [salary])
+
+    with session.use_transaction_visualizer() as visualizer:
+        visualizer.set_analysis_interval(datetime.date(2022, 1, 1), datetime.date(2023, 1, 1))
+        assert len(visualizer.get_dataframe()) == 12
+        occurence_cache = visualizer._occurence_cache
+
+    session.load_statements(StatementLoader(config), [MAY_CSV.encode()])
+    with session.use_transaction_visualizer() as same_visualizer:
+        assert same_visualizer is visualizer
+        assert len(occurence_cache) == 1
+        same_visualizer.set_analysis_interval(datetime.date(2022, 5, 1), datetime.date(2022, 6, 1))
+        assert sorted(same_visualizer.get_dataframe()[DataColumns.DESCRIPTION]) == ["Einkauf", "Miete Mai", "Salary"]
@@ -0,0 +1,66 @@
+from datetime import date
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC_DIR)
+
+from BudgetBook.batch_pipeline import (
+    NUM_TRANSACTIONS_COLUMN,
+    StageTimer,
+    find_statement_files,
+    get_monthly_category_aggregates,
+    write_dataframe,
+)
+from BudgetBook.config_parser import DataColumns
+from BudgetBook.dated_transaction import DatedTransaction
+from BudgetBook.transaction_store import TransactionStore
+
+
+def test_find_statement_files(tmp_path):
+    (tmp_path / "b.csv").write_text("")
+    (tmp_path / "a.CSV").write_text("")
+    (tmp_path / "notes.txt").write_text("")
+    single = tmp_path / "single.txt"
+    single.write_text("")
+
+    files = find_statement_files([str(tmp_path / "a.CSV"), str(tmp_path)])
+
+    assert [os.path.basename(f) for f in files] == ["a.CSV", "a.CSV", "b.csv"]
+    with pytest.raises(FileNotFoundError):
+        find_statement_files([str(tmp_path / "missing.csv")])
+
+
+def test_monthly_category_aggregates(tmp_path):
+    store = TransactionStore.from_transactions(
+        [
+            DatedTransaction("A", date(2022, 5, 1), 100.0, "", "Salary"),
+            DatedTransaction("B", date(2022, 5, 15), -20.0, "", "Groceries"),
+            DatedTransaction("C", date(2022, 5, 31), -5.0, "", "Groceries"),
+            DatedTransaction("C", date(2022, 6, 1), -5.0, "", "Groceries"),
+        ]
+    )
+
+    aggregates = get_monthly_category_aggregates(store.get_dataframe())
+
+    assert aggregates[DataColumns.CATEGORY].tolist() == ["Groceries", "Salary", "Groceries"]
+    assert aggregates[DataColumns.AMOUNT].tolist() == [-25.0, 100.0, -5.0]
+    assert aggregates[NUM_TRANSACTIONS_COLUMN].tolist() == [2, 1, 1]
+
+    path = str(tmp_path / "aggregates.csv")
+    write_dataframe(aggregates, path)
+    assert len(pd.read_csv(path)) == 3
+    with pytest.raises(ValueError):
+        write_dataframe(aggregates, str(tmp_path / "aggregates.xlsx"))
+
+
+def test_stage_timer():
+    times = iter([0.0, 2.0])
+    timer = StageTimer(clock=lambda: next(times))
+
+    assert timer.run("parse", lambda x: [x] * 10, 1, num_rows=len) == [1] * 10
+    assert timer.get_stages() == [("parse", 2.0, 10)]
+    assert "5" in timer.get_summary().splitlines()[1]
@@ -0,0 +1,100 @@
+from datetime import date
+import os
+import sys
+
+import pytest
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC_DIR)
+
+from BudgetBook.category_cube import CategoryCube, CategoryLevel, TransactionFlow
+from BudgetBook.config_parser import DataColumns
+from BudgetBook.dated_transaction import DatedTransaction
+from BudgetBook.rule_program import CategoryRuleProgram, InvalidCateogryMappingException
+from BudgetBook.transaction_store import TransactionStore
+from BudgetBook.transaction_visualizer import TransactionVisualizer
+
+CATEGORY_MAPPING = {
+    "Groceries": {"parent": "Living", "payment_party": ["lidl"]},
+    "Rent": {"parent": "Living", "description": ["miete"]},
+    "Savings": {"payment_party": ["my savings"]},
+}
+
+
+@pytest.fixture
+def visualizer(make_config):
+    visualizer = TransactionVisualizer(make_config(CATEGORY_MAPPING, internal_transfer_categories=["Savings"]))
+    visualizer.set_transactions(
+        TransactionStore.from_transactions(
+            [
+                DatedTransaction("Lidl", date(2022, 5, 1), -20.0, "", "Groceries"),
+                DatedTransaction("Landlord", date(2022, 5, 2), -500.0, "Miete", "Rent"),
+                DatedTransaction("Lidl", date(2022, 6, 3), -30.0, "", "Groceries"),
+                DatedTransaction("Lidl", date(2022, 6, 4), 5.0, "Refund", "Groceries"),
+                DatedTransaction("My Savings", date(2022, 6, 5), -100.0, "", "Savings"),
+                DatedTransaction("Employer", date(2022, 6, 28), 3000.0, "", "Unknown Income"),
+            ]
+        )
+    )
+    visualizer.set_analysis_interval(date(2022, 5, 1), date(2022, 7, 1))
+    return visualizer
+
+
+def test_parent_is_not_a_matching_rule():
+    program = CategoryRuleProgram({"Groceries": {"parent": "Living", "payment_party": ["lidl"]}})
+    assert program.get_first_match({DataColumns.PAYMENT_PARTY: "lidl"}) == "Groceries"
+
+    with pytest.raises(InvalidCateogryMappingException):
+        CategoryRuleProgram({"Groceries": {"parent": ["Living"], "payment_party": ["lidl"]}})
+
+
+def test_parent_totals_are_sums_of_their_children(visualizer):
+    cube = visualizer.get_category_cube()
+
+    per_category = cube.get_per_month(CategoryLevel.CATEGORY, [TransactionFlow.PAYMENT])
+    per_parent = cube.get_per_month(CategoryLevel.PARENT, [TransactionFlow.PAYMENT])
+
+    assert per_category[DataColumns.CATEGORY].astype(str).tolist() == ["Groceries", "Rent", "Groceries"]
+    assert per_parent[DataColumns.CATEGORY].tolist() == ["Living", "Living"]
+    assert per_parent[DataColumns.AMOUNT].tolist() == [-520.0, -30.0]
+    assert per_parent[CategoryCube.COUNT].tolist() == [2, 1]
+    assert cube.get_children("Living") == ["Groceries", "Rent"]
+    # Categories without a parent are their own parent
+    assert cube.get_categories(CategoryLevel.PARENT) == ["Living", "Savings", "Unknown Income"]
+
+
+def test_flows(visualizer):
+    cube = visualizer.get_category_cube()
+
+    assert cube.get_total_per_category(
+        CategoryLevel.PARENT, [TransactionFlow.INTERNAL_PAYMENT]
+    ).to_dict() == {"Savings": -100.0}
+    assert cube.get_total_per_month(CategoryLevel.PARENT, [TransactionFlow.INCOME]).tolist() == [3005.0]
+
+
+def test_plots_switch_levels(visualizer):
+    categories = [t.name for t in visualizer.plot_transactions_per_month().data]
+    visualizer.set_category_level(CategoryLevel.PARENT)
+    parents = [t.name for t in visualizer.plot_transactions_per_month().data]
+    pie = visualizer.plot_pie_chart_per_cateogry().data[0]
+
+    assert categories == ["Groceries", "Rent", "Savings", "Unknown Income"]
+    assert parents == ["Living", "Savings", "Unknown Income"]
+    assert list(pie.labels) == ["Living", "Savings"]
+    assert list(pie.values) == [550.0, 100.0]
+    assert [t.name for t in visualizer.plot_payments_per_month().data][1:] == ["Living"]
+
+
+def test_plots_do_not_compile_the_rules(make_config):
+    category_mapping = {**CATEGORY_MAPPING, "Savings": {"unknown_field": ["my savings"]}}
+    visualizer = TransactionVisualizer(make_config(category_mapping, internal_transfer_categories=["Savings"]))
+    visualizer.set_transactions(
+        TransactionStore.from_transactions(
+            [DatedTransaction("Lidl", date(2022, 5, 1), -20.0, "", "Groceries")]
+        )
+    )
+    visualizer.set_analysis_interval(date(2022, 5, 1), date(2022, 7, 1))
+    visualizer.set_category_level(CategoryLevel.PARENT)
+
+    assert visualizer.get_category_cube().get_categories(CategoryLevel.PARENT) == ["Living"]
+    visualizer.plot_transactions_per_month()
@@ -0,0 +1,199 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC_DIR)
+
+from BudgetBook.category_parser import CategoryParser
+from BudgetBook.config_parser import Config, ConfigKeywords, DataColumns
+
+CATEGORY_MAPPING = {
+    "Salary": {"and": {"description": ["lohn"], "type_of_transfer": ["gutschrift"]}},
+    "Mobility": {"or": {"description": ["tanken"], "payment_party": ["shell", "aral"]}},
+    "Groceries": {"payment_party": ["lidl", "EDEKA"], "description": ["einkauf"]},
+    "Savings": {"payment_party": ["my savings"]},
+}
+
+
+@pytest.fixture
+def config(make_config):
+    return make_config(CATEGORY_MAPPING, internal_transfer_categories=["Savings"])
+
+
+@pytest.fixture
+def records():
+    return pd.DataFrame.from_records(
+        [
+            ("Employer", 3000.0, "Gutschrift", "Lohn 05/2022"),
+            ("Employer", 3000.0, "Lastschrift", "Lohn 05/2022"),
+            ("SHELL Station", -60.0, "Kartenzahlung", "Danke"),
+            ("Lidl Filiale", -20.0, "Kartenzahlung", "Einkauf Shell"),
+            ("Edeka Markt", -15.0, "Kartenzahlung", ""),
+            ("Someone", 10.0, "Gutschrift", "Einkauf"),
+            ("My Savings", -100.0, "Dauerauftrag", ""),
+            ("Someone", 10.0, "Gutschrift", "Geschenk"),
+            ("Someone", -10.0, "Lastschrift", "Geschenk"),
+        ],
+        columns=[
+            DataColumns.PAYMENT_PARTY,
+            DataColumns.AMOUNT,
+            DataColumns.TYPE_OF_TRANSFER,
+            DataColumns.DESCRIPTION,
+        ],
+    )
+
+
+def test_get_category_for_record(config, records):
+    parser = CategoryParser(config)
+
+    categories = [parser.get_category_for_record(r) for _, r in records.iterrows()]
+
+    assert categories == [
+        "Salary",
+        ConfigKeywords.CATEGORY_DEFAULT_UNKNOWN_INCOME,
+        "Mobility",
+        "Groceries",
+        "Groceries",
+        "Groceries",
+        "Savings",
+        ConfigKeywords.CATEGORY_DEFAULT_UNKNOWN_INCOME,
+        ConfigKeywords.CATEGORY_DEFAULT_UNKNOWN_PAYMENT,
+    ]
+
+
+def test_categorize_frame_matches_record_path(config, records):
+    parser = CategoryParser(config)
+
+    expected = [parser.get_category_for_record(r) for _, r in records.iterrows()]
+    categories = parser.categorize_frame(records)
+
+    assert categories.tolist() == expected
+    assert categories.index.equals(records.index)
+
+
+def test_padded_keywords_keep_their_spaces(make_config):
+    parser = CategoryParser(
+        make_config({"Jet": {"payment_party": [" jet "]}, "Spaced": {"description": [" "]}})
+    )
+    records = pd.DataFrame(
+        {
+            DataColumns.PAYMENT_PARTY: ["Jetzt Bank", "Tank  Jet  GmbH", "Jetzt Bank"],
+            DataColumns.AMOUNT: [-10.0, -10.0, -10.0],
+            DataColumns.TYPE_OF_TRANSFER: ["", "", ""],
+            DataColumns.DESCRIPTION: ["Einkauf", "", "Einkauf Juni"],
+        }
+    )
+
+    expected = [ConfigKeywords.CATEGORY_DEFAULT_UNKNOWN_PAYMENT, "Jet", "Spaced"]
+    assert parser.categorize_frame(records).tolist() == expected
+    assert [parser.get_category_for_record(r) for _, r in records.iterrows()] == expected
+
+
+def test_categorize_frame_keeps_existing_categories(config, records):
+    parser = CategoryParser(config)
+    records[DataColumns.CATEGORY] = "Fixed"
+
+    assert (parser.categorize_frame(records) == "Fixed").all()
+
+
+def test_category_cache_counts_hits_and_misses(config, records):
+    parser = CategoryParser(config)
+
+    for _ in range(3):
+        for _, record in records.iterrows():
+            parser.get_category_for_record(record)
+
+    cache_info = parser.get_cache_info()
+    assert cache_info.misses == len(records)
+    assert cache_info.hits == 2 * len(records)
+    assert cache_info.currsize == len(records)
+
+
+def test_category_cache_is_bounded(config, records):
+    parser = CategoryParser(config, cache_size=2)
+
+    for _, record in records.iterrows():
+        parser.get_category_for_record(record)
+
+    assert parser.get_cache_info().currsize == 2
+
+
+def test_category_cache_invalidated_on_mapping_change(config, records):
+    parser = CategoryParser(config)
+    record = records.iloc[0]
+    assert parser.get_category_for_record(record) == "Salary"
+
+    Config().set_category_mapping({"Income": {"payment_party": ["employer"]}})
+
+    assert parser.get_category_for_record(record) == "Income"
+    assert parser.get_cache_info().currsize == 1
+
+
+def test_category_match_report(config, records):
+    parser = CategoryParser(config)
+    records.loc[len(records)] = ("Aral", -50.0, "Kartenzahlung", "Einkauf")
+
+    report = parser.get_category_match_report(records)
+
+    matrix = report.get_match_matrix()
+    assert matrix.shape == (len(records), 4)
+    assert matrix.loc[9, "Mobility"] and matrix.loc[9, "Groceries"]
+
+    assert report.get_conflicting_rows().index.tolist() == [9]
+    assert report.get_unmatched_rows().tolist() == [1, 7, 8]
+    assert report.get_unused_categories() == []
+    assert report.get_hits_per_category().to_dict() == {
+        "Salary": 1,
+        "Mobility": 2,
+        "Groceries": 4,
+        "Savings": 1,
+    }
+    assert report.get_assigned_per_category()["Groceries"] == 3
+    assert report.get_overlap_counts().loc["Mobility", "Groceries"] == 1
+    assert report.get_hits_per_keyword()[("description", "contains", "lohn")] == 2
+    assert report.get_unused_keywords() == [("description", "contains", "tanken")]
+
+
+def test_recategorize_frame_matches_full_categorization(config, records):
+    parser = CategoryParser(config)
+    previous_mapping = config.get_category_mapping()
+    categories = parser.categorize_frame(records)
+
+    category_mapping = dict(previous_mapping)
+    category_mapping["Gifts"] = {"description": ["geschenk"]}
+    category_mapping["Groceries"] = {"payment_party": ["lidl"]}
+    config.set_category_mapping(category_mapping)
+
+    updated_categories = parser.recategorize_frame(
+        records, categories, previous_mapping
+    )
+
+    assert updated_categories.tolist() == parser.categorize_frame(records).tolist()
+    assert updated_categories.iloc[7] == "Gifts"
+    assert updated_categories.iloc[4] == ConfigKeywords.CATEGORY_DEFAULT_UNKNOWN_PAYMENT
+
+
+def test_reordered_mapping_is_reloaded(write_config, make_config):
+    fuel = {"payment_party": ["shell"]}
+    groceries = {"description": ["einkauf"]}
+    config = make_config({"Fuel": fuel, "Groceries": groceries})
+    parser = CategoryParser(config)
+    records = pd.DataFrame(
+        {
+            DataColumns.PAYMENT_PARTY: ["Shell Station", "Shell Station"],
+            DataColumns.AMOUNT: [-10.0, -10.0],
+            DataColumns.TYPE_OF_TRANSFER: ["", ""],
+            DataColumns.DESCRIPTION: ["Einkauf", "Tanken"],
+        }
+    )
+    previous_mapping = parser.get_category_mapping()
+    categories = parser.categorize_frame(records)
+    assert categories.tolist() == ["Fuel", "Fuel"]
+
+    write_config({"Groceries": groceries, "Fuel": fuel})
+    assert config.reload()
+
+    assert parser.recategorize_frame(records, categories, previous_mapping).tolist() == ["Groceries", "Fuel"]
@@ -0,0 +1,52 @@
+import os
+import sys
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC_DIR)
+
+from BudgetBook.config_parser import Config
+from BudgetBook.config_watcher import ConfigWatcher
+
+def write_salary_config(write_config, keyword, mtime):
+    config_path = write_config({"Salary": {"description": [keyword]}})
+    os.utime(config_path, (mtime, mtime))
+    return config_path
+
+
+def test_watcher_reloads_changed_mapping(write_config):
+    config = Config(str(write_salary_config(write_config, "lohn", mtime=1000)))
+
+    watcher = ConfigWatcher(config)
+    reloaded_configs = []
+    watcher.add_callback(reloaded_configs.append)
+
+    assert not watcher.check_for_changes()
+
+    write_salary_config(write_config, "gehalt", mtime=2000)
+    assert watcher.check_for_changes()
+    assert Config().get_category_mapping()["Salary"]["description"] == ["gehalt"]
+    assert reloaded_configs == [config]
+
+    # Touching the file without changing the mapping does not notify anyone
+    write_salary_config(write_config, "gehalt", mtime=3000)
+    assert not watcher.check_for_changes()
+    assert len(reloaded_configs) == 1
+
+
+def test_watcher_reloads_reordered_mapping(write_config):
+    salary = {"description": ["lohn"]}
+    bonus = {"description": ["lohn bonus"]}
+    config_path = write_config({"Salary": salary, "Bonus": bonus})
+    os.utime(config_path, (1000, 1000))
+    config = Config(str(config_path))
+
+    watcher = ConfigWatcher(config)
+    reloaded_configs = []
+    watcher.add_callback(reloaded_configs.append)
+
+    # Only the order changed, which decides the first matching category
+    write_config({"Bonus": bonus, "Salary": salary})
+    os.utime(config_path, (2000, 2000))
+    assert watcher.check_for_changes()
+    assert list(Config().get_category_mapping()) == ["Bonus", "Salary"]
+    assert reloaded_configs == [config]
@@ -0,0 +1,73 @@
+from datetime import date
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC_DIR)
+
+from BudgetBook import date_parsing
+from BudgetBook.date_parsing import DateParser, to_date_objects
+
+
+def test_parse_matches_to_datetime():
+    dates = pd.Series(["01.05.2022", "31.12.2021", "01.05.2022"], index=[3, 4, 5])
+    parser = DateParser("%d.%m.%Y")
+
+    parsed = parser.parse(dates)
+
+    pd.testing.assert_series_equal(parsed, pd.to_datetime(dates, format="%d.%m.%Y"))
+    assert len(parser) == 2
+
+
+def test_parser_keeps_dates_between_calls():
+    parser = DateParser("%d.%m.%Y")
+    parser.parse(pd.Series(["01.05.2022", "02.05.2022"]))
+    parser.parse(pd.Series(["02.05.2022", "03.05.2022"]))
+
+    assert len(parser) == 3
+
+
+def test_invalid_date_raises():
+    with pytest.raises(ValueError):
+        DateParser("%d.%m.%Y").parse(pd.Series(["2022-05-01"]))
+
+
+def test_to_date_objects():
+    dates = pd.Series(pd.to_datetime(["2022-05-01", "2022-05-02", "2022-05-01"]))
+
+    assert to_date_objects(dates).tolist() == [
+        date(2022, 5, 1),
+        date(2022, 5, 2),
+        date(2022, 5, 1),
+    ]
+
+
+def test_parser_clears_the_cache_without_losing_dates(monkeypatch):
+    monkeypatch.setattr(date_parsing, "MAX_CACHED_DATES", 3)
+    parser = DateParser("%d.%m.%Y")
+    parser.parse(pd.Series(["01.05.2022", "02.05.2022"]))
+
+    dates = pd.Series(["01.05.2022", "03.05.2022", "04.05.2022"])
+    parsed = parser.parse(dates)
+
+    pd.testing.assert_series_equal(parsed, pd.to_datetime(dates, format="%d.%m.%Y"))
+    assert len(parser) == 3
+
+
+class ClearedByOtherThread(dict):
+    """Cache that another thread clears right after every update."""
+
+    def update(self, *args):
+        super().update(*args)
+        self.clear()
+
+
+def test_parser_does_not_depend_on_the_shared_cache():
+    parser = DateParser("%d.%m.%Y")
+    parser._parsed_dates = ClearedByOtherThread()
+    dates = pd.Series(["01.05.2022", "02.05.2022", "01.05.2022"])
+
+    pd.testing.assert_series_equal(parser.parse(dates), pd.to_datetime(dates, format="%d.%m.%Y"))
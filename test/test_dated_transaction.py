@@ -2,6 +2,8 @@ from datetime import date
 import os
 import sys
 
+import pytest
+
 SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
 sys.path.append(SRC_DIR)
 
@@ -23,4 +25,14 @@ def test_creation():
     assert dct[DataColumns.DATE] == date(2022, 5, 23)
     assert dct[DataColumns.AMOUNT] == 100.0
     assert dct[DataColumns.DESCRIPTION] == "My Description"
-    assert dct[DataColumns.CATEGORY] == "My Category"
\ No newline at end of file
+    assert dct[DataColumns.CATEGORY] == "My Category"
+
+def test_transactions_are_immutable_value_types():
+    d = DatedTransaction("PaymentParty", date(2022, 5, 23), 100.0, "My Description", "My Category")
+
+    assert d == DatedTransaction("PaymentParty", date(2022, 5, 23), 100.0, "My Description", "My Category")
+    assert d != DatedTransaction("PaymentParty", date(2022, 5, 24), 100.0, "My Description", "My Category")
+    assert len({d, DatedTransaction("PaymentParty", date(2022, 5, 23), 100.0, "My Description", "My Category")}) == 1
+    assert not hasattr(d, "__dict__")
+    with pytest.raises(AttributeError):
+        d.amount = 50.0
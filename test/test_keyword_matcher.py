@@ -0,0 +1,37 @@
+import os
+import sys
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC_DIR)
+
+from BudgetBook.keyword_matcher import KeywordMatcher
+
+
+def test_find_all_overlapping_keywords():
+    matcher = KeywordMatcher(["tank", "tankstelle", "stelle", "Shell", "aral"])
+
+    found = matcher.find_all("SHELL Tankstelle Ulm")
+
+    assert {matcher.get_keywords()[i] for i in found} == {
+        "tank",
+        "tankstelle",
+        "stelle",
+        "shell",
+    }
+
+
+def test_find_all_matches_substring_semantics():
+    keywords = ["he", "she", "his", "hers", "rs", "x"]
+    matcher = KeywordMatcher(keywords)
+
+    for text in ["ushers", "hishe", "", "XX", "h e r s"]:
+        expected = {matcher.get_keyword_id(k) for k in keywords if k in text.lower()}
+        assert matcher.find_all(text) == expected
+
+
+def test_duplicate_and_empty_keywords():
+    matcher = KeywordMatcher(["Lidl", "lidl", ""])
+
+    assert len(matcher) == 2
+    assert matcher.get_keyword_id("LIDL") == matcher.get_keyword_id("lidl")
+    assert matcher.find_all("anything") == {matcher.get_keyword_id("")}
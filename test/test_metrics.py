@@ -0,0 +1,53 @@
+import os
+import sys
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC_DIR)
+
+from BudgetBook.metrics import Histogram, Metrics
+
+
+def test_histogram_counts_are_cumulative():
+    histogram = Histogram(buckets=[0.1, 1.0])
+    for value in [0.05, 0.1, 0.5, 5.0]:
+        histogram.observe(value)
+
+    assert histogram.get_cumulative_counts() == {0.1: 2, 1.0: 3, float("inf"): 4}
+    assert histogram.get_count() == 4
+    assert histogram.get_sum() == 5.65
+
+
+def test_disabled_metrics_record_nothing():
+    metrics = Metrics()
+    with metrics.measure("parse_csv") as measurement:
+        measurement.add_rows(10)
+
+    assert metrics.get_histogram("parse_csv") is None
+    assert metrics.get_rows("parse_csv") == 0
+
+
+def test_prometheus_text():
+    metrics = Metrics(buckets=[1.0])
+    metrics.set_enabled(True)
+    with metrics.measure("parse_csv") as measurement:
+        measurement.add_rows(10)
+    metrics.observe("parse_csv", 2.0, 5)
+
+    lines = metrics.to_prometheus_text().splitlines()
+
+    assert "# TYPE budgetbook_stage_duration_seconds histogram" in lines
+    assert 'budgetbook_stage_duration_seconds_bucket{stage="parse_csv",le="1.0"} 1' in lines
+    assert 'budgetbook_stage_duration_seconds_bucket{stage="parse_csv",le="+Inf"} 2' in lines
+    assert 'budgetbook_stage_duration_seconds_count{stage="parse_csv"} 2' in lines
+    assert 'budgetbook_stage_rows_total{stage="parse_csv"} 15' in lines
+
+
+def test_recorded_observations():
+    metrics = Metrics()
+    metrics.set_enabled(True)
+    metrics.observe("parse_csv", 1.0, 5)
+    with metrics.record_observations() as observations:
+        metrics.observe("categorize", 2.0, 10)
+
+    metrics.observe("categorize", 3.0, 10)
+    assert observations == [("categorize", 2.0, 10)]
@@ -0,0 +1,90 @@
+import os
+import sys
+from datetime import date
+
+import numpy as np
+import pytest
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC_DIR)
+
+from BudgetBook.occurence_cache import OccurenceCache
+from BudgetBook.regular_event import RegularEvent
+from BudgetBook.transaction_interval import TransactionInterval
+
+
+class CountingEvent(RegularEvent):
+    def __init__(self, *args) -> None:
+        super().__init__(*args)
+        self.expanded_windows = []
+
+    def get_occurences(self, from_date, up_to):
+        self.expanded_windows.append((from_date, up_to))
+        return super().get_occurences(from_date, up_to)
+
+
+def test_only_newly_covered_dates_are_expanded():
+    event = CountingEvent(date(2020, 1, 31), TransactionInterval.monthly())
+    cache = OccurenceCache()
+
+    windows = [
+        (date(2021, 1, 1), date(2022, 1, 1)),
+        (date(2021, 1, 1), date(2022, 2, 1)),
+        (date(2020, 11, 15), date(2022, 2, 1)),
+        (date(2021, 3, 1), date(2021, 6, 29)),
+        (date(2025, 1, 1), date(2026, 1, 1)),
+    ]
+    for from_date, up_to in windows:
+        occurences = cache.get_occurences(event, from_date, up_to)
+        np.testing.assert_array_equal(
+            occurences, RegularEvent.get_occurences(event, from_date, up_to)
+        )
+
+    # Widening the end only adds the interval to the last cached occurence
+    assert event.expanded_windows == [
+        (date(2021, 1, 1), date(2022, 1, 1)),
+        (date(2020, 11, 15), date(2021, 1, 1)),
+        (date(2025, 1, 1), date(2026, 1, 1)),
+    ]
+
+
+def test_wide_extensions_use_the_closed_form():
+    event = CountingEvent(date(1995, 1, 1), TransactionInterval(days=1))
+    cache = OccurenceCache()
+
+    cache.get_occurences(event, date(1995, 1, 1), date(1995, 2, 1))
+    occurences = cache.get_occurences(event, date(1995, 1, 1), date(2025, 1, 1))
+
+    np.testing.assert_array_equal(
+        occurences, RegularEvent.get_occurences(event, date(1995, 1, 1), date(2025, 1, 1))
+    )
+    assert event.expanded_windows[-1] == (date(1995, 2, 1), date(2025, 1, 1))
+
+
+@pytest.mark.parametrize(
+    "event",
+    [
+        RegularEvent(date(2020, 1, 31), TransactionInterval.monthly(), date(2021, 3, 28)),
+        RegularEvent(date(2020, 2, 29), TransactionInterval.yearly()),
+        RegularEvent(date(2020, 3, 3), TransactionInterval(days=10)),
+        RegularEvent(date(2020, 5, 1), None),
+    ],
+)
+def test_moving_window_matches_expanding_from_scratch(event):
+    cache = OccurenceCache()
+    for months in range(30):
+        up_to = date(2020 + (months + 2) // 12, (months + 2) % 12 + 1, 1)
+        np.testing.assert_array_equal(
+            cache.get_occurences(event, date(2020, 1, 1), up_to),
+            event.get_occurences(date(2020, 1, 1), up_to),
+        )
+
+
+def test_equal_events_share_their_occurences():
+    cache = OccurenceCache()
+    for _ in range(3):
+        cache.get_occurences(
+            RegularEvent(date(2020, 1, 1), TransactionInterval(days=7)), date(2020, 1, 1), date(2021, 1, 1)
+        )
+
+    assert len(cache) == 1
@@ -5,6 +5,7 @@ from dateutil.relativedelta import relativedelta
 import os
 import sys
 
+import numpy as np
 import pytest
 
 SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
@@ -58,3 +59,50 @@ def test_regular_event_monthly():
     num_events = sum([1 for i in event.iterate(from_date=date(2022,1,1), up_to=date(2023,1,1))])
 
     assert num_events == 12
+
+
+def iterate_by_adding_intervals(event, from_date, up_to):
+    current = event.get_first_occurence()
+    while current < up_to:
+        if current >= from_date and (
+            event.get_last_occurence() is None or current <= event.get_last_occurence()
+        ):
+            yield current
+        current = current + event.get_interval_size()
+
+
+@pytest.mark.parametrize(
+    "interval",
+    [
+        TransactionInterval(days=1),
+        TransactionInterval(days=22),
+        TransactionInterval.monthly(),
+        TransactionInterval.quaterly(),
+        TransactionInterval.yearly(),
+        TransactionInterval(years=1, months=1),
+        TransactionInterval(months=1, days=3),
+    ],
+)
+@pytest.mark.parametrize("first_occurence", [date(2020, 1, 31), date(2020, 2, 29), date(2021, 3, 30), date(2021, 8, 15)])
+def test_occurences_match_adding_intervals(interval, first_occurence):
+    for from_date, up_to, last_occurence in [
+        (date(2019, 1, 1), date(2026, 1, 1), None),
+        (date(2023, 3, 28), date(2024, 3, 1), None),
+        (date(2020, 2, 1), date(2030, 1, 1), date(2022, 3, 28)),
+        (date(2025, 1, 1), date(2024, 1, 1), None),
+    ]:
+        event = RegularEvent(first_occurence, interval, last_occurence)
+
+        assert list(event.iterate(from_date, up_to)) == list(
+            iterate_by_adding_intervals(event, from_date, up_to)
+        )
+
+
+def test_occurences_are_datetime64_and_include_the_last_occurence():
+    event = RegularEvent(date(2022, 1, 31), TransactionInterval.monthly(), date(2022, 4, 28))
+
+    occurences = event.get_occurences(date(2022, 1, 1), date(2023, 1, 1))
+
+    assert occurences.dtype == np.dtype("datetime64[D]")
+    assert occurences.tolist() == [date(2022, 1, 31), date(2022, 2, 28), date(2022, 3, 28), date(2022, 4, 28)]
+    assert RegularEvent(date(2022, 1, 1), None).get_occurences(date(2022, 1, 2), date(2023, 1, 1)).size == 0
@@ -72,3 +72,16 @@ def test_regular_transaction_iteration():
 
     amount_sum = 100.0 + sum([t.amount for t in itr])
     assert amount_sum == 1200.0
+
+
+def test_regular_transactions_can_be_used_as_keys():
+    def build():
+        frequency = RegularEvent(date(2022, 1, 31), TransactionInterval.monthly(), date(2023, 1, 1))
+        return RegularTransaction("Payment Party", frequency, 100.0, "My Desc", "My Category")
+
+    cache = {build(): "cached"}
+
+    assert cache[build()] == "cached"
+    assert build().get_frequency() == build().get_frequency()
+    assert RegularEvent(date(2022, 1, 31), TransactionInterval.yearly()) != build().get_frequency()
+    assert not hasattr(build(), "__dict__")
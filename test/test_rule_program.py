@@ -0,0 +1,98 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC_DIR)
+
+from BudgetBook import rule_program
+from BudgetBook.config_parser import DataColumns
+from BudgetBook.rule_program import (
+    CategoryRuleProgram,
+    InvalidCateogryMappingException,
+)
+
+CATEGORY_MAPPING = {
+    "Salary": {"regex": {"description": [r"gehalt \d{2}/\d{4}"]}},
+    "Fuel": {
+        "and": {
+            "word": {"payment_party": ["aral"]},
+            "type_of_transfer": ["karte"],
+        }
+    },
+    "Groceries": {"payment_party": ["lidl"]},
+}
+
+
+def categorize(program, payment_party, type_of_transfer, description):
+    return program.get_first_match(
+        {
+            DataColumns.PAYMENT_PARTY: payment_party,
+            DataColumns.TYPE_OF_TRANSFER: type_of_transfer,
+            DataColumns.DESCRIPTION: description,
+        }
+    )
+
+
+def test_regex_and_word_rules():
+    program = CategoryRuleProgram(CATEGORY_MAPPING)
+
+    assert categorize(program, "employer", "gutschrift", "gehalt 05/2022") == "Salary"
+    assert categorize(program, "employer", "gutschrift", "gehalt mai") is None
+    assert categorize(program, "aral station", "kartenzahlung", "") == "Fuel"
+    assert categorize(program, "caral gmbh", "kartenzahlung", "") is None
+    assert categorize(program, "lidl", "kartenzahlung", "") == "Groceries"
+
+
+def test_frame_matches_record_path():
+    program = CategoryRuleProgram(CATEGORY_MAPPING)
+    df = pd.DataFrame(
+        {
+            DataColumns.PAYMENT_PARTY: ["Employer", "ARAL Station", "Caral GmbH", "Lidl"],
+            DataColumns.TYPE_OF_TRANSFER: ["Gutschrift", "Karte", "Karte", "Karte"],
+            DataColumns.DESCRIPTION: ["Gehalt 05/2022", "", "", ""],
+        }
+    )
+
+    matches = program.match_frame(df).get_match_matrix()
+
+    assert matches.tolist() == [
+        [True, False, False],
+        [False, True, False],
+        [False, False, False],
+        [False, False, True],
+    ]
+
+
+def test_invalid_rules():
+    with pytest.raises(InvalidCateogryMappingException):
+        CategoryRuleProgram({"Salary": {"regex": {"description": ["gehalt ("]}}})
+    with pytest.raises(InvalidCateogryMappingException):
+        CategoryRuleProgram({"Salary": {"word": ["gehalt"]}})
+    with pytest.raises(InvalidCateogryMappingException):
+        CategoryRuleProgram({"Salary": {"or": {"comment": ["gehalt"]}}})
+    with pytest.raises(InvalidCateogryMappingException):
+        CategoryRuleProgram({"Everything": {"description": [""]}})
+    with pytest.raises(InvalidCateogryMappingException):
+        CategoryRuleProgram({"Everything": {"word": {"description": [""]}}})
+
+
+def test_programs_are_shared_and_persisted(tmp_path):
+    yaml_file_path = str(tmp_path / "config.yaml")
+
+    program = CategoryRuleProgram.for_mapping(CATEGORY_MAPPING, yaml_file_path)
+    assert CategoryRuleProgram.for_mapping(dict(CATEGORY_MAPPING), yaml_file_path) is program
+    assert os.path.exists(tmp_path / "config.rules.cache")
+
+    rule_program._programs_in_memory.clear()
+    loaded_program = CategoryRuleProgram.for_mapping(CATEGORY_MAPPING, yaml_file_path)
+    assert loaded_program is not program
+    assert loaded_program.get_categories() == program.get_categories()
+    assert categorize(loaded_program, "employer", "", "gehalt 05/2022") == "Salary"
+
+    # A changed mapping must not be served from the stale file
+    changed_mapping = {"Groceries": {"payment_party": ["lidl"]}}
+    changed_program = CategoryRuleProgram.for_mapping(changed_mapping, yaml_file_path)
+    assert changed_program.get_categories() == ["Groceries"]
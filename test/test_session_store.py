@@ -0,0 +1,64 @@
+import os
+import sys
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC_DIR)
+
+from BudgetBook.session_store import SessionStore
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_sessions_expire_after_ttl():
+    clock = FakeClock()
+    store = SessionStore(ttl_seconds=10, clock=clock)
+    first = store.create("first")
+    clock.now = 5
+    second = store.create("second")
+
+    clock.now = 12
+    assert store.get(first) is None
+    assert store.get(second) == "second"
+    assert store.get("unknown") is None
+
+
+def test_access_extends_session():
+    clock = FakeClock()
+    store = SessionStore(ttl_seconds=10, clock=clock)
+    session_id = store.create("value")
+
+    for now in [8, 16, 24]:
+        clock.now = now
+        assert store.get(session_id) == "value"
+
+
+def test_least_recently_used_session_is_removed():
+    store = SessionStore(max_sessions=2)
+    first = store.create(1)
+    second = store.create(2)
+    store.get(first)
+    store.create(3)
+
+    assert len(store) == 2
+    assert store.get(first) == 1
+    assert store.get(second) is None
+
+
+def test_values_do_not_extend_sessions():
+    clock = FakeClock()
+    store = SessionStore(ttl_seconds=10, clock=clock)
+    first = store.create("first")
+    clock.now = 5
+    store.create("second")
+
+    clock.now = 8
+    assert store.get_values() == ["first", "second"]
+    clock.now = 12
+    assert store.get_values() == ["second"]
+    assert store.get(first) is None
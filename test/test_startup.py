@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+LAZY_MODULES = ["sklearn", "Levenshtein", "BudgetBook.regular_transaction_predictor"]
+
+
+def get_loaded_lazy_modules(module):
+    script = (
+        "import sys\n"
+        f"sys.argv = ['{module}.py']\n"
+        f"import {module}\n"
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+    )
+    return [m for m in result.stdout.strip().split(",") if m]
+
+
+def test_server_does_not_import_the_predictor():
+    assert get_loaded_lazy_modules("budget_book") == []
+
+
+def test_batch_cli_does_not_import_the_predictor():
+    assert get_loaded_lazy_modules("budget_book_batch") == []
@@ -0,0 +1,66 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC_DIR)
+
+from BudgetBook.config_parser import DataColumns
+from BudgetBook.statement_cache import StatementCache
+from BudgetBook.statement_loader import StatementLoader
+
+pytest.importorskip("pyarrow")
+
+CATEGORY_MAPPING = {"Groceries": {"payment_party": ["lidl"]}}
+
+CSV_STATEMENT = """Buchungstag;Name;Buchungstext;Verwendungszweck;Betrag
+01.05.2022;Lidl;Kartenzahlung;Einkauf;-20,50
+02.05.2022;Someone;Gutschrift;Geschenk;10,00
+"""
+
+
+@pytest.fixture
+def config(make_config):
+    return make_config(CATEGORY_MAPPING)
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    csv_path = tmp_path / "statement.csv"
+    csv_path.write_text(CSV_STATEMENT)
+    return str(csv_path)
+
+
+def test_cached_statement_matches_parsed_statement(config, csv_path, tmp_path):
+    cache = StatementCache(str(tmp_path / "cache"))
+    loader = StatementLoader(config, cache=cache)
+
+    parsed = loader.load([csv_path])
+    assert cache.get_size_bytes() > 0
+
+    key = StatementCache.get_key(
+        open(csv_path, "rb").read(), StatementCache.get_config_digest(config)
+    )
+    pd.testing.assert_frame_equal(cache.load(key), parsed)
+    pd.testing.assert_frame_equal(loader.load([csv_path]), parsed)
+
+
+def test_config_change_invalidates_cache(config, csv_path, tmp_path):
+    cache = StatementCache(str(tmp_path / "cache"))
+    loader = StatementLoader(config, cache=cache)
+    loader.load([csv_path])
+
+    config.set_category_mapping({"Gifts": {"description": ["geschenk"]}})
+
+    assert loader.load([csv_path])[DataColumns.CATEGORY].tolist()[1] == "Gifts"
+    assert len(os.listdir(tmp_path / "cache")) == 2
+
+
+def test_cache_is_bounded_by_size(tmp_path):
+    cache = StatementCache(str(tmp_path / "cache"), max_size_bytes=0)
+    cache.store("key", pd.DataFrame({"a": [1, 2, 3]}))
+
+    assert cache.load("key") is None
+    assert cache.get_size_bytes() == 0
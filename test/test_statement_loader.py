@@ -0,0 +1,78 @@
+import base64
+import os
+import sys
+
+import pytest
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC_DIR)
+
+from BudgetBook.config_parser import DataColumns
+from BudgetBook.metrics import get_metrics
+from BudgetBook.statement_loader import StatementLoader, StatementLoadException
+
+CATEGORY_MAPPING = {"Groceries": {"payment_party": ["lidl"]}}
+
+CSV_HEADER = "Buchungstag;Name;Buchungstext;Verwendungszweck;Betrag\n"
+
+
+def to_upload(csv_content):
+    return "data:text/csv;base64," + base64.b64encode(csv_content.encode()).decode()
+
+
+@pytest.fixture
+def config(make_config):
+    return make_config(CATEGORY_MAPPING)
+
+
+@pytest.fixture
+def uploads():
+    return [
+        to_upload(CSV_HEADER + f"0{month}.05.2022;Lidl;Kartenzahlung;Einkauf;-{month},00\n")
+        for month in range(1, 6)
+    ]
+
+
+def test_parallel_loading_matches_sequential_loading(config, uploads):
+    sequential = StatementLoader(config, max_workers=1).load(uploads)
+    parallel = StatementLoader(config, max_workers=2).load(uploads)
+
+    assert parallel.equals(sequential)
+    assert StatementLoader(config, max_workers=2, chunk_size=1).load(uploads).equals(sequential)
+    assert len(sequential) == 5
+    assert (sequential[DataColumns.CATEGORY] == "Groceries").all()
+
+
+def test_errors_are_reported_per_file(config, uploads):
+    filenames = [f"{idx}.csv" for idx in range(len(uploads))]
+    uploads[3] = to_upload("Other;Columns\n1;2\n")
+
+    with pytest.raises(StatementLoadException) as e:
+        StatementLoader(config, max_workers=2).load(uploads, filenames)
+
+    assert list(e.value.get_errors()) == ["3.csv"]
+
+
+def test_workers_use_the_config_of_the_parent(config, write_config, uploads):
+    sequential = StatementLoader(config, max_workers=1).load(uploads)
+
+    # Mid-edit, the parent keeps its config until the file is reloaded
+    with open(config.get_yaml_file_path(), "w") as f:
+        f.write("category_mapping: [")
+    assert StatementLoader(config, max_workers=2).load(uploads).equals(sequential)
+
+    # Valid edits are only used once the parent reloaded them, like in the sequential path
+    write_config({"Shopping": {"payment_party": ["lidl"]}})
+    assert StatementLoader(config, max_workers=2).load(uploads).equals(sequential)
+
+
+def test_stages_of_workers_are_recorded(config, uploads):
+    metrics = get_metrics()
+    metrics.set_enabled(True)
+    try:
+        StatementLoader(config, max_workers=2).load(uploads)
+        assert metrics.get_rows("parse_csv") == 5
+        assert metrics.get_histogram("categorize").get_count() == 5
+    finally:
+        metrics.set_enabled(False)
+        metrics.clear()
@@ -0,0 +1,37 @@
+import os
+import sys
+
+import pandas as pd
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC_DIR)
+
+from BudgetBook.config_parser import DataColumns, NormalizedDataColumns
+from BudgetBook.text_normalization import add_normalized_columns
+
+
+def test_add_normalized_columns():
+    df = pd.DataFrame(
+        {
+            DataColumns.PAYMENT_PARTY: ["  Straße  GmbH ", "EDEKA\tMarkt"],
+            DataColumns.TYPE_OF_TRANSFER: ["Lastschrift", "Kartenzahlung"],
+            DataColumns.DESCRIPTION: [
+                "Miete IBAN: DE60 1203 0000 1234 5678 90 Ref 123456789",
+                "Einkauf 12.05. Kunde DE60120300001234567890",
+            ],
+        }
+    )
+
+    add_normalized_columns(df)
+
+    assert df[NormalizedDataColumns.PAYMENT_PARTY].tolist() == [
+        " strasse gmbh ",
+        "edeka markt",
+    ]
+    assert df[NormalizedDataColumns.DESCRIPTION].iloc[0] == (
+        "miete iban: de60 1203 0000 1234 5678 90 ref 123456789"
+    )
+    assert df[NormalizedDataColumns.DESCRIPTION_SIGNATURE].tolist() == [
+        "miete iban: ref",
+        "einkauf 12.05. kunde",
+    ]
@@ -0,0 +1,44 @@
+from datetime import date
+import os
+import sys
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC_DIR)
+
+from BudgetBook.config_parser import DataColumns
+from BudgetBook.dated_transaction import DatedTransaction
+from BudgetBook.transaction_ledger import TransactionLedger
+from BudgetBook.transaction_store import TransactionStore
+
+
+def create_statement(*transactions):
+    return TransactionStore.from_transactions(
+        DatedTransaction(party, date(2022, 5, day), amount, "Desc", "Category")
+        for party, day, amount in transactions
+    ).get_dataframe()
+
+
+def test_append_only_adds_unseen_rows():
+    ledger = TransactionLedger()
+
+    assert ledger.append(create_statement(("A", 1, 10.0), ("B", 2, -5.0))) == 2
+    assert ledger.append(create_statement(("B", 2, -5.0), ("C", 3, -1.0))) == 1
+
+    df = ledger.get_dataframe()
+    assert df[DataColumns.PAYMENT_PARTY].tolist() == ["A", "B", "C"]
+    assert df.index.tolist() == [0, 1, 2]
+    assert len(ledger) == 3
+
+
+def test_append_drops_duplicates_within_statement():
+    ledger = TransactionLedger()
+
+    assert ledger.append(create_statement(("A", 1, 10.0), ("A", 1, 10.0), ("A", 1, 11.0))) == 2
+    assert ledger.contains(create_statement(("A", 1, 11.0), ("A", 2, 10.0))).tolist() == [True, False]
+
+
+def test_empty_ledger():
+    ledger = TransactionLedger()
+
+    assert len(ledger.get_dataframe()) == 0
+    assert len(ledger.to_transaction_store()) == 0
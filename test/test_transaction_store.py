@@ -0,0 +1,73 @@
+from datetime import date
+import os
+import sys
+
+import pandas as pd
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC_DIR)
+
+from BudgetBook.config_parser import DataColumns
+from BudgetBook.dated_transaction import DatedTransaction
+from BudgetBook.transaction_store import TransactionStore, isin_categories
+
+
+def create_transactions():
+    return [
+        DatedTransaction("A", date(2022, 5, 1), 100.0, "First", "Salary"),
+        DatedTransaction("B", date(2022, 5, 15), -20.0, "Second", "Groceries"),
+        DatedTransaction("C", date(2022, 6, 1), -5.0, "Third", "Groceries"),
+    ]
+
+
+def test_round_trip():
+    transactions = create_transactions()
+    store = TransactionStore.from_transactions(transactions)
+
+    assert len(store) == 3
+    assert [t.to_dict() for t in store] == [t.to_dict() for t in transactions]
+    assert store[1].to_dict() == transactions[1].to_dict()
+    assert store.get_first_date() == date(2022, 5, 1)
+    assert store.get_last_date() == date(2022, 6, 1)
+
+
+def test_filter_by_date_excludes_end():
+    store = TransactionStore.from_transactions(create_transactions())
+
+    filtered = store.filter_by_date(date(2022, 5, 1), date(2022, 6, 1))
+
+    assert filtered.get_dataframe()[DataColumns.PAYMENT_PARTY].tolist() == ["A", "B"]
+
+
+def test_concat_and_empty_store():
+    empty = TransactionStore()
+    assert len(empty) == 0
+    assert empty.get_first_date() is None
+
+    store = TransactionStore.from_transactions(create_transactions())
+    combined = TransactionStore.concat([store, empty, store])
+
+    assert len(combined) == 6
+    assert combined.get_dataframe().index.tolist() == list(range(6))
+
+
+def test_string_columns_are_categorical():
+    store = TransactionStore.from_transactions(create_transactions())
+    other = TransactionStore.from_transactions(
+        [DatedTransaction("D", date(2022, 7, 1), 1.0, "Fourth", "Gifts")]
+    )
+
+    df = TransactionStore.concat([store, other]).get_dataframe()
+
+    assert isinstance(df[DataColumns.CATEGORY].dtype, pd.CategoricalDtype)
+    assert df[DataColumns.CATEGORY].cat.categories.tolist() == ["Gifts", "Groceries", "Salary"]
+    assert df[DataColumns.PAYMENT_PARTY].tolist() == ["A", "B", "C", "D"]
+
+
+def test_isin_categories_matches_isin():
+    categories = TransactionStore.from_transactions(create_transactions()).get_dataframe()[DataColumns.CATEGORY]
+
+    for values in [["Groceries"], ["Salary", "Unknown"], []]:
+        expected = categories.astype(str).isin(values).to_numpy()
+        assert isin_categories(categories, values).tolist() == expected.tolist()
+        assert isin_categories(categories.astype(str), values).tolist() == expected.tolist()
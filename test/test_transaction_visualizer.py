@@ -0,0 +1,57 @@
+import os
+import sys
+from datetime import date
+
+import pandas as pd
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC_DIR)
+
+from BudgetBook.config_parser import Config, DataColumns
+from BudgetBook.dated_transaction import DatedTransaction
+from BudgetBook.regular_event import RegularEvent
+from BudgetBook.regular_transaction import RegularTransaction
+from BudgetBook.transaction_interval import TransactionInterval
+from BudgetBook.transaction_visualizer import TransactionVisualizer
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "configuration.yaml")
+
+
+def test_scheduled_transactions_are_expanded_in_order():
+    visualizer = TransactionVisualizer(Config(CONFIG_PATH))
+    visualizer.add_transactions(
+        [
+            DatedTransaction("Shop", date(2022, 3, 5), -20.0, "Food", "Groceries"),
+            RegularTransaction(
+                "Landlord",
+                RegularEvent(date(2022, 1, 31), TransactionInterval.monthly(), date(2022, 5, 28)),
+                -800.0,
+                "Rent",
+                "Rent",
+            ),
+            DatedTransaction("Shop", date(2021, 12, 24), -50.0, "Gifts", "Groceries"),
+            RegularTransaction(
+                "Employer", RegularEvent(date(2022, 2, 1), TransactionInterval(days=14)), 1000.0
+            ),
+        ]
+    )
+    visualizer.set_analysis_interval(date(2022, 3, 1), date(2022, 4, 1))
+
+    expanded = visualizer._expand_scheduled_transactions()
+
+    assert expanded.columns.tolist() == [
+        DataColumns.PAYMENT_PARTY,
+        DataColumns.DATE,
+        DataColumns.AMOUNT,
+        DataColumns.DESCRIPTION,
+        DataColumns.CATEGORY,
+    ]
+    assert expanded[DataColumns.DATE].tolist() == [
+        pd.Timestamp(d) for d in ["2022-03-05", "2022-03-28", "2022-03-01", "2022-03-15", "2022-03-29"]
+    ]
+    assert expanded[DataColumns.PAYMENT_PARTY].tolist() == ["Shop", "Landlord", "Employer", "Employer", "Employer"]
+    assert expanded[DataColumns.AMOUNT].tolist() == [-20.0, -800.0, 1000.0, 1000.0, 1000.0]
+
+    dataframe = visualizer.get_dataframe()
+    assert dataframe.index.is_monotonic_increasing
+    assert dataframe["date_without_day"].tolist() == [date(2022, 3, 1)] * 5